@@ -18,8 +18,9 @@ validation/generation support.
 """
 from .globals import AUTHOR, VERSION
 from .api import (
-    single_load, multi_load, load, loads, dump, dumps, validate, gen_schema,
-    list_types, find_loader, merge, get, set_, open,
+    single_load, multi_load, load, loads, iterload, load_archive, compile,
+    dump, dumps, validate, gen_schema, list_types, find_loader, merge, get,
+    set_, set_many, open,
     MS_REPLACE, MS_NO_REPLACE, MS_DICTS, MS_DICTS_AND_LISTS,
     UnknownParserTypeError, UnknownFileTypeError
 )
@@ -28,9 +29,9 @@ __author__ = AUTHOR
 __version__ = VERSION
 
 __all__ = [
-    "single_load", "multi_load", "load", "loads", "dump", "dumps", "validate",
-    "gen_schema", "list_types", "find_loader", "merge",
-    "get", "set_", "open",
+    "single_load", "multi_load", "load", "loads", "iterload", "load_archive",
+    "compile", "dump", "dumps", "validate", "gen_schema", "list_types",
+    "find_loader", "merge", "get", "set_", "set_many", "open",
     "MS_REPLACE", "MS_NO_REPLACE", "MS_DICTS", "MS_DICTS_AND_LISTS",
     "UnknownParserTypeError", "UnknownFileTypeError"
 ]
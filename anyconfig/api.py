@@ -5,6 +5,31 @@
 # pylint: disable=unused-import,import-error,invalid-name
 r"""Public APIs of anyconfig module.
 
+.. versionadded:: 0.9.5
+
+   - Added new API :func:`iterload` to load multiple configs such as YAML
+     documents in a stream one by one, and ac_load_all keyword option to fold
+     them into a config as they are loaded.
+   - :func:`loads` accepts bytes-like objects such as memoryview and mmap.
+   - Added ac_mmap keyword option to load files mapped into memory.
+   - Added new API :func:`load_archive` to load configs in tar and zip
+     archives without extracting them, and :func:`load` accepts path specs
+     such as 'bundle.tar.gz!/conf.d/\*.yml' to do that.
+   - Added new API :func:`compile` to make validated and merged config
+     snapshots with manifests of their sources, and ac_snapshot keyword option
+     to :func:`load` to use them while these are fresh.
+   - Added ac_frozen keyword option to load immutable and hashable configs.
+   - Added ac_intern keyword option to intern keys and values of configs.
+   - Added ac_schema_class keyword option to load configs as the instances of
+     the classes made from JSON schema with :func:`anyconfig.typed.make_class`.
+   - Added ac_array keyword option to store large homogeneous numeric lists
+     in configs as array objects.
+   - Added ac_columnar keyword option to store large lists of homogeneous
+     records in configs as columnar objects, and JMESPath filter expressions
+     on them are evaluated column by column.
+   - Added ac_lazy keyword option to load sections of INI files and values of
+     Java properties files lazily, only when they are accessed first.
+
 .. versionadded:: 0.8.3
 
    - Added ac_dict keyword option to pass dict factory (any callable like
@@ -61,13 +86,21 @@ from __future__ import absolute_import
 import os.path
 
 from anyconfig.globals import LOGGER
+import anyconfig.archive
 import anyconfig.backends
+import anyconfig.columnar
 import anyconfig.backend.json
+import anyconfig.backend.snapshot
 import anyconfig.compat
+import anyconfig.frozen
+import anyconfig.interning
+import anyconfig.manifest
 import anyconfig.query
 import anyconfig.globals
 import anyconfig.dicts
+import anyconfig.index
 import anyconfig.template
+import anyconfig.typed
 import anyconfig.utils
 
 # Import some global constants will be re-exported:
@@ -76,7 +109,7 @@ from anyconfig.backends import (
 )
 from anyconfig.dicts import (
     MS_REPLACE, MS_NO_REPLACE, MS_DICTS, MS_DICTS_AND_LISTS, MERGE_STRATEGIES,
-    get, set_, merge # flake8: noqa
+    set_, set_many, merge # flake8: noqa
 )
 from anyconfig.schema import validate, gen_schema
 from anyconfig.utils import is_path
@@ -95,6 +128,60 @@ def _is_paths(maybe_paths):
     return False  # Not an iterable at least.
 
 
+def _options_to_merge(options):
+    """
+    :param options: Keyword options given to load configs
+    :return: Keyword options to load configs will be merged, which must not
+        be frozen nor converted until they are merged
+    """
+    return dict(options, ac_frozen=False, ac_schema_class=None,
+                ac_columnar=False,
+                ac_intern=bool(options.get("ac_intern", False)))
+
+
+def _maybe_frozen(cnf, ac_frozen=False, ac_intern=False, **_options):
+    """
+    :param cnf: Mapping object represents configuration data or None
+    :param ac_frozen: Freeze `cnf` if True
+    :param ac_intern:
+        Share structurally identical mapping objects in `cnf` if it's
+        :data:`anyconfig.interning.SUBTREES`
+    :return: :class:`~anyconfig.frozen.FrozenDict` object or `cnf` as it is
+    """
+    if ac_intern == anyconfig.interning.SUBTREES:
+        return anyconfig.interning.intern_tree(cnf, subtrees=True)
+
+    return anyconfig.frozen.freeze(cnf) if ac_frozen else cnf
+
+
+def _maybe_columnar(cnf, ac_columnar=False, ac_array=None, **_options):
+    """
+    :param cnf: Mapping object represents configuration data or None
+    :param ac_columnar: Convert lists of records in `cnf` to columnar objects
+    :param ac_array: "array" or "numpy" to store columns of numbers in array
+        objects, or None
+    :return: `cnf` updated in place or `cnf` as it is
+    """
+    if not ac_columnar:
+        return cnf
+
+    return anyconfig.columnar.convert(cnf, array_kind=ac_array)
+
+
+def _maybe_typed(cnf, ac_schema_class=None, **_options):
+    """
+    :param cnf: Mapping object represents configuration data or None
+    :param ac_schema_class:
+        Class made by :func:`anyconfig.typed.make_class` or JSON schema object
+        to make it, or None
+    :return: An instance of `ac_schema_class` or `cnf` as it is
+    """
+    if ac_schema_class is None:
+        return cnf
+
+    return anyconfig.typed.to_typed(cnf, ac_schema_class)
+
+
 def _maybe_validated(cnf, schema, **options):
     """
     :param cnf: Mapping object represents configuration data
@@ -164,6 +251,7 @@ def _maybe_schema(**options):
         # original config file's format, perhaps.
         options["ac_parser"] = None
         options["ac_schema"] = None  # Avoid infinite loop.
+        options["ac_schema_class"] = None
         LOGGER.info("Loading schema: %s", ac_schema)
         return load(ac_schema, **options)
 
@@ -229,14 +317,69 @@ def single_load(path_or_stream, ac_parser=None, ac_template=False,
           - ac_ordered: True if you want to keep resuls ordered. Please note
             that order of items may be lost depends on the selected backend.
 
+          - ac_frozen: True to make results immutable and hashable, made of
+            :class:`~anyconfig.frozen.FrozenDict` and
+            :class:`~anyconfig.frozen.FrozenList` objects. Backends can make
+            mapping objects from (key, value) pairs, e.g. JSON, make them
+            directly while loading, and others freeze results once loaded.
+            It takes precedence over ac_dict.
+
+          - ac_intern: True to intern keys and short string values of mapping
+            objects, or :data:`anyconfig.interning.SUBTREES` ('subtrees') to
+            share structurally identical mapping objects also. Results are
+            frozen as ac_frozen is True in the latter. Backends make mapping
+            objects from (key, value) pairs such as JSON and YAML do that
+            while loading. It saves memory to load many configs repeat the
+            same keys and values.
+
+          - ac_array: "array" or "numpy" to store lists of ints only or floats
+            only have :data:`anyconfig.arrays.MIN_LENGTH` or more items in
+            results as :class:`array.array` or :class:`numpy.ndarray` objects
+            respectively, need much less memory than lists. It falls back to
+            "array" if numpy is not available. True is same as "array".
+
+          - ac_columnar: True to store lists of mapping objects have the same
+            keys and :data:`anyconfig.columnar.MIN_LENGTH` or more items in
+            results as :class:`~anyconfig.columnar.Records` objects, keep the
+            keys once and the values in a list, or an array object with
+            ac_array, for each key. These look like read-only sequences of
+            mapping objects, and ac_query pushes simple JMESPath filter
+            expressions such as 'hosts[?port > `1024`].name' down to them.
+
+          - ac_schema_class: Class made by
+            :func:`anyconfig.typed.make_class` or JSON schema object to make
+            it. Results are converted to its instances keep values in
+            `__slots__` after validated and queried, need much less memory
+            than dicts if there are very many of them.
+
           - ac_schema: JSON schema file path to validate given config file
           - ac_query: JMESPath expression to query data
 
+        - Options specific to this function and :func:`load`:
+
+          - ac_load_all: Load all of configs in given file such as YAML
+            documents separated with '---' and merge them one by one into the
+            first one as these are loaded, with the strategy given in ac_merge
+            option. See also :func:`iterload`.
+
         - Common backend options:
 
           - ignore_missing: Ignore and just return empty result if given file
             (``path_or_stream``) does not exist.
 
+          - ac_mmap: Map given files into memory and pass them to backends can
+            load data from them directly, e.g. JSON, XML, pickle and line
+            oriented formats such as INI and Java properties, instead of
+            reading the whole files into strings. It may reduce memory usage
+            to load very large files.
+
+          - ac_lazy: Load configs lazily with backends can do that, e.g. INI
+            and Java properties; find the sections or keys in a single pass
+            and parse each of them only when it's accessed first. Given files
+            are mapped into memory and kept mapped while results are alive.
+            Options process all of the values such as ac_frozen, ac_schema
+            and ac_query load all of them.
+
         - Backend specific options such as {"indent": 2} for JSON backend
 
     :return: Mapping object
@@ -257,10 +400,61 @@ def single_load(path_or_stream, ac_parser=None, ac_template=False,
                                                 ctx=ac_context)
         if content is not None:
             cnf = psr.loads(content, **options)
-            return _maybe_validated(cnf, schema, **options)
+            return _maybe_typed(_maybe_validated(cnf, schema, **options),
+                                **options)
+
+    if options.get("ac_load_all", False):
+        opts = _options_to_merge(options)
+        cnf = _fold(psr.load_all(path_or_stream, **opts), **opts)
+        if cnf is None:
+            cnf = anyconfig.dicts.convert_to({}, **opts)
+        cnf = _maybe_columnar(_maybe_frozen(cnf, **options), **options)
+    else:
+        cnf = psr.load(path_or_stream, **options)
+
+    return _maybe_typed(_maybe_validated(cnf, schema, **options), **options)
 
-    cnf = psr.load(path_or_stream, **options)
-    return _maybe_validated(cnf, schema, **options)
+
+def _fold(cnfs, **options):
+    """
+    Merge configs `cnfs` into the first one as they come one by one.
+
+    :param cnfs: An iterable (generator) yields mapping objects
+    :param options: Keyword options may contain 'ac_merge'
+    :return: Mapping object or None if `cnfs` yields nothing
+    """
+    cnf = None
+    for cups in cnfs:
+        if cnf is None:
+            cnf = cups
+        else:
+            merge(cnf, cups, **options)
+
+    return cnf
+
+
+def iterload(path_or_stream, ac_parser=None, **options):
+    """
+    Load configs from a file contains multiple configs such as a YAML file
+    has multiple documents separated with '---', and yield each of them as soon
+    as it was loaded. Backends which cannot process such files yield only one
+    config.
+
+    :param path_or_stream: Configuration file path or file or file-like object
+    :param ac_parser: Forced parser type or parser object itself
+    :param options: Optional keyword arguments such as ac_dict, ac_ordered and
+        ac_query. See the descriptions of them in :func:`single_load`.
+
+    :return: Generator yields mapping objects or query results
+    """
+    if is_path(path_or_stream):
+        path_or_stream = anyconfig.utils.normpath(path_or_stream)
+
+    psr = find_loader(path_or_stream, ac_parser, is_path(path_or_stream))
+    LOGGER.info("Loading: %s",
+                anyconfig.utils.get_path_from_stream(path_or_stream))
+    for cnf in psr.load_all(path_or_stream, **options):
+        yield anyconfig.query.query(cnf, **options)
 
 
 def multi_load(paths, ac_parser=None, ac_template=False, ac_context=None,
@@ -309,6 +503,19 @@ def multi_load(paths, ac_parser=None, ac_template=False, ac_context=None,
           - ignore_missing: Ignore and just return empty result if given file
             (``path_or_stream``) does not exist.
 
+          - ac_mmap: Map given files into memory and pass them to backends can
+            load data from them directly, e.g. JSON, XML, pickle and line
+            oriented formats such as INI and Java properties, instead of
+            reading the whole files into strings. It may reduce memory usage
+            to load very large files.
+
+          - ac_lazy: Load configs lazily with backends can do that, e.g. INI
+            and Java properties; find the sections or keys in a single pass
+            and parse each of them only when it's accessed first. Given files
+            are mapped into memory and kept mapped while results are alive.
+            Options process all of the values such as ac_frozen, ac_schema
+            and ac_query load all of them.
+
         - Backend specific options such as {"indent": 2} for JSON backend
 
     :return: Mapping object or any query result might be primitive objects
@@ -324,7 +531,7 @@ def multi_load(paths, ac_parser=None, ac_template=False, ac_context=None,
 
     cnf = ac_context
     for path in paths:
-        opts = options.copy()
+        opts = _options_to_merge(options)
         cups = single_load(path, ac_parser=ac_parser,
                            ac_template=ac_template, ac_context=cnf, **opts)
         if cups:
@@ -334,10 +541,152 @@ def multi_load(paths, ac_parser=None, ac_template=False, ac_context=None,
                 merge(cnf, cups, **options)
 
     if cnf is None:
-        return anyconfig.dicts.convert_to({}, **options)
+        cnf = _maybe_frozen(anyconfig.dicts.convert_to({}, **options),
+                            **options)
+        return _maybe_typed(cnf, **options)
 
-    cnf = _maybe_validated(cnf, schema, **options)
-    return anyconfig.query.query(cnf, **options)
+    cnf = _maybe_validated(_maybe_columnar(_maybe_frozen(cnf, **options),
+                                           **options), schema, **options)
+    return _maybe_typed(anyconfig.query.query(cnf, **options), **options)
+
+
+def _load_members(path, pattern, ac_parser=None, **options):
+    """
+    :param path: Path of tar or zip archive
+    :param pattern: Glob pattern of member names
+    :param ac_parser: Forced parser type or parser object
+    :param options: Optional keyword arguments passed to backends
+
+    :return: Generator yields a tuple of (member name, mapping object)
+    """
+    psrs = {}  # {file type: parser object}, to reuse parser objects.
+    for name, inp in anyconfig.archive.iter_members(path, pattern):
+        ptype = None if ac_parser else \
+            anyconfig.utils.get_file_type_extension(name)
+        psr = psrs.get(ptype)
+        if psr is None:
+            try:
+                psr = psrs[ptype] = find_loader(name, ac_parser, True)
+            except UnknownFileTypeError:
+                LOGGER.info("Skip member of unknown file type: %s!/%s",
+                            path, name)
+                continue
+
+        LOGGER.info("Loading: %s!/%s", path, name)
+        # Members are read as bytes and decoded for text backends in loads.
+        yield (name, psr.loads(inp.read(), **options))
+
+
+def load_archive(path, pattern='*', ac_parser=None, **options):
+    r"""
+    Load and merge configuration files in a tar or zip archive without
+    extracting them.
+
+    Members of the archive are read sequentially in a single pass, and each
+    member whose name matches `pattern` is loaded with the backend found by
+    its file extension as soon as it was read. Loaded configs are merged in
+    the sorted order of member names, as :func:`multi_load` does for files
+    in a directory. Members of unknown file types are skipped.
+
+    :param path:
+        Path of tar archive may be compressed, e.g. 'bundle.tar.gz', or zip
+        archive
+    :param pattern: Glob pattern of member names, e.g. 'conf.d/\*.yml'
+    :param ac_parser: Forced parser type or parser object
+    :param options: Optional keyword arguments such as ac_dict, ac_ordered,
+        ac_schema, ac_query and ac_merge. See the descriptions of them in
+        :func:`single_load` and :func:`multi_load`. Members are decoded with
+        the encoding given in 'ac_encoding' option (default: utf-8) for the
+        backends load text data, e.g. YAML and INI.
+
+    :return: Mapping object or any query result might be primitive objects
+    """
+    schema = _maybe_schema(**options)
+    options["ac_schema"] = None
+
+    opts = _options_to_merge(options)
+    cnfs = dict(_load_members(path, pattern, ac_parser=ac_parser, **opts))
+    cnf = None
+    for name in sorted(cnfs):
+        cups = cnfs[name]
+        if cups:
+            if cnf is None:
+                cnf = cups
+            else:
+                merge(cnf, cups, **options)
+
+    if cnf is None:
+        cnf = _maybe_frozen(anyconfig.dicts.convert_to({}, **options),
+                            **options)
+        return _maybe_typed(cnf, **options)
+
+    cnf = _maybe_validated(_maybe_columnar(_maybe_frozen(cnf, **options),
+                                           **options), schema, **options)
+    return _maybe_typed(anyconfig.query.query(cnf, **options), **options)
+
+
+def _load_snapshot(output, path_specs, ac_dict=None, **options):
+    """
+    :param output: Path of snapshot file made by :func:`compile`
+    :param path_specs: Path specs given to :func:`compile`
+    :param ac_dict: callable to make mapping objects or None
+    :param options: Keyword options given to :func:`compile`
+
+    :return: Mapping object loaded from the snapshot or None if the snapshot
+        or some of its sources were changed
+    """
+    if not anyconfig.manifest.is_fresh(output, path_specs, **options):
+        LOGGER.info("Snapshot is not fresh: %s", output)
+        return None
+
+    LOGGER.info("Loading snapshot: %s", output)
+    return anyconfig.backend.snapshot.Parser().load(
+        output, ac_dict=ac_dict, ac_frozen=options.get("ac_frozen", False),
+        ac_intern=options.get("ac_intern", False))
+
+
+# pylint: disable=redefined-builtin
+def compile(path_specs, output, ac_parser=None, ac_template=False,
+            ac_context=None, **options):
+    r"""
+    Load, merge and validate config files and save the result as a snapshot
+    to `output`, which can be loaded very fast with
+    :mod:`anyconfig.backend.snapshot`, along with the manifest of the source
+    files, '<output>.manifest'. Later, :func:`load` with the same path specs
+    and options plus ac_snapshot=`output` returns the snapshot instead of
+    loading the sources again while they are not changed.
+
+    :param path_specs: Configuration file path or paths or its pattern such as
+        r'/a/b/\*.json', see :func:`load`. File or file-like objects are not
+        allowed.
+    :param output: Path of the snapshot file to save, e.g. 'a.acsnap'
+    :param ac_parser: Forced parser type or parser object
+    :param ac_template: Assume configuration file may be a template file and
+        try to compile it AAR if True
+    :param ac_context: A dict presents context to instantiate template
+    :param options:
+        Optional keyword arguments. See also the description of `options` in
+        :func:`single_load` and :func:`multi_load`
+
+    :return: Mapping object loaded and saved, or None if validation failed
+    :raises: ValueError if `path_specs` contains file or file-like objects
+    """
+    options.update(ac_parser=ac_parser, ac_template=ac_template,
+                   ac_context=ac_context)
+    manifest = anyconfig.manifest.make(path_specs, **options)
+
+    options["ac_query"] = None
+    schema_class = options.pop("ac_schema_class", None)  # Save mappings.
+    cnf = load(path_specs, **options)
+    if cnf is None:  # Validation failed.
+        return None
+
+    tmp = output + ".tmp"
+    anyconfig.backend.snapshot.Parser().dump(cnf, tmp)
+    getattr(os, "replace", os.rename)(tmp, output)
+    anyconfig.manifest.save(manifest, output)
+
+    return _maybe_typed(cnf, ac_schema_class=schema_class)
 
 
 def load(path_specs, ac_parser=None, ac_dict=None, ac_template=False,
@@ -347,7 +696,9 @@ def load(path_specs, ac_parser=None, ac_dict=None, ac_template=False,
     given paths pattern.
 
     :param path_specs: Configuration file path or paths or its pattern such as
-        r'/a/b/\*.json' or a list of files/file-like objects
+        r'/a/b/\*.json' or a list of files/file-like objects, or the path of
+        archive and the pattern of its members such as
+        r'/a/bundle.tar.gz!/conf.d/\*.yml', see also :func:`load_archive`
     :param ac_parser: Forced parser type or parser object
     :param ac_dict:
         callable (function or class) to make mapping object will be returned as
@@ -361,10 +712,28 @@ def load(path_specs, ac_parser=None, ac_dict=None, ac_template=False,
     :param ac_context: A dict presents context to instantiate template
     :param options:
         Optional keyword arguments. See also the description of `options` in
-        :func:`single_load` and :func:`multi_load`
+        :func:`single_load` and :func:`multi_load`. In addition,
+
+        - ac_snapshot: Path of snapshot file made by :func:`compile` with the
+          same `path_specs` and options. The snapshot is returned instead of
+          loading the files if it and the files are not changed since then.
 
     :return: Mapping object or any query result might be primitive objects
     """
+    snapshot = options.pop("ac_snapshot", None)
+    if snapshot is not None:
+        cnf = _load_snapshot(snapshot, path_specs, ac_dict=ac_dict,
+                             ac_parser=ac_parser, ac_template=ac_template,
+                             ac_context=ac_context, **options)
+        if cnf is not None:
+            return _maybe_typed(anyconfig.query.query(cnf, **options),
+                                **options)
+
+    spec = anyconfig.archive.split_path_spec(path_specs)
+    if spec is not None:
+        return load_archive(spec[0], spec[1], ac_parser=ac_parser,
+                            ac_dict=ac_dict, **options)
+
     marker = options.setdefault("ac_marker", options.get("marker", '*'))
 
     if is_path(path_specs) and marker in path_specs or _is_paths(path_specs):
@@ -372,16 +741,22 @@ def load(path_specs, ac_parser=None, ac_dict=None, ac_template=False,
                           ac_template=ac_template, ac_context=ac_context,
                           **options)
 
+    schema_class = options.pop("ac_schema_class", None)  # Convert at last.
     cnf = single_load(path_specs, ac_parser=ac_parser, ac_dict=ac_dict,
                       ac_template=ac_template, ac_context=ac_context,
                       **options)
-    return anyconfig.query.query(cnf, **options)
+    return _maybe_typed(anyconfig.query.query(cnf, **options),
+                        ac_schema_class=schema_class)
 
 
 def loads(content, ac_parser=None, ac_dict=None, ac_template=False,
           ac_context=None, **options):
     """
-    :param content: Configuration file's content
+    :param content:
+        Configuration file's content, a string or bytes-like object such as
+        bytes, bytearray, memoryview and mmap. Bytes-like objects are passed to
+        backends as they are without decoding and copying if they can load
+        data from them directly, e.g. JSON, XML and pickle backends.
     :param ac_parser: Forced parser type or parser object
     :param ac_dict:
         callable (function or class) to make mapping object will be returned as
@@ -404,6 +779,7 @@ def loads(content, ac_parser=None, ac_dict=None, ac_template=False,
         return None
 
     psr = find_loader(None, ac_parser)
+    schema_class = options.pop("ac_schema_class", None)
     schema = None
     ac_schema = options.get("ac_schema", None)
     if ac_schema is not None:
@@ -413,6 +789,8 @@ def loads(content, ac_parser=None, ac_dict=None, ac_template=False,
                        **options)
 
     if ac_template:
+        if anyconfig.utils.is_buffer(content):
+            content = anyconfig.utils.decode_buffer(content)
         compiled = anyconfig.template.try_render(content=content,
                                                  ctx=ac_context)
         if compiled is not None:
@@ -420,7 +798,8 @@ def loads(content, ac_parser=None, ac_dict=None, ac_template=False,
 
     cnf = psr.loads(content, ac_dict=ac_dict, **options)
     cnf = _maybe_validated(cnf, schema, **options)
-    return anyconfig.query.query(cnf, **options)
+    return _maybe_typed(anyconfig.query.query(cnf, **options),
+                        ac_schema_class=schema_class)
 
 
 def _find_dumper(path_or_stream, ac_parser=None):
@@ -476,4 +855,30 @@ def query(data, expression, **options):
     """
     return anyconfig.query.query(data, ac_query=expression)
 
+
+def get(data, path, seps=anyconfig.dicts.PATH_SEPS, idx_reg=None):
+    """
+    Get the object pointed by `path` in `data` with
+    :func:`anyconfig.dicts.get`, or look it up in the index if `data` is
+    the index made with :func:`anyconfig.index.build`.
+
+    :param data: Config data object or :class:`anyconfig.index.PathIndex`
+    :param path: Path expression to point object wanted
+    :param seps: Separator char candidates
+    :param idx_reg:
+        Regex pattern of array indexes passed to :func:`anyconfig.dicts.get`
+        or None to use the default one. The index is not used if it's given.
+
+    :return: A tuple of (result_object, error_message)
+    """
+    if isinstance(data, anyconfig.index.PathIndex):
+        if idx_reg is None:
+            return data.get(path, seps=seps)
+        data = data.cnf
+
+    if idx_reg is None:
+        return anyconfig.dicts.get(data, path, seps=seps)
+
+    return anyconfig.dicts.get(data, path, seps=seps, idx_reg=idx_reg)
+
 # vim:sw=4:ts=4:et:
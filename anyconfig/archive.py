@@ -0,0 +1,136 @@
+#
+# Copyright (C) 2017 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""Load configuration files in tar and zip archives without extracting them.
+
+Archives are read sequentially in a single pass, and each member whose name
+matches given glob pattern is loaded with the backend found by its extension
+as soon as it was read. Members are specified in paths such as
+'bundle.tar.gz!/conf.d/\*.yml', the archive path and the pattern of member
+names separated with '!/'.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import fnmatch
+import logging
+import posixpath
+import tarfile
+import zipfile
+
+import anyconfig.utils
+
+
+LOGGER = logging.getLogger(__name__)
+
+ARCHIVE_SEP = "!/"
+TAR_EXTENSIONS = ("tar", "tgz", "tbz", "tbz2", "txz")
+ZIP_EXTENSIONS = ("zip", )
+
+
+def _archive_type(path):
+    """
+    :param path: Path of archive file
+    :return: 'tar', 'zip' or None if `path` is not the path of an archive
+
+    >>> _archive_type("a.tar.gz"), _archive_type("a.tgz")
+    ('tar', 'tar')
+    >>> _archive_type("a.zip"), _archive_type("a.json.gz")
+    ('zip', None)
+    """
+    ext = anyconfig.utils.get_file_type_extension(path)
+    if ext in TAR_EXTENSIONS:
+        return "tar"
+    if ext in ZIP_EXTENSIONS:
+        return "zip"
+
+    return None
+
+
+def split_path_spec(path_spec):
+    """
+    :param path_spec: Path spec may consist of archive path and pattern
+    :return:
+        A tuple of (archive path, glob pattern of member names), or None if
+        `path_spec` does not point to members in an archive
+
+    >>> split_path_spec("/a/b.tar.gz!/conf.d/*.yml")
+    ('/a/b.tar.gz', 'conf.d/*.yml')
+    >>> split_path_spec("b.zip!/")
+    ('b.zip', '*')
+    >>> split_path_spec("/a/b.json") is None
+    True
+    >>> split_path_spec("/a/b!/c.json") is None
+    True
+    """
+    if not anyconfig.utils.is_path(path_spec) or ARCHIVE_SEP not in path_spec:
+        return None
+
+    (path, pattern) = path_spec.split(ARCHIVE_SEP, 1)
+    if _archive_type(path) is None:
+        return None
+
+    return (path, pattern or '*')
+
+
+def _normpath(name):
+    """
+    >>> _normpath("./conf.d/a.yml")
+    'conf.d/a.yml'
+    """
+    return posixpath.normpath(name).lstrip('/')
+
+
+def _iter_tar(path):
+    """
+    Iterate members of tar archive in a single pass. Compressed archives are
+    decompressed on the fly.
+
+    :param path: Path of tar archive
+    :return: Generator yields a tuple of (member name, file object)
+    """
+    with tarfile.open(path, mode="r|*") as tar:
+        for member in tar:
+            if member.isfile():
+                yield (member.name, tar.extractfile(member))
+
+
+def _iter_zip(path):
+    """
+    Iterate members of zip archive.
+
+    :param path: Path of zip archive
+    :return: Generator yields a tuple of (member name, file object)
+    """
+    with zipfile.ZipFile(path) as zipf:
+        for info in zipf.infolist():
+            if not info.filename.endswith('/'):
+                with zipf.open(info) as inp:
+                    yield (info.filename, inp)
+
+
+def iter_members(path, pattern='*'):
+    r"""
+    Iterate members of tar or zip archive match `pattern` one by one in the
+    order stored in the archive. Each file object yielded is only valid until
+    the next member was yielded.
+
+    :param path: Path of tar or zip archive
+    :param pattern: Glob pattern of member names, e.g. 'conf.d/\*.yml'
+    :return: Generator yields a tuple of (member name, file object)
+    :raises: ValueError if `path` is not the path of a supported archive
+    """
+    atype = _archive_type(path)
+    if atype is None:
+        raise ValueError("Not a tar or zip archive: %s" % path)
+
+    members = _iter_tar(path) if atype == "tar" else _iter_zip(path)
+    pattern = _normpath(pattern)
+    for name, inp in members:
+        name = _normpath(name)
+        if fnmatch.fnmatchcase(name, pattern):
+            yield (name, inp)
+
+# vim:sw=4:ts=4:et:
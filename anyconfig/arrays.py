@@ -0,0 +1,236 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""Compact storage of large homogeneous numeric lists in configs.
+
+Lists of numbers in configs such as weights, lookup tables and port maps are
+loaded as lists of int or float objects, and each of them costs 24 - 32 bytes
+in addition to the pointer in the list. :func:`convert` replaces such lists
+which have :data:`MIN_LENGTH` or more items with :class:`array.array` objects
+or :class:`numpy.ndarray` objects if numpy is available, keep numbers as
+packed machine values, 8 bytes each.
+
+- Only lists of ints only or floats only are converted, and lists of ints out
+  of the range of 64 bits signed integers are kept as they are.
+- Mapping objects and lists in them are updated in place, and immutable ones,
+  e.g. frozen ones made with 'ac_frozen' option, are not.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import array
+import logging
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import anyconfig.compat
+import anyconfig.frozen
+import anyconfig.utils
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Lists shorter than this are not converted as the memory saved is not much
+# and it looks that it's not worth losing list's interface.
+MIN_LENGTH = 1024
+
+ARRAY = "array"
+NUMPY = "numpy"
+KINDS = (ARRAY, NUMPY)
+
+try:
+    array.array('q')
+    _INT_TYPECODE = 'q'
+except ValueError:  # python < 3.3; 'l' is 64 bits in LP64 platforms.
+    _INT_TYPECODE = 'l'
+
+_TYPECODES = {int: _INT_TYPECODE, float: 'd'}  # {item type: array typecode}
+_SCALAR_TYPES = frozenset(anyconfig.compat.STR_TYPES +
+                          (bool, int, float, type(None)))
+
+
+def is_array(obj):
+    """
+    :param obj: Any object
+    :return: True if `obj` is an array object made by :func:`to_array`
+
+    >>> is_array(array.array('l', [1])), is_array([1])
+    (True, False)
+    """
+    if isinstance(obj, array.array):
+        return True
+
+    return numpy is not None and isinstance(obj, numpy.ndarray)
+
+
+def _item_type(lst):
+    """
+    :param lst: A list
+    :return: int or float if all of the items of `lst` are of it or None
+    """
+    types = set(map(type, lst))
+    if len(types) == 1:
+        itype = types.pop()
+        if itype in _TYPECODES:
+            return itype
+
+    return None
+
+
+def to_array(lst, kind=ARRAY):
+    """
+    :param lst: A list of ints only or floats only
+    :param kind: "array" or "numpy", falls back to "array" if numpy is not
+        available
+    :return: An array object has the items of `lst` or None if `lst` cannot
+        be converted
+
+    >>> arr = to_array([1, 2, 3])
+    >>> arr.typecode == _INT_TYPECODE, arr.tolist()
+    (True, [1, 2, 3])
+    >>> to_array([1.0, 2]) is None, to_array([True]) is None
+    (True, True)
+    """
+    itype = _item_type(lst)
+    if itype is None:
+        return None
+
+    try:
+        if kind == NUMPY and numpy is not None:
+            return numpy.array(lst, dtype=numpy.int64 if itype is int
+                               else numpy.float64)
+
+        return array.array(_TYPECODES[itype], lst)
+    except OverflowError:
+        return None
+
+
+def to_list(obj):
+    """
+    :param obj: An array object or any other object
+    :return: A list has the items of `obj` if it's an array object or `obj`
+
+    >>> to_list(array.array('l', [1, 2]))
+    [1, 2]
+    """
+    return obj.tolist() if is_array(obj) else obj
+
+
+def item_type(obj):
+    """
+    :param obj: An array object
+    :return: The type of items of `obj` in JSON schema, "integer" or "number"
+
+    >>> item_type(array.array('l', [1])), item_type(array.array('d', [1.0]))
+    ('integer', 'number')
+    """
+    if isinstance(obj, array.array):
+        return "number" if obj.typecode in "fd" else "integer"
+
+    return "integer" if obj.dtype.kind in "iu" else "number"
+
+
+def merge(arr, other):
+    """
+    Append the items of `other` not in `arr` to `arr` as
+    :func:`anyconfig.dicts.merge` does for lists.
+
+    :param arr: An array object or a list
+    :param other: An array object or a list to merge
+    :return: An object of the same kind of `arr` if possible or a list
+
+    >>> arr = merge(array.array('l', [1, 2]), [2, 3])
+    >>> is_array(arr), arr.tolist()
+    (True, [1, 2, 3])
+    >>> merge([1, 2], array.array('l', [2, 3]))
+    [1, 2, 3]
+    """
+    items = to_list(arr)
+    seen = set(items)
+    items += [x for x in to_list(other) if x not in seen]
+
+    if not is_array(arr):
+        return items
+
+    kind = ARRAY if isinstance(arr, array.array) else NUMPY
+    ret = to_array(items, kind=kind)
+    return items if ret is None else ret
+
+
+def json_default(obj):
+    """
+    Function passed to JSON dumpers as 'default' to dump array objects.
+
+    :param obj: An object JSON dumper does not know how to dump
+    :return: A list if `obj` is an array object
+    :raises: TypeError if `obj` is not an array object
+    """
+    if is_array(obj):
+        return obj.tolist()
+
+    raise TypeError("Object of type %s is not JSON serializable" %
+                    type(obj).__name__)
+
+
+def _convert(obj, kind, min_length):
+    """
+    :return: An array object made from `obj` or `obj` updated in place
+    """
+    if type(obj) is list:
+        if len(obj) >= min_length:
+            arr = to_array(obj, kind)
+            if arr is not None:
+                return arr
+
+        for idx, item in enumerate(obj):
+            if type(item) in _SCALAR_TYPES:
+                continue
+            new = _convert(item, kind, min_length)
+            if new is not item:
+                obj[idx] = new
+
+    elif anyconfig.utils.is_dict_like(obj) and \
+            not anyconfig.frozen.is_frozen(obj):
+        for key, val in list(obj.items()):
+            if type(val) in _SCALAR_TYPES:
+                continue
+            new = _convert(val, kind, min_length)
+            if new is not val:
+                obj[key] = new
+
+    return obj
+
+
+def convert(obj, kind=ARRAY, min_length=MIN_LENGTH):
+    """
+    Convert large homogeneous numeric lists in `obj` to array objects.
+
+    :param obj: Mapping object, list or any other object
+    :param kind: "array", "numpy" or True same as "array", falls back to
+        "array" if numpy is not available
+    :param min_length: Min number of items of lists to convert
+    :return: `obj` updated in place or an array object made from `obj`
+    :raises: ValueError if `kind` is not one of :data:`KINDS`
+
+    >>> cnf = convert(dict(a=[1, 2], b=[dict(c=[0.1, 0.2])]), min_length=2)
+    >>> is_array(cnf["a"]), cnf["a"].tolist(), cnf["b"][0]["c"]
+    (True, [1, 2], array('d', [0.1, 0.2]))
+    """
+    if kind is True:
+        kind = ARRAY
+
+    if kind not in KINDS:
+        raise ValueError("Unknown kind of arrays: %r" % (kind, ))
+
+    if kind == NUMPY and numpy is None:
+        LOGGER.debug("numpy is not available. Use array module instead.")
+        kind = ARRAY
+
+    return _convert(obj, kind, min_length)
+
+# vim:sw=4:ts=4:et:
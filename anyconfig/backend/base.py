@@ -18,6 +18,32 @@ needed:
 
 Changelog:
 
+.. versionchanged:: 0.9.5
+
+   - Add :meth:`LoaderMixin.load_all` and
+     :meth:`LoaderMixin.load_all_from_stream` to load multiple configs from a
+     stream one by one.
+   - :meth:`LoaderMixin.loads` accepts bytes-like objects, bytes, bytearray,
+     memoryview and mmap, and passes them to backends as they are if they can
+     load data from them directly (`_allow_buffer`), or decode them for text
+     backends or convert them to bytes for binary ones.
+   - Add :meth:`LoaderMixin.load_from_mmap` to load data from memory-mapped
+     files, used instead of :meth:`LoaderMixin.load_from_path` if 'ac_mmap'
+     option was given.
+   - :meth:`TextFilesMixin.ropen` and :meth:`TextFilesMixin.wopen` open
+     compressed files, e.g. 'a.json.gz', to (de)compress data on the fly.
+   - Add 'ac_frozen' option to load immutable mapping objects, made directly
+     with the container if the backend allows that (`_allow_frozen`).
+   - Add 'ac_intern' option to intern keys and values of mapping objects
+     while loading if the backend allows that (`_allow_intern`).
+   - Add 'ac_array' option to store large homogeneous numeric lists in array
+     objects.
+   - Add 'ac_columnar' option to store large lists of homogeneous records in
+     columnar objects, :class:`anyconfig.columnar.Records`.
+   - Add 'ac_lazy' option to load configs lazily with
+     :meth:`LoaderMixin.load_lazily` if the backend allows that
+     (`_allow_lazy`), and :class:`LazyMapping` to load values on demand.
+
 .. versionchanged:: 0.9.1
 
    - Rename the member _dict_options to `_dict_opts` to make consistent w/
@@ -38,12 +64,24 @@ Changelog:
 from __future__ import absolute_import
 
 import functools
+import io
+import importlib
 import logging
+import mmap
 import os
 
+import anyconfig.arrays
+import anyconfig.columnar
 import anyconfig.compat
+import anyconfig.frozen
+import anyconfig.interning
 import anyconfig.utils
 
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
 
 LOGGER = logging.getLogger(__name__)
 
@@ -84,6 +122,157 @@ def _not_implemented(*args, **kwargs):
     raise NotImplementedError()
 
 
+def _iter_lines(buf, encoding="utf-8"):
+    """
+    :param buf: mmap object
+    :param encoding: Encoding of the content of `buf`
+    :return: Generator yields lines (strings) read from `buf`
+    """
+    for line in iter(buf.readline, b''):
+        yield line.decode(encoding)
+
+
+def iter_lines(buf, start=0, end=None):
+    """
+    :param buf: A string or bytes-like object has find method, e.g. mmap
+    :param start: Offset to start reading lines
+    :param end: Offset to stop reading lines or None to read until the end
+    :return:
+        Generator yields (offset, line) of the lines in buf[start:end], lines
+        are slices of `buf` have line breaks
+
+    >>> list(iter_lines("a\\nbc\\n\\nd"))
+    [(0, 'a\\n'), (2, 'bc\\n'), (5, '\\n'), (6, 'd')]
+    """
+    newline = '\n' if isinstance(buf, anyconfig.compat.STR_TYPES) else b'\n'
+    if end is None:
+        end = len(buf)
+
+    pos = start
+    while pos < end:
+        nxt = buf.find(newline, pos, end)
+        nxt = end if nxt < 0 else nxt + 1
+        yield (pos, buf[pos:nxt])
+        pos = nxt
+
+
+def decode_lines(buf, start=0, end=None, encoding="utf-8"):
+    """
+    :param buf: A string or bytes-like object, e.g. mmap
+    :param start: Offset to start reading lines
+    :param end: Offset to stop reading lines or None to read until the end
+    :param encoding: Encoding of the content of `buf` if it's bytes-like
+    :return: A list of lines (strings) in buf[start:end]
+
+    >>> decode_lines(b"a\\nb\\n", 2)
+    ['b\\n']
+    """
+    chunk = buf[start:end]
+    if not isinstance(chunk, anyconfig.compat.STR_TYPES):
+        chunk = anyconfig.utils.decode_buffer(chunk, encoding)
+
+    return chunk.splitlines(True)
+
+
+class LazyMapping(MutableMapping):
+    """
+    Mapping object loads the value of each item with the function given only
+    when it was accessed first, and caches it.
+
+    Items set or deleted are kept in memory and never written back.
+
+    >>> cnf = LazyMapping(dict(a=1, b=2), lambda key, loc: loc * 10)
+    >>> cnf["a"], sorted(cnf.items())
+    (10, [('a', 10), ('b', 20)])
+    """
+    def __init__(self, index, load_fn):
+        """
+        :param index:
+            Mapping object of {key: locator of the value}, e.g. offsets in the
+            file, used to keep the order of items also
+        :param load_fn: Function to load the value, called with the key and
+            its locator
+        """
+        self._index = index
+        self._load = load_fn
+        self._data = {}  # Cache of values loaded or set.
+
+    def __getitem__(self, key):
+        try:
+            return self._data[key]
+        except KeyError:
+            pass
+
+        val = self._data[key] = self._load(key, self._index[key])
+        return val
+
+    def __setitem__(self, key, val):
+        if key not in self._index:
+            self._index[key] = None
+        self._data[key] = val
+
+    def __delitem__(self, key):
+        del self._index[key]
+        self._data.pop(key, None)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __repr__(self):
+        return "<%s: %d items, %d loaded>" % (self.__class__.__name__,
+                                              len(self), len(self._data))
+
+
+_COMPRESSED_FILES = dict(gz="GzipFile", bz2="BZ2File", xz="LZMAFile")
+
+
+def _open(filepath, mode, **kwargs):
+    """
+    Open a file or a compressed file, detected by its extension, e.g. '.gz',
+    with given mode. Data of compressed files are decompressed and compressed
+    on the fly as they are read and written.
+
+    :param filepath: Path to file to open
+    :param mode: Mode to open the file, e.g. 'r', 'w', 'rb' and 'wb'
+    :param kwargs: Keyword arguments passed to open function or
+        :class:`io.TextIOWrapper` to open compressed files in text mode
+    :return: A file object
+    :raises: ValueError if the module to (de)compress the file is not
+        available, e.g. lzma in python 2
+    """
+    comp = anyconfig.utils.get_compression(filepath)
+    if comp is None:
+        return open(filepath, mode, **kwargs)
+
+    modname = anyconfig.utils.COMPRESSIONS[comp]
+    try:
+        module = importlib.import_module(modname)
+    except ImportError:  # e.g. lzma is not available in python 2.
+        raise ValueError("Module '%s' to open '%s' files is not available"
+                         % (modname, comp))
+
+    fobj = getattr(module, _COMPRESSED_FILES[comp])(filepath, mode[0] + 'b')
+    if 'b' in mode or not anyconfig.compat.IS_PYTHON_3:
+        return fobj  # Opened in text mode has no difference in python 2.
+
+    return io.TextIOWrapper(fobj, **kwargs)
+
+
+def _maybe_frozen(cnf, frozen=False):
+    """
+    :param cnf: Mapping object loaded
+    :param frozen: Freeze `cnf` if True
+    :return: `cnf` frozen with :func:`anyconfig.frozen.freeze` or as it is
+    """
+    return anyconfig.frozen.freeze(cnf) if frozen else cnf
+
+
 class TextFilesMixin(object):
     """Mixin class to open configuration files as a plain text.
 
@@ -91,6 +280,9 @@ class TextFilesMixin(object):
 
     - python 2: https://docs.python.org/2/library/functions.html#open
     - python 3: https://docs.python.org/3/library/functions.html#open
+
+    Compressed files, e.g. 'a.json.gz', are opened with the module to
+    (de)compress them, see :func:`anyconfig.utils.get_compression`.
     """
     _open_flags = ('r', 'w')
 
@@ -99,14 +291,14 @@ class TextFilesMixin(object):
         """
         :param filepath: Path to file to open to read data
         """
-        return open(filepath, cls._open_flags[0], **kwargs)
+        return _open(filepath, cls._open_flags[0], **kwargs)
 
     @classmethod
     def wopen(cls, filepath, **kwargs):
         """
         :param filepath: Path to file to open to write data to
         """
-        return open(filepath, cls._open_flags[1], **kwargs)
+        return _open(filepath, cls._open_flags[1], **kwargs)
 
 
 class BinaryFilesMixin(TextFilesMixin):
@@ -130,10 +322,27 @@ class LoaderMixin(object):
     - _load_opts: Backend specific options on load
     - _ordered: True if the parser keep the order of items by default
     - _dict_opts: Backend options to customize dict class to make results
+    - _allow_buffer: True if :meth:`load_from_string` can load data from
+      bytes-like objects directly
+    - _allow_lines: True if :meth:`load_from_stream` can load data from any
+      iterables yield lines
+    - _allow_frozen: True if mapping objects are made from (key, value) pairs
+      at once with the container, so that immutable mapping objects can be
+      made directly while loading with 'ac_frozen' option
+    - _allow_intern: True if mapping objects are made from (key, value) pairs
+      at once with the container, so that keys and values are interned while
+      loading with 'ac_intern' option
+    - _allow_lazy: True if :meth:`load_lazily` is implemented to load configs
+      lazily with 'ac_lazy' option
     """
     _load_opts = []
     _ordered = False
     _dict_opts = []
+    _allow_buffer = False
+    _allow_lines = False
+    _allow_frozen = False
+    _allow_intern = False
+    _allow_lazy = False
 
     @classmethod
     def ordered(cls):
@@ -151,12 +360,23 @@ class LoaderMixin(object):
 
     def _container_factory(self, **options):
         """
-        The order of prirorities are ac_dict, backend specific dict class
-        option, ac_ordered.
+        The order of prirorities are ac_frozen, ac_dict, backend specific dict
+        class option, ac_ordered. Containers made with any of them are wrapped
+        to intern keys and values if 'ac_intern' option was given.
 
         :param options: Keyword options may contain 'ac_ordered'.
         :return: Factory (class or function) to make an container.
         """
+        ac_intern = options.get("ac_intern", False)
+        if self._allow_intern and ac_intern:
+            container = self._container_factory(**dict(options,
+                                                       ac_intern=False))
+            subtrees = ac_intern == anyconfig.interning.SUBTREES
+            return anyconfig.interning.make_container(container, subtrees)
+
+        if self._allow_frozen and options.get("ac_frozen", False):
+            return anyconfig.frozen.FrozenDict
+
         ac_dict = options.get("ac_dict", False)
         _dicts = [x for x in (options.get(o) for o in self.dict_options())
                   if x]
@@ -170,6 +390,40 @@ class LoaderMixin(object):
 
         return dict
 
+    def _postprocessor(self, container, ac_frozen=False, ac_intern=False,
+                       ac_array=None, ac_columnar=False, **_options):
+        """
+        :param container: callble to make a container object
+        :param ac_array:
+            "array" or "numpy" to convert large homogeneous numeric lists in
+            loaded configs to array objects, see :mod:`anyconfig.arrays`
+        :param ac_columnar:
+            Convert large lists of homogeneous records in loaded configs to
+            columnar objects if True, see :mod:`anyconfig.columnar`
+        :param ac_frozen: Freeze loaded configs if True
+        :param ac_intern:
+            Intern keys and values of loaded configs if True or
+            :data:`anyconfig.interning.SUBTREES`, and the backend could not
+            do that while loading
+        :return: Function to process loaded configs
+        """
+        intern = ac_intern and not self._allow_intern
+
+        def postprocess(cnf):
+            """Process loaded config `cnf`."""
+            if ac_array:
+                cnf = anyconfig.arrays.convert(cnf, ac_array)
+            if intern:
+                subtrees = ac_intern == anyconfig.interning.SUBTREES
+                cnf = anyconfig.interning.intern_tree(cnf, container,
+                                                      subtrees=subtrees)
+            cnf = _maybe_frozen(cnf, ac_frozen)
+            if ac_columnar:  # Frozen ones are kept as they are.
+                cnf = anyconfig.columnar.convert(cnf, array_kind=ac_array)
+            return cnf
+
+        return postprocess
+
     def _load_options(self, container, **options):
         """
         Select backend specific loading options.
@@ -218,11 +472,87 @@ class LoaderMixin(object):
         """
         _not_implemented(self, stream, container, **kwargs)
 
+    def load_from_mmap(self, filepath, container, **kwargs):
+        """
+        Load config from given file path `filepath` mapped into memory. Data
+        of the file is passed to :meth:`load_from_string` as a mmap object
+        or to :meth:`load_from_stream` as lines read from it if the parser can
+        load data from them (`_allow_buffer` or `_allow_lines`) without reading
+        the whole file into a string, or the file is loaded in usual way with
+        :meth:`load_from_path` if not.
+
+        :param filepath: Config file path
+        :param container: callble to make a container object later
+        :param kwargs: optional keyword parameters to be sanitized :: dict
+
+        :return: Dict-like object holding config parameters
+        """
+        if not os.path.getsize(filepath):
+            return container()  # Empty files cannot be mapped.
+
+        if not (self._allow_buffer or self._allow_lines) or \
+                anyconfig.utils.get_compression(filepath) is not None:
+            return self.load_from_path(filepath, container, **kwargs)
+
+        with open(filepath, 'rb') as inp:
+            buf = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if self._allow_buffer:
+                    return self.load_from_string(buf, container, **kwargs)
+
+                return self.load_from_stream(_iter_lines(buf), container,
+                                             **kwargs)
+            finally:
+                buf.close()
+
+    def load_lazily(self, buf, container, **kwargs):
+        """
+        Load config from a string or bytes-like object `buf` lazily, e.g.
+        find the items only and load their values when they are accessed
+        first, with :class:`LazyMapping`. Backends set `_allow_lazy` should
+        override this.
+
+        :param buf:
+            A string or bytes-like object has find method, e.g. mmap, kept
+            while the result is alive
+        :param container: callble to make a container object later
+        :param kwargs: optional keyword parameters to be sanitized :: dict
+
+        :return: Dict-like object holding config parameters
+        """
+        _not_implemented(self, buf, container, **kwargs)
+
+    def _load_lazily_from_path(self, filepath, container, **kwargs):
+        """
+        Load config from given file path `filepath` lazily. The file is mapped
+        into memory and kept mapped while the result is alive, or read at
+        once if it cannot be mapped, e.g. compressed files.
+
+        :param filepath: Config file path
+        :param container: callble to make a container object later
+        :param kwargs: optional keyword parameters to be sanitized :: dict
+
+        :return: Dict-like object holding config parameters
+        """
+        if anyconfig.utils.get_compression(filepath) is not None:
+            with self.ropen(filepath) as inp:
+                return self.load_lazily(inp.read(), container, **kwargs)
+
+        with open(filepath, 'rb') as inp:
+            if not os.fstat(inp.fileno()).st_size:
+                return self.load_lazily('', container, **kwargs)
+            buf = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return self.load_lazily(buf, container, **kwargs)
+
     def loads(self, content, **options):
         """
         Load config from given string `content` after some checks.
 
-        :param content:  Config file content
+        :param content:
+            Config file content, a string or bytes-like object such as bytes,
+            bytearray, memoryview and mmap, decoded with the encoding given
+            in 'ac_encoding' option (default: utf-8) for text backends
         :param options:
             options will be passed to backend specific loading functions.
             please note that options have to be sanitized w/
@@ -232,11 +562,29 @@ class LoaderMixin(object):
         :return: dict or dict-like object holding configurations
         """
         container = self._container_factory(**options)
+        lazy = self._allow_lazy and options.get("ac_lazy", False)
+        postprocess = self._postprocessor(container, **options)
         if not content or content is None:
-            return container()
+            return postprocess(container())
+
+        if lazy:
+            if isinstance(content, memoryview):  # It does not have find.
+                content = content.tobytes()
+            options = self._load_options(container, **options)
+            return postprocess(self.load_lazily(content, container,
+                                                **options))
+
+        if not self._allow_buffer and anyconfig.utils.is_buffer(content):
+            if 'b' in getattr(self, "_open_flags", ('r', ))[0]:
+                # Binary backends, e.g. SQLite.
+                content = anyconfig.utils.bytes_from_buffer(content)
+            else:
+                encoding = options.get("ac_encoding") or "utf-8"
+                content = anyconfig.utils.decode_buffer(content, encoding)
 
         options = self._load_options(container, **options)
-        return self.load_from_string(content, container, **options)
+        return postprocess(self.load_from_string(content, container,
+                                                 **options))
 
     def load(self, path_or_stream, ignore_missing=False, **options):
         """
@@ -257,17 +605,72 @@ class LoaderMixin(object):
         :return: dict or dict-like object holding configurations
         """
         container = self._container_factory(**options)
+        use_mmap = options.get("ac_mmap", False)
+        lazy = self._allow_lazy and options.get("ac_lazy", False)
+        postprocess = self._postprocessor(container, **options)
         options = self._load_options(container, **options)
 
         if isinstance(path_or_stream, anyconfig.compat.STR_TYPES):
             if ignore_missing and not os.path.exists(path_or_stream):
-                return container()
-
-            cnf = self.load_from_path(path_or_stream, container, **options)
+                return postprocess(container())
+
+            if lazy:
+                cnf = self._load_lazily_from_path(path_or_stream, container,
+                                                  **options)
+            elif use_mmap:
+                cnf = self.load_from_mmap(path_or_stream, container, **options)
+            else:
+                cnf = self.load_from_path(path_or_stream, container, **options)
+        elif lazy:
+            cnf = self.load_lazily(path_or_stream.read(), container, **options)
         else:
             cnf = self.load_from_stream(path_or_stream, container, **options)
 
-        return cnf
+        return postprocess(cnf)
+
+    def load_all_from_stream(self, stream, container, **kwargs):
+        """
+        Load configs from given file like object `stream` one by one. Backends
+        support multiple documents in a stream such as YAML should override
+        this and yield each of them as soon as constructed.
+
+        :param stream:  Config file or file like object
+        :param container: callble to make a container object later
+        :param kwargs: optional keyword parameters to be sanitized :: dict
+
+        :return: Generator yields dict-like objects holding config parameters
+        """
+        yield self.load_from_stream(stream, container, **kwargs)
+
+    def load_all(self, path_or_stream, ignore_missing=False, **options):
+        """
+        Load configs from a file path or a file / file-like object
+        `path_or_stream` one by one after some checks.
+
+        :param path_or_stream: Config file path or file{,-like} object
+        :param ignore_missing:
+            Ignore and yield nothing if given `path_or_stream` is a file path
+            and does not exist in actual.
+        :param options: see :meth:`load`
+
+        :return: Generator yields dict or dict-like objects
+        """
+        container = self._container_factory(**options)
+        postprocess = self._postprocessor(container, **options)
+        options = self._load_options(container, **options)
+
+        if isinstance(path_or_stream, anyconfig.compat.STR_TYPES):
+            if ignore_missing and not os.path.exists(path_or_stream):
+                return
+
+            with self.ropen(path_or_stream) as inp:
+                for cnf in self.load_all_from_stream(inp, container,
+                                                     **options):
+                    yield postprocess(cnf)
+        else:
+            for cnf in self.load_all_from_stream(path_or_stream, container,
+                                                 **options):
+                yield postprocess(cnf)
 
 
 class DumperMixin(object):
@@ -591,7 +994,7 @@ class StringStreamFnParser(Parser, FromStreamLoaderMixin, ToStreamDumperMixin):
        Callables have to be wrapped with :func:`to_method` to make `self`
        passed to the methods created from them ignoring it.
 
-    :seealso: :class:`anyconfig.backend.json.Parser`
+    :seealso: :class:`anyconfig.backend.pickle.Parser`
     """
     _load_from_string_fn = None
     _load_from_stream_fn = None
@@ -21,6 +21,11 @@ r"""Configobj backend:
 
 Chnagelog:
 
+.. versionchanged:: 0.9.5
+
+   - Load data from files opened with :meth:`Parser.ropen` to support
+     compressed files.
+
 .. versionchanged:: 0.5.0
 
    - Now loading and dumping options are detected automatically from inspection
@@ -83,7 +88,7 @@ class Parser(anyconfig.backend.base.StreamParser,
     _dump_opts = _LOAD_OPTS  # Likewise.
     _ordered = True
 
-    load_from_path = load_from_stream = anyconfig.backend.base.to_method(load)
+    load_from_stream = anyconfig.backend.base.to_method(load)
 
     def dump_to_string(self, cnf, **kwargs):
         """
@@ -21,10 +21,35 @@ r"""INI backend:
 - Special options:
 
   - Use 'ac_parse_value' boolean keyword option if you want to parse values by
-    custom parser, anyconfig.backend.ini._parse.
+    custom parser, anyconfig.backend.ini._parse. It may be a name or a list of
+    names of typing rules instead of True to select them, e.g. "int" or
+    ["null", "bool", "int", "float", "str"]. See also
+    :func:`anyconfig.parser.mk_scalar_parser`.
+
+  - Use 'ac_engine' keyword option to select the engine to parse INI files:
+    "configparser" (default) to parse them with configparser module or "fast"
+    to parse them with the built-in single pass parser which is faster and
+    should give the same results as configparser except for some corner cases
+    like syntax errors.
+
+  - Use 'ac_lazy' boolean keyword option to load sections lazily. Section
+    headers are found in a single pass first, and options in each section are
+    parsed with the engine "fast" only when the section is accessed first.
+    Errors in sections are raised when they are accessed.
 
 Changelog:
 
+.. versionchanged:: 0.9.5
+
+   - Add 'ac_engine' keyword option and the built-in single pass parser
+     selected with it, streams lines into containers directly.
+   - Values are parsed faster with memoization if 'ac_parse_value' is given,
+     and it can be a list of names of typing rules.
+   - Load data from memory-mapped files line by line if 'ac_mmap' option was
+     given.
+   - Load sections lazily, parse each section only when it's accessed first,
+     if 'ac_lazy' option was given.
+
 .. versionchanged:: 0.3
 
    - Introduce 'ac_parse_value' keyword option to switch behaviors, same as
@@ -33,7 +58,10 @@ Changelog:
 from __future__ import absolute_import
 
 import os
+import re
+
 import anyconfig.backend.base
+import anyconfig.compat
 import anyconfig.parser as P
 import anyconfig.utils
 
@@ -47,18 +75,29 @@ try:
 except AttributeError:
     DEFAULTSECT = "DEFAULT"
 
+_COMMENT_MARKERS = ('#', ';')
+_SECT_RE = re.compile(r"\[(?P<header>.+)\]")
+_OPT_RE = re.compile(r"(?P<option>.*?)\s*(?P<vi>[=:])\s*(?P<value>.*)$")
+_OPT_NV_RE = re.compile(r"(?P<option>.*?)\s*(?:(?P<vi>[=:])\s*"
+                        r"(?P<value>.*))?$")
+_INTERP_KEY_RE = re.compile(r"%\(([^)]+)\)s")
+_MAX_INTERP_DEPTH = getattr(configparser, "MAX_INTERPOLATION_DEPTH", 10)
 
-def _parse(val_s, sep=_SEP):
+
+def _parse(val_s, sep=_SEP, rules=None):
     """
     FIXME: May be too naive implementation.
 
     :param val_s: A string represents some value to parse
     :param sep: separator between values
+    :param rules: Typing rules, see :func:`anyconfig.parser.parse_single`
 
     >>> _parse(r'"foo string"')
     'foo string'
     >>> _parse("a, b, c")
     ['a', 'b', 'c']
+    >>> _parse("1, 2")
+    [1, 2]
     >>> _parse("aaa")
     'aaa'
     """
@@ -66,9 +105,9 @@ def _parse(val_s, sep=_SEP):
             (val_s.startswith("'") and val_s.endswith("'")):
         return val_s[1:-1]
     elif sep in val_s:
-        return [P.parse(x) for x in P.parse_list(val_s)]
+        return P.parse_list(val_s, sep, rules=rules)
 
-    return P.parse(val_s)
+    return P.parse(val_s, rules=rules)
 
 
 def _to_s(val, sep=", "):
@@ -94,9 +133,10 @@ def _parsed_items(items, sep=_SEP, **options):
     :param sep: Seprator string
     :return: Generator to yield (key, value) pair of `dic`
     """
-    parse = _parse if options.get("ac_parse_value") else anyconfig.utils.noop
+    rules = options.get("ac_parse_value")
+    parse = _parse if rules else anyconfig.utils.noop
     for key, val in items:
-        yield (key, parse(val, sep))
+        yield (key, parse(val, sep, rules))
 
 
 def _make_parser(**kwargs):
@@ -148,6 +188,352 @@ def _load(stream, container, sep=_SEP, dkey=DEFAULTSECT, **kwargs):
     return cnf
 
 
+def _interpolate(val, option, section, vals, depth=1):
+    """
+    Expand references to other options in `val` like :meth:`get` of
+    configparser.SafeConfigParser does, e.g. '%(name)s' and '%%'.
+
+    :param val: A string value of the option might contain references
+    :param option: Option name
+    :param section: Section name
+    :param vals: A dict of {option: raw value} to resolve references
+    :param depth: Current depth of the nested references
+
+    :return: A string expanded
+
+    >>> _interpolate("%(a)s/b, 100%%", "c", "s", dict(a="/a"))
+    '/a/b, 100%'
+    """
+    if depth > _MAX_INTERP_DEPTH:
+        raise configparser.InterpolationDepthError(option, section, val)
+
+    ret = []
+    rest = val
+    while rest:
+        pos = rest.find('%')
+        if pos < 0:
+            ret.append(rest)
+            break
+
+        if pos > 0:
+            ret.append(rest[:pos])
+            rest = rest[pos:]
+
+        nchr = rest[1:2]
+        if nchr == '%':
+            ret.append('%')
+            rest = rest[2:]
+        elif nchr == '(':
+            mat = _INTERP_KEY_RE.match(rest)
+            if mat is None:
+                msg = "bad interpolation variable reference %r" % rest
+                raise configparser.InterpolationSyntaxError(option, section,
+                                                            msg)
+            ref = mat.group(1).lower()
+            rest = rest[mat.end():]
+            if ref not in vals:
+                raise configparser.InterpolationMissingOptionError(option,
+                                                                   section,
+                                                                   val, ref)
+            rval = vals[ref]
+            if rval and '%' in rval:
+                rval = _interpolate(rval, option, section, vals, depth + 1)
+            ret.append(rval or '')
+        else:
+            msg = ("'%%' must be followed by '%%' or '(', found: %r" % rest)
+            raise configparser.InterpolationSyntaxError(option, section, msg)
+
+    return ''.join(ret)
+
+
+def _join_value(lines):
+    """
+    :param lines: A list of lines of the value of an option or None
+    :return: A string value joined or None
+    """
+    if lines is None:
+        return None
+
+    return '\n'.join(lines).rstrip()
+
+
+def _read_fast(stream, allow_no_value=False, comments=_COMMENT_MARKERS,
+               start=1):
+    """
+    Read INI-style conf from `stream` in a single pass, with the same rules
+    configparser.SafeConfigParser follows to process sections, options,
+    comments and multi-line values.
+
+    :param stream: File or file-like object provides ini-style conf
+    :param allow_no_value: Options without values are allowed if True
+    :param comments: Prefixes of comment lines
+    :param start: Line number of the first line in `stream`
+
+    :return: A tuple of (defaults, [(section, options)]), defaults and
+        options are dicts of {option: a list of lines or None}
+    """
+    optre = _OPT_NV_RE if allow_no_value else _OPT_RE
+    source = getattr(stream, "name", "<???>")
+    defaults = dict()
+    sections = anyconfig.compat.OrderedDict()
+    cursect = vals = None
+    indent = 0
+    error = None
+
+    for lineno, line in enumerate(stream, start=start):
+        value = line.strip()
+        if not value or value.startswith(comments):
+            if not value and vals is not None and IS_PYTHON_3:
+                # It's removed later if it's trailing one. Empty lines are
+                # just skipped with configparser in python 2.
+                vals.append('')
+            continue
+
+        cur_indent = len(line) - len(line.lstrip())
+        if vals is not None and cur_indent > indent:
+            vals.append(value)  # Continuation line of the value.
+            continue
+
+        indent = cur_indent
+        vals = None
+        mat = _SECT_RE.match(value)
+        if mat:
+            sect = mat.group("header")
+            if sect == DEFAULTSECT:
+                cursect = defaults
+            elif sect in sections:
+                raise configparser.DuplicateSectionError(sect, source,
+                                                         lineno)
+            else:
+                cursect = sections[sect] = anyconfig.compat.OrderedDict()
+            continue
+
+        if cursect is None:
+            raise configparser.MissingSectionHeaderError(source, lineno, line)
+
+        mat = optre.match(value)
+        if not mat or not mat.group("option"):
+            if error is None:
+                error = configparser.ParsingError(source)
+            error.append(lineno, repr(line))
+            continue
+
+        (opt, optval) = mat.group("option", "value")
+        opt = opt.rstrip().lower()
+        if opt in cursect:
+            sect = DEFAULTSECT if cursect is defaults else sect
+            raise configparser.DuplicateOptionError(sect, opt, source, lineno)
+
+        if optval is None:
+            cursect[opt] = None
+        else:
+            vals = cursect[opt] = [optval.strip()]
+
+    if error is not None:
+        raise error
+
+    return (defaults, sections.items())
+
+
+def _make_defaults(rdefaults, defaults=None):
+    """
+    :param rdefaults: A dict of {option: a list of lines or None} of defaults
+    :param defaults: A dict of defaults given as an option or None
+    :return: An ordered dict of {option: raw value} of defaults
+    """
+    # Keep the order of options same as configparser; defaults given as an
+    # option come first.
+    ret = anyconfig.compat.OrderedDict()
+    for key, val in iteritems(defaults or {}):
+        ret[key.lower()] = str(val)
+    for key, lines in iteritems(rdefaults):
+        ret[key] = _join_value(lines)
+
+    return ret
+
+
+def _make_section(sect, options, defaults, container, sep=_SEP, rules=None):
+    """
+    :param sect: Section name
+    :param options: A dict of {option: a list of lines or None} of `sect`
+    :param defaults: An ordered dict of {option: raw value} of defaults
+    :param container: any callable to make container
+    :param sep: Seprator string
+    :param rules: Typing rules to parse values or None not to parse them
+
+    :return: Dict or dict-like object represents values in `sect`
+    """
+    vals = defaults.copy()
+    for key, lines in iteritems(options):
+        vals[key] = _join_value(lines)
+
+    sdic = container()
+    for key, val in iteritems(vals):
+        if not val:
+            val = ''
+        elif '%' in val:
+            val = _interpolate(val, key, sect, vals)
+        sdic[key] = _parse(val, sep, rules) if rules else val
+
+    return sdic
+
+
+def _load_fast(stream, container, sep=_SEP, dkey=DEFAULTSECT, **kwargs):
+    """
+    An alternative of :func:`_load` to load INI-style conf faster without
+    configparser module. Sections and options are read in a single pass and
+    values in sections are stored into containers directly.
+
+    :param stream: File or file-like object provides ini-style conf
+    :param container: any callable to make container
+    :param sep: Seprator string
+    :param dkey: Default section name
+
+    :return: Dict or dict-like object represents config values
+    """
+    (rdefaults, sections) = _read_fast(stream, kwargs.get("allow_no_value"))
+    rules = kwargs.get("ac_parse_value")
+    defaults = _make_defaults(rdefaults, kwargs.get("defaults"))
+
+    cnf = container()
+    if defaults:
+        cnf[dkey] = container((k, _parse(v, sep, rules) if rules else v)
+                              for k, v in iteritems(defaults))
+
+    for sect, options in sections:
+        cnf[sect] = _make_section(sect, options, defaults, container, sep,
+                                  rules)
+
+    return cnf
+
+
+def _scan_sections(buf, allow_no_value=False, comments=_COMMENT_MARKERS):
+    """
+    Find the section headers in INI-style conf in a single pass without
+    parsing options, with the same rules as :func:`_read_fast`.
+
+    :param buf: A string or bytes-like object has find method, e.g. mmap
+    :param allow_no_value: Options without values are allowed if True
+    :param comments: Prefixes of comment lines
+
+    :return: A list of (section, offset, line number) of section headers
+
+    >>> _scan_sections("# c\\n[a]\\nb = 1\\n  [c]\\n[DEFAULT]\\n")
+    [('a', 4, 2), ('DEFAULT', 20, 5)]
+    """
+    if isinstance(buf, anyconfig.compat.STR_TYPES):
+        (lbr, seps) = ('[', ('=', ':'))
+    else:
+        (lbr, seps) = (b'[', (b'=', b':'))
+        comments = tuple(c.encode("utf-8") for c in comments)
+
+    ret = []
+    indent = 0
+    has_value = False  # The last option has a value may be continued.
+    for lineno, (offset, line) in enumerate(
+            anyconfig.backend.base.iter_lines(buf), start=1):
+        value = line.strip()
+        if not value or value.startswith(comments):
+            continue
+
+        cur_indent = len(line) - len(line.lstrip())
+        if has_value and cur_indent > indent:
+            continue  # Continuation line of the value.
+
+        indent = cur_indent
+        if value.startswith(lbr):
+            if not isinstance(value, anyconfig.compat.STR_TYPES):
+                value = anyconfig.utils.decode_buffer(value)
+            mat = _SECT_RE.match(value)
+            if mat:
+                ret.append((mat.group("header"), offset, lineno))
+                has_value = False
+                continue
+
+        has_value = not allow_no_value or any(s in value for s in seps)
+
+    return ret
+
+
+def _load_lazily(buf, container, sep=_SEP, dkey=DEFAULTSECT, **kwargs):
+    """
+    Load INI-style conf lazily. Section headers are found in a single pass
+    first, and each section is parsed with the engine 'fast' only when it's
+    accessed first. Defaults are parsed at once.
+
+    :param buf: A string or bytes-like object has find method, e.g. mmap
+    :param container: any callable to make container
+    :param sep: Seprator string
+    :param dkey: Default section name
+
+    :return: :class:`anyconfig.backend.base.LazyMapping` object represents
+        config values
+    :raises: configparser.Error if section headers are missing or duplicated,
+        and errors in each section are raised when it's accessed
+    """
+    allow_no_value = kwargs.get("allow_no_value")
+    rules = kwargs.get("ac_parse_value")
+    headers = _scan_sections(buf, allow_no_value)
+
+    ends = [offset for _sect, offset, _lineno in headers[1:]] + [len(buf)]
+    index = anyconfig.compat.OrderedDict()  # {section: (start, end, lineno)}
+    rdefaults = dict()
+
+    # Lines before the first section header must be comments or blank ones.
+    first = headers[0][1] if headers else len(buf)
+    _read_fast(anyconfig.backend.base.decode_lines(buf, 0, first),
+               allow_no_value)
+
+    for (sect, start, lineno), end in zip(headers, ends):
+        if sect == DEFAULTSECT:
+            lines = anyconfig.backend.base.decode_lines(buf, start, end)
+            (rdefs, _sects) = _read_fast(lines, allow_no_value, start=lineno)
+            for key, val in iteritems(rdefs):
+                if key in rdefaults:
+                    raise configparser.DuplicateOptionError(sect, key)
+                rdefaults[key] = val
+        elif sect in index:
+            raise configparser.DuplicateSectionError(sect, None, lineno)
+        else:
+            index[sect] = (start, end, lineno)
+
+    defaults = _make_defaults(rdefaults, kwargs.get("defaults"))
+
+    def load_section(sect, loc):
+        """Parse the section `sect` at `loc`."""
+        (start, end, lineno) = loc
+        lines = anyconfig.backend.base.decode_lines(buf, start, end)
+        (_defs, sections) = _read_fast(lines, allow_no_value, start=lineno)
+        return _make_section(sect, dict(sections)[sect], defaults, container,
+                             sep, rules)
+
+    if defaults:  # Defaults come first as :func:`_load_fast` does.
+        index = anyconfig.compat.OrderedDict([(dkey, None)] +
+                                             list(index.items()))
+
+    cnf = anyconfig.backend.base.LazyMapping(index, load_section)
+    if defaults:
+        cnf[dkey] = container((k, _parse(v, sep, rules) if rules else v)
+                              for k, v in iteritems(defaults))
+
+    return cnf
+
+
+def _load_selected(stream, container, **kwargs):
+    """
+    Load INI-style conf with the engine selected by 'ac_engine' option.
+
+    :param stream: File or file-like object provides ini-style conf
+    :param container: any callable to make container
+
+    :return: Dict or dict-like object represents config values
+    """
+    if kwargs.get("ac_engine") == "fast":
+        return _load_fast(stream, container, **kwargs)
+
+    return _load(stream, container, **kwargs)
+
+
 def _dumps_itr(cnf, dkey=DEFAULTSECT):
     """
     :param cnf: Configuration data to dump
@@ -183,10 +569,13 @@ class Parser(anyconfig.backend.base.Parser,
     _type = "ini"
     _extensions = ["ini"]
     _load_opts = ["defaults", "dict_type", "allow_no_value", "filename",
-                  "ac_parse_value"]
+                  "ac_parse_value", "ac_engine", "ac_lazy"]
     _dict_opts = ["dict_type"]
+    _allow_lines = IS_PYTHON_3  # readfp needs readline in python 2.
+    _allow_lazy = True
 
     dump_to_string = anyconfig.backend.base.to_method(_dumps)
-    load_from_stream = anyconfig.backend.base.to_method(_load)
+    load_from_stream = anyconfig.backend.base.to_method(_load_selected)
+    load_lazily = anyconfig.backend.base.to_method(_load_lazily)
 
 # vim:sw=4:ts=4:et:
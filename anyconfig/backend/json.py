@@ -20,19 +20,56 @@ r"""JSON backend:
     https://docs.python.org/2/library/json.html dependent on the python version
     to use.
 
+  - Use 'ac_json_engine' keyword option to select the engine, JSON module
+    to load and dump data:
+
+    - "json" (default): json in python standard library
+    - "simplejson": simplejson, https://github.com/simplejson/simplejson
+    - "orjson": orjson, https://github.com/ijl/orjson
+    - "auto": The fastest one of the above available, selected at first use
+    - A pair of callables (loads, dumps) to load data from a string and dump
+      data to a string, called without any options.
+
+    Options not supported by the engine selected, e.g. 'cls' and 'indent=4'
+    for orjson, are mapped onto it if possible and the default engine is used
+    instead if not. Please note that the format of outputs may differ, e.g.
+    white spaces, by engines.
+
 Changelog:
 
-    .. versionadded:: 0.0.1
+.. versionchanged:: 0.9.5
+
+   - Add 'ac_json_engine' option to select the engine to load and dump data.
+   - Load data from bytes-like objects such as memoryview and mmap without
+     making extra copies of them.
+   - Do not pass dict options, object_pairs_hook and object_hook if they are
+     dict because json module makes dicts natively and faster without them.
+   - Make immutable mapping objects directly while loading with 'ac_frozen'
+     option, and intern keys and values with 'ac_intern' option.
+   - Dump array objects made with 'ac_array' option as arrays.
+   - Dump records made with 'ac_columnar' option as arrays of objects.
+
+.. versionadded:: 0.0.1
 """
 from __future__ import absolute_import
 
+import importlib
+import logging
+import mmap
+
 try:
     import json
 except ImportError:
     import simplejson as json
 
 import anyconfig.backend.base
+import anyconfig.columnar
 import anyconfig.compat
+import anyconfig.dicts
+import anyconfig.utils
+
+
+LOGGER = logging.getLogger(__name__)
 
 
 _LOAD_OPTS = ["cls", "object_hook", "parse_float", "parse_int",
@@ -52,20 +89,330 @@ if not anyconfig.compat.IS_PYTHON_2_6:
     _DICT_OPTS.insert(0, "object_pairs_hook")  # Higher prio. than object_hook
 
 
-class Parser(anyconfig.backend.base.StringStreamFnParser):
+_ENGINE_OPT = "ac_json_engine"
+
+
+def _detect_encoding(buf):
+    """
+    :param buf: A bytes-like object holds JSON data
+    :return: Encoding of JSON data, e.g. 'utf-8'
+    """
+    try:
+        return json.detect_encoding(bytes(buf[:4]))
+    except AttributeError:  # It's not available in older versions.
+        return "utf-8"
+
+
+ENGINES = ("orjson", "json", "simplejson")  # Faster ones come first.
+
+
+def _loads_buffers(loads):
+    """
+    :param loads: Callable to load data from a string
+    :return: True if `loads` can load data from bytes-like objects directly
+    """
+    try:
+        loads(bytearray(b"{}"))  # Not supported < 3.6.
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+class Engine(object):
+    """
+    JSON engine wraps a JSON module provides load{s,} and dump{s,} compatible
+    with json in python standard library, e.g. json and simplejson.
+    """
+    _load_opts = _LOAD_OPTS
+    _dump_opts = _DUMP_OPTS
+    _buffer_types = (bytes, bytearray)  # Loaded directly without decoding.
+
+    def __init__(self, name, module=None):
+        """
+        :param name: Engine name
+        :param module: JSON module
+        """
+        self.name = name
+        self._module = module
+        if module is not None and not _loads_buffers(module.loads):
+            self._buffer_types = ()
+
+    def supports(self, options, dump=False):
+        """
+        :param options: Keyword options to load or dump data
+        :param dump: True if `options` are options to dump data
+        :return: True if all of `options` are supported by this engine
+        """
+        opts = self._dump_opts if dump else self._load_opts
+        return all(key in opts for key in options)
+
+    def _content(self, content):
+        """
+        :param content: JSON string or bytes-like object
+        :return:
+            `content` itself if the engine can load data from it directly or
+            a string decoded from it
+        """
+        if isinstance(content, self._buffer_types) or \
+                not anyconfig.utils.is_buffer(content):
+            return content
+
+        encoding = _detect_encoding(content)
+        return anyconfig.utils.decode_buffer(content, encoding)
+
+    def loads(self, content, container, **options):
+        """
+        :param content: JSON string or bytes-like object
+        :param container: callble to make a container object
+        :param options: keyword options passed to loads
+        :return: container object holding data
+        """
+        content = self._content(content)
+        if container is dict:
+            options = dict((k, v) for k, v in options.items()
+                           if not (k in _DICT_OPTS and v is dict))
+
+        return anyconfig.backend.base.load_with_fn(self._module.loads,
+                                                   content, container,
+                                                   **options)
+
+    def load(self, stream, container, **options):
+        """
+        :param stream: File or file-like object provides JSON data
+        :param container: callble to make a container object
+        :param options: keyword options passed to loads
+        :return: container object holding data
+        """
+        return self.loads(stream.read(), container, **options)
+
+    def dumps(self, cnf, **options):
+        """
+        :param cnf: Data to dump
+        :param options: keyword options passed to dumps
+        :return: JSON string
+        """
+        options.setdefault("default", anyconfig.columnar.json_default)
+        return self._module.dumps(cnf, **options)
+
+    def dump(self, cnf, stream, **options):
+        """
+        :param cnf: Data to dump
+        :param stream: File or file-like object to write JSON data
+        :param options: keyword options passed to dumps
+        """
+        stream.write(self.dumps(cnf, **options))
+
+
+class CallablesEngine(Engine):
+    """
+    JSON engine wraps a pair of callables to load data from a string and dump
+    data to a string. Containers are made from results after loaded and
+    keyword options are not passed to them.
+    """
+    _load_opts = _DICT_OPTS
+    _dump_opts = []
+    _buffer_types = (bytes, )
+
+    def __init__(self, name, loads, dumps):
+        """
+        :param name: Engine name
+        :param loads: Callable to load data from a string
+        :param dumps: Callable to dump data to a string or bytes
+        """
+        super(CallablesEngine, self).__init__(name)
+        self._loads = loads
+        self._dumps = dumps
+
+    def _dumps_options(self, options):
+        """
+        :param options: keyword options to dump data
+        :return: keyword options passed to the callable to dump data
+        """
+        return dict()
+
+    def loads(self, content, container, **options):
+        ret = self._loads(self._content(content))
+        if ret is None:
+            return container()
+
+        if container is not dict:
+            return anyconfig.dicts.convert_to(ret, ac_dict=container)
+
+        return ret if type(ret) is dict else container(ret)
+
+    def dumps(self, cnf, **options):
+        ret = self._dumps(cnf, **self._dumps_options(options))
+        if isinstance(ret, bytes):
+            ret = ret.decode("utf-8")
+
+        return ret
+
+
+class OrjsonEngine(CallablesEngine):
+    """
+    JSON engine wraps orjson, https://github.com/ijl/orjson.
+    """
+    _dump_opts = ["indent", "sort_keys", "default"]
+    _buffer_types = (bytes, bytearray, memoryview)
+
+    def __init__(self, name, module):
+        super(OrjsonEngine, self).__init__(name, module.loads, module.dumps)
+        self._module = module
+
+    def loads(self, content, container, **options):
+        try:
+            if isinstance(content, mmap.mmap):
+                with memoryview(content) as buf:  # Avoid copying data.
+                    return super(OrjsonEngine, self).loads(buf, container,
+                                                           **options)
+
+            return super(OrjsonEngine, self).loads(content, container,
+                                                   **options)
+        except self._module.JSONDecodeError:
+            # e.g. NaN and numbers out of the range of double.
+            return DEFAULT_ENGINE.loads(content, container, **options)
+
+    def dumps(self, cnf, **options):
+        try:
+            return super(OrjsonEngine, self).dumps(cnf, **options)
+        except self._module.JSONEncodeError:
+            # e.g. Integers out of the range of 64 bits integer.
+            return DEFAULT_ENGINE.dumps(cnf, **options)
+
+    def supports(self, options, dump=False):
+        if dump and options.get("indent") not in (None, 2):
+            return False  # Indentation with two spaces is only available.
+
+        if not dump and any(options.get(o, dict) is not dict for o
+                            in _DICT_OPTS):
+            return False  # Converting results to containers is too slow.
+
+        return super(OrjsonEngine, self).supports(options, dump=dump)
+
+    def _dumps_options(self, options):
+        flags = self._module.OPT_NON_STR_KEYS
+        if options.get("indent"):
+            flags |= self._module.OPT_INDENT_2
+        if options.get("sort_keys"):
+            flags |= self._module.OPT_SORT_KEYS
+
+        return dict(default=options.get("default",
+                                        anyconfig.columnar.json_default),
+                    option=flags)
+
+
+DEFAULT_ENGINE = Engine(json.__name__, json)
+_ENGINES = {DEFAULT_ENGINE.name: DEFAULT_ENGINE}  # {name: engine}
+
+
+def _find_engine(name):
+    """
+    :param name: Engine name, one of ENGINES
+    :return: Engine object or None if the module is not available
+    """
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        return None
+
+    if name == "orjson":
+        return OrjsonEngine(name, module)
+
+    return Engine(name, module)
+
+
+def get_engine(engine="json"):
+    """
+    :param engine:
+        Engine name, one of ENGINES or "auto", or a pair of callables (loads,
+        dumps) to load data from a string and dump data to a string
+    :return: Engine object
+
+    >>> get_engine().name
+    'json'
+    >>> get_engine("auto").name in ENGINES
+    True
+    """
+    if not isinstance(engine, anyconfig.compat.STR_TYPES):
+        (loads, dumps) = engine
+        return CallablesEngine(getattr(loads, "__module__", None), loads,
+                               dumps)
+
+    try:
+        return _ENGINES[engine]
+    except KeyError:
+        pass
+
+    if engine == "auto":
+        ret = next((e for e in (_ENGINES.get(n) or _find_engine(n) for n
+                                in ENGINES) if e is not None), DEFAULT_ENGINE)
+    elif engine in ENGINES:
+        ret = _find_engine(engine)
+        if ret is None:
+            LOGGER.warning("JSON engine '%s' is not available. Use the "
+                           "default one instead.", engine)
+            ret = DEFAULT_ENGINE
+    else:
+        raise ValueError("Unknown JSON engine: %r" % engine)
+
+    return _ENGINES.setdefault(engine, ret)
+
+
+def _select_engine(options, dump=False):
+    """
+    :param options: keyword options to load or dump data, may contain
+        'ac_json_engine' which is removed from it
+    :param dump: True if `options` are options to dump data
+    :return: Engine object supports `options`
+    """
+    engine = get_engine(options.pop(_ENGINE_OPT, None) or DEFAULT_ENGINE.name)
+    if engine is DEFAULT_ENGINE or engine.supports(options, dump=dump):
+        return engine
+
+    LOGGER.debug("Some options are not supported by JSON engine '%s'. Use "
+                 "the default one instead: %r", engine.name, options)
+    return DEFAULT_ENGINE
+
+
+class Parser(anyconfig.backend.base.Parser,
+             anyconfig.backend.base.FromStringLoaderMixin,
+             anyconfig.backend.base.ToStringDumperMixin):
     """
     Parser for JSON files.
     """
     _type = "json"
     _extensions = ["json", "jsn", "js"]
-    _load_opts = _LOAD_OPTS
-    _dump_opts = _DUMP_OPTS
+    _load_opts = _LOAD_OPTS + [_ENGINE_OPT]
+    _dump_opts = _DUMP_OPTS + [_ENGINE_OPT]
     _ordered = not anyconfig.compat.IS_PYTHON_2_6
     _dict_opts = _DICT_OPTS
+    _allow_buffer = True
+    _allow_frozen = True
+    _allow_intern = True
+
+    def load_from_string(self, content, container, **options):
+        """
+        Load data from given string `content`.
+
+        :param content: JSON string or bytes-like object
+        :param container: callble to make a container object
+        :param options: keyword options passed to the engine
+
+        :return: container object holding the data
+        """
+        engine = _select_engine(options)
+        return engine.loads(content, container, **options)
+
+    def dump_to_string(self, cnf, **kwargs):
+        """
+        Dump data `cnf` to a string.
+
+        :param cnf: Data to dump
+        :param kwargs: keyword options passed to the engine
 
-    _load_from_string_fn = anyconfig.backend.base.to_method(json.loads)
-    _load_from_stream_fn = anyconfig.backend.base.to_method(json.load)
-    _dump_to_string_fn = anyconfig.backend.base.to_method(json.dumps)
-    _dump_to_stream_fn = anyconfig.backend.base.to_method(json.dump)
+        :return: JSON string represents `cnf`
+        """
+        engine = _select_engine(kwargs, dump=True)
+        return engine.dumps(cnf, **kwargs)
 
 # vim:sw=4:ts=4:et:
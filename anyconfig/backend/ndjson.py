@@ -0,0 +1,177 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""NDJSON (JSON Lines) backend:
+
+- Format to support: NDJSON, http://ndjson.org and JSON Lines,
+  http://jsonlines.org, JSON objects (records) separated with newlines
+- Requirements: json (standard lib)
+- Development Status :: 4 - Beta
+- Limitations: Each line must be a JSON object.
+
+- Special options:
+
+  - 'ac_key': Name of the field of records to make a mapping object of
+    {value of the field: record} from records. Records have the same value of
+    the field are merged in the order of lines. If this option was not given,
+    all records are merged into one in the order of lines.
+
+  - 'ac_merge': Strategy to merge records, see :func:`anyconfig.dicts.merge`.
+
+  - Records are loaded and yielded one by one with :meth:`Parser.load_all`
+    and :func:`anyconfig.api.iterload`.
+
+  - Options of json.loads such as 'parse_float' and json.dumps such as
+    'sort_keys' except for 'indent' should work.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import json
+
+import anyconfig.backend.base
+import anyconfig.columnar
+import anyconfig.dicts
+import anyconfig.utils
+
+
+_LOAD_OPTS = ["object_pairs_hook", "parse_float", "parse_int",
+              "parse_constant"]
+_DUMP_OPTS = ["skipkeys", "ensure_ascii", "check_circular", "allow_nan",
+              "separators", "default", "sort_keys"]
+
+
+def _iter_records(stream, **options):
+    """
+    :param stream: A file or file like object or an iterable yields lines
+    :param options: Keyword options passed to json.loads
+    :return: Generator yields records (mapping objects) parsed from `stream`
+    """
+    options = anyconfig.utils.filter_options(_LOAD_OPTS, options)
+    if options.get("object_pairs_hook") is dict:
+        del options["object_pairs_hook"]  # It's just slower than the default.
+
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            record = json.loads(line, **options)
+        except ValueError as exc:
+            raise ValueError("line %d: %s" % (lineno, exc))
+
+        if not anyconfig.utils.is_dict_like(record):
+            raise ValueError("line %d: Not a JSON object: %s" % (lineno, line))
+
+        yield record
+
+
+def load(stream, container, ac_key=None, ac_merge=anyconfig.dicts.MS_DICTS,
+         **options):
+    """
+    Load records from given stream and merge them one by one.
+
+    :param stream: A file or file like object or an iterable yields lines
+    :param container: callble to make a container object
+    :param ac_key: Name of the field to make a mapping of records
+    :param ac_merge: Strategy to merge records
+    :param options: Keyword options passed to json.loads
+
+    :return: Mapping object
+    """
+    cnf = container()
+    for record in _iter_records(stream, **options):
+        if ac_key is None:
+            anyconfig.dicts.merge(cnf, record, ac_merge=ac_merge)
+            continue
+
+        try:
+            key = record[ac_key]
+        except KeyError:
+            raise ValueError("No key field '%s' in: %r" % (ac_key, record))
+
+        if key in cnf:
+            anyconfig.dicts.merge(cnf[key], record, ac_merge=ac_merge)
+        else:
+            cnf[key] = record
+
+    return cnf
+
+
+def _iter_dump_records(cnf, ac_key=None):
+    """
+    :param cnf: A mapping object or an iterable yields records
+    :param ac_key: Name of the field to make a mapping of records
+    :return: Generator yields records to dump
+    """
+    if not anyconfig.utils.is_dict_like(cnf):
+        for record in cnf:
+            yield record
+    elif ac_key is None:
+        yield cnf
+    else:
+        for key, record in cnf.items():
+            if ac_key not in record:
+                record = anyconfig.dicts.convert_to(record)
+                record[ac_key] = key
+            yield record
+
+
+def dump(cnf, stream, ac_key=None, **options):
+    """
+    Dump records to given stream line by line.
+
+    :param cnf:
+        A mapping object to dump as a record or a mapping of records made with
+        'ac_key' option, or an iterable (generator) yields records
+    :param stream: A file or file like object
+    :param ac_key: Name of the field to make a mapping of records
+    :param options: Keyword options passed to json.dumps
+    """
+    options.setdefault("default", anyconfig.columnar.json_default)
+    for record in _iter_dump_records(cnf, ac_key=ac_key):
+        stream.write(json.dumps(record, **options) + "\n")
+
+
+class Parser(anyconfig.backend.base.StreamParser):
+    """
+    Parser for NDJSON (JSON Lines) files.
+    """
+    _type = "ndjson"
+    _extensions = ["ndjson", "jsonl"]
+    _load_opts = ["ac_key", "ac_merge"] + _LOAD_OPTS
+    _dump_opts = ["ac_key"] + _DUMP_OPTS
+    _ordered = True
+    _dict_opts = ["object_pairs_hook"]
+    _allow_lines = True
+
+    dump_to_stream = anyconfig.backend.base.to_method(dump)
+
+    def load_from_stream(self, stream, container, **kwargs):
+        """
+        Load config from given file like object `stream`.
+
+        :param stream: A file or file like object of NDJSON data
+        :param container: callble to make a container object
+        :param kwargs: optional keyword parameters, see :func:`load`
+
+        :return: Dict-like object holding config parameters
+        """
+        return load(stream, container, **kwargs)
+
+    def load_all_from_stream(self, stream, container, **kwargs):
+        """
+        Load records from given file like object `stream` one by one.
+
+        :param stream: A file or file like object of NDJSON data
+        :param container: callble to make a container object
+        :param kwargs: optional keyword parameters passed to json.loads
+
+        :return: Generator yields records as soon as these were parsed
+        """
+        return _iter_records(stream, **kwargs)
+
+# vim:sw=4:ts=4:et:
@@ -19,7 +19,11 @@ r"""Pickle backend:
 
 Changelog:
 
-    .. versionadded:: 0.8.3
+.. versionchanged:: 0.9.5
+
+   - Load data from bytes-like objects such as memoryview and mmap directly.
+
+.. versionadded:: 0.8.3
 """
 from __future__ import absolute_import
 
@@ -49,6 +53,7 @@ class Parser(anyconfig.backend.base.StringStreamFnParser,
     _extensions = ["pkl", "pickle"]
     _load_opts = LOAD_OPTS
     _dump_opts = DUMP_OPTS
+    _allow_buffer = anyconfig.compat.IS_PYTHON_3  # pickle.loads needs str.
 
     _load_from_string_fn = anyconfig.backend.base.to_method(pickle.loads)
     _load_from_stream_fn = anyconfig.backend.base.to_method(pickle.load)
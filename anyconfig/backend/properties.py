@@ -13,10 +13,22 @@ r"""Java properties backend:
   - Key and value separator of white spaces is not supported
   - Keys contain escaped white spaces is not supported
 
-- Special options: None
+- Special options:
+
+  - Use 'ac_lazy' boolean keyword option to load properties lazily. Keys are
+    found in a single pass first, and each value is unescaped only when it's
+    accessed first.
 
 Changelog:
 
+.. versionchanged:: 0.9.5
+
+   - Parse files line by line without reading all of them at once and make
+     parsing and escaping faster with precompiled patterns, etc.
+   - Load data from memory-mapped files line by line if 'ac_mmap' option was
+     given.
+   - Load values lazily if 'ac_lazy' option was given.
+
 .. versionchanged:: 0.7.0
 
    - Fix handling of empty values, pointed by @ajays20078
@@ -41,6 +53,10 @@ import anyconfig.compat
 LOGGER = logging.getLogger(__name__)
 _COMMENT_MARKERS = ("#", "!")
 
+_KV_SEP_RE = re.compile(r"(?:\s+)?(?:(?<!\\)[=:])")
+_ESCAPED_CHAR_RE = re.compile(r"\\(.)")
+_ESCAPE_TABLE = dict((ord(c), '\\' + c) for c in (':', '=', '\\'))
+
 
 def _parseline(line):
     """
@@ -63,7 +79,7 @@ def _parseline(line):
     >>> _parseline("calendar.japanese.type: LocalGregorianCalendar")
     ('calendar.japanese.type', 'LocalGregorianCalendar')
     """
-    pair = re.split(r"(?:\s+)?(?:(?<!\\)[=:])", line.strip(), 1)
+    pair = _KV_SEP_RE.split(line.strip(), 1)
     key = pair[0].rstrip()
 
     if len(pair) < 2:
@@ -105,8 +121,14 @@ def _pre_process_line(line, comment_markers=_COMMENT_MARKERS):
 def unescape(in_s):
     """
     :param in_s: Input string
+
+    >>> unescape("a\\\\:b")
+    'a:b'
     """
-    return re.sub(r"\\(.)", r"\1", in_s)
+    if '\\' not in in_s:
+        return in_s  # Fast path; there is nothing to unescape.
+
+    return _ESCAPED_CHAR_RE.sub(r"\1", in_s)
 
 
 def _escape_char(in_c):
@@ -128,8 +150,14 @@ def _escape_char(in_c):
 def escape(in_s):
     """
     :param in_s: Input string
+
+    >>> escape("a:b=c")
+    'a\\\\:b\\\\=c'
     """
-    return ''.join(_escape_char(c) for c in in_s)
+    try:
+        return in_s.translate(_ESCAPE_TABLE)
+    except TypeError:  # str (not unicode) in python 2.
+        return ''.join(_escape_char(c) for c in in_s)
 
 
 def load(stream, container=dict, comment_markers=_COMMENT_MARKERS):
@@ -167,21 +195,23 @@ def load(stream, container=dict, comment_markers=_COMMENT_MARKERS):
     {'application/postscript': 'x=Postscript File;y=.eps,.ps'}
     """
     ret = container()
-    prev = ""
-
-    for line in stream.readlines():
-        line = _pre_process_line(prev + line.strip().rstrip(),
-                                 comment_markers)
-        # I don't think later case may happen but just in case.
-        if line is None or not line:
-            continue
+    prev = []  # Buffer to keep the parts of the line continued.
 
-        prev = ""  # re-initialize for later use.
+    for line in stream:
+        line = line.strip()
+        if not prev and (not line or line.startswith(comment_markers)):
+            continue  # Same as :func:`_pre_process_line` but faster.
 
         if line.endswith("\\"):
-            prev += line.rstrip(" \\")
+            part = line.rstrip(" \\")
+            if prev or part:
+                prev.append(part)
             continue
 
+        if prev:
+            line = ''.join(prev) + line
+            prev = []
+
         (key, val) = _parseline(line)
         if key is None:
             LOGGER.warning("Failed to parse the line: %s", line)
@@ -192,6 +222,89 @@ def load(stream, container=dict, comment_markers=_COMMENT_MARKERS):
     return ret
 
 
+def _scan(buf, comment_markers=_COMMENT_MARKERS):
+    """
+    Find the keys and the offsets of the lines of their values in Java
+    properties file in a single pass, with the same rules as :func:`load`.
+
+    :param buf: A string or bytes-like object has find method, e.g. mmap
+    :param comment_markers: Comment markers, e.g. '#' (hash)
+    :return: An ordered dict of {key: offset}
+
+    >>> list(_scan("# c\\na: 1\\nb = \\\\\\n  2\\na: 3\\n").items())
+    [('a', 19), ('b', 9)]
+    """
+    ret = anyconfig.compat.OrderedDict()
+    is_str = isinstance(buf, anyconfig.compat.STR_TYPES)
+    start = None  # Offset of the first line of the line continued.
+    prev = []
+
+    for offset, line in anyconfig.backend.base.iter_lines(buf):
+        line = (line if is_str else line.decode("utf-8")).strip()
+        if not prev and (not line or line.startswith(comment_markers)):
+            continue
+
+        if line.endswith("\\"):
+            part = line.rstrip(" \\")
+            if prev or part:
+                if not prev:
+                    start = offset
+                prev.append(part)
+            continue
+
+        if prev:
+            line = ''.join(prev) + line
+            prev = []
+        else:
+            start = offset
+
+        key = _KV_SEP_RE.split(line, 1)[0].rstrip()
+        if key:
+            ret[key] = start  # The last one wins.
+
+    return ret
+
+
+def _read_line(buf, start):
+    """
+    :param buf: A string or bytes-like object has find method, e.g. mmap
+    :param start: Offset of the first line of a line may be continued
+    :return: A list of the lines (strings) of the line continued
+    """
+    ret = []
+    for _offset, line in anyconfig.backend.base.iter_lines(buf, start):
+        if not isinstance(line, anyconfig.compat.STR_TYPES):
+            line = line.decode("utf-8")
+        ret.append(line)
+        if not line.strip().endswith("\\"):
+            break
+
+    return ret
+
+
+def load_lazily(buf, container=dict, comment_markers=_COMMENT_MARKERS):
+    """
+    Load Java properties file given as a string or bytes-like object `buf`
+    lazily.
+
+    :param buf: A string or bytes-like object has find method, e.g. mmap
+    :param container: Factory function to create a dict-like object (ignored)
+    :param comment_markers: Comment markers, e.g. '#' (hash)
+    :return: :class:`anyconfig.backend.base.LazyMapping` object
+
+    >>> cnf = load_lazily("a: 1\\nb = x\\\\:y\\n")
+    >>> cnf["b"], cnf
+    ('x:y', <LazyMapping: 2 items, 1 loaded>)
+    """
+    def load_value(key, start):
+        """Parse the value of `key` in the line at `start`."""
+        return load(_read_line(buf, start),
+                    comment_markers=comment_markers)[key]
+
+    return anyconfig.backend.base.LazyMapping(_scan(buf, comment_markers),
+                                              load_value)
+
+
 class Parser(anyconfig.backend.base.StreamParser):
     """
     Parser for Java properties files.
@@ -200,6 +313,8 @@ class Parser(anyconfig.backend.base.StreamParser):
     _extensions = ["properties"]
     _ordered = True
     _dict_opts = ["ac_dict"]
+    _allow_lines = True
+    _allow_lazy = True
 
     def load_from_stream(self, stream, container, **kwargs):
         """
@@ -213,6 +328,18 @@ class Parser(anyconfig.backend.base.StreamParser):
         """
         return load(stream, container=container)
 
+    def load_lazily(self, buf, container, **kwargs):
+        """
+        Load config from a string or bytes-like object `buf` lazily.
+
+        :param buf: A string or bytes-like object has find method, e.g. mmap
+        :param container: callble to make a container object
+        :param kwargs: optional keyword parameters (ignored)
+
+        :return: Dict-like object holding config parameters
+        """
+        return load_lazily(buf, container=container)
+
     def dump_to_stream(self, cnf, stream, **kwargs):
         """
         Dump config `cnf` to a file or file-like object `stream`.
@@ -221,7 +348,7 @@ class Parser(anyconfig.backend.base.StreamParser):
         :param stream: Java properties file or file like object
         :param kwargs: backend-specific optional keyword parameters :: dict
         """
-        for key, val in anyconfig.compat.iteritems(cnf):
-            stream.write("%s = %s%s" % (key, escape(val), os.linesep))
+        stream.writelines("%s = %s%s" % (key, escape(val), os.linesep)
+                          for key, val in anyconfig.compat.iteritems(cnf))
 
 # vim:sw=4:ts=4:et:
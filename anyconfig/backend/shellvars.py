@@ -9,10 +9,21 @@ r"""Simple Shell vars' definitions backend:
 - Requirements: None (built-in)
 - Development Status :: 3 - Alpha
 - Limitations: Currently, it only supports a varialbe defined in a line.
-- Special options: None
+- Special options:
+
+  - Use 'ac_expand_vars' keyword option to expand references to variables,
+    $VAR and ${VAR}, defined in previous lines. It may be a mapping object
+    such as os.environ to give the default definitions of variables also.
 
 Changelog:
 
+.. versionchanged:: 0.9.5
+
+   - Parse files line by line with a precompiled pattern, write all lines at
+     once on dump, and add 'ac_expand_vars' option to expand variables.
+   - Load data from memory-mapped files line by line if 'ac_mmap' option was
+     given.
+
 .. versionadded:: 0.7.0
 
    - Added an experimental parser for simple shelll vars' definitions w/o shell
@@ -21,15 +32,42 @@ Changelog:
 from __future__ import absolute_import
 
 import logging
-import itertools
 import os
 import re
 
 import anyconfig.backend.base
+import anyconfig.utils
 
 
 LOGGER = logging.getLogger(__name__)
 
+_LINE_RE = re.compile(r"^\s*(export)?\s*(\S+)=(?:(?:"
+                      r"(?:\"(.*[^\\])\")|(?:'(.*[^\\])')|"
+                      r"(?:([^\"'#\s]+)))?)\s*#*")
+_VAR_REF_RE = re.compile(r"(?<!\\)\$(?:\{(\w+)\}|(\w+))")
+
+
+def _match(line):
+    """
+    :param line: A string to parse, must not start with '#' (comment)
+    :return:
+        A tuple of (key, value, expandable) or None if `line` is not a valid
+        definition, where `expandable` is False if the value is quoted with
+        single quotes and variable references in it must not be expanded
+    """
+    match = _LINE_RE.match(line)
+    if not match:
+        return None
+
+    (_exp, key, dqval, sqval, val) = match.groups()
+    if sqval is not None:
+        return (key, sqval, False)
+
+    if dqval is not None:
+        return (key, dqval, True)
+
+    return (key, val or '', True)
+
 
 def _parseline(line):
     """
@@ -51,19 +89,43 @@ def _parseline(line):
     >>> _parseline("aaa=bbb   # ccc")
     ('aaa', 'bbb')
     """
-    match = re.match(r"^\s*(export)?\s*(\S+)=(?:(?:"
-                     r"(?:\"(.*[^\\])\")|(?:'(.*[^\\])')|"
-                     r"(?:([^\"'#\s]+)))?)\s*#*", line)
-    if not match:
+    res = _match(line)
+    if res is None:
         LOGGER.warning("Invalid line found: %s", line)
         return (None, None)
 
-    tpl = match.groups()
-    vals = list(itertools.dropwhile(lambda x: x is None, tpl[2:]))
-    return (tpl[1], vals[0] if vals else '')
+    return res[:2]
+
+
+def expand(val, *vdics):
+    """
+    Expand references to variables, $VAR and ${VAR}, in given string `val`.
+    References to variables not defined in any of `vdics` are kept as they
+    are. It takes linear time to the length of `val` as references are
+    resolved in a pass with using definitions already expanded.
+
+    :param val: A string may contain references to variables
+    :param vdics: Mappings of variables' names and values to look up
+
+    >>> expand("${a}/$b/$c", dict(a="A"), dict(a="X", b="B"))
+    'A/B/$c'
+    """
+    if '$' not in val:
+        return val  # Fast path; there are no references.
+
+    def _lookup(match):
+        """Resolve a reference to a variable."""
+        name = match.group(1) or match.group(2)
+        for vdic in vdics:
+            if name in vdic:
+                return vdic[name]
+
+        return match.group(0)
+
+    return _VAR_REF_RE.sub(_lookup, val)
 
 
-def load(stream, container=dict):
+def load(stream, container=dict, expand_vars=False):
     """
     Load and parse a file or file-like object `stream` provides simple shell
     variables' definitions.
@@ -71,6 +133,11 @@ def load(stream, container=dict):
     :param stream: A file or file like object
     :param container:
         Factory function to create a dict-like object to store properties
+    :param expand_vars:
+        Expand references to variables defined in previous lines if it's True
+        or a mapping object gives default definitions of variables such as
+        os.environ. Values quoted with single quotes are not expanded same as
+        shells.
     :return: Dict-like object holding shell variables' definitions
 
     >>> from anyconfig.compat import StringIO as to_strm
@@ -84,20 +151,27 @@ def load(stream, container=dict):
     {'aaa': 'bbb'}
     >>> load(to_strm("aaa=bbb # ..."))
     {'aaa': 'bbb'}
+    >>> cnf = load(to_strm("a=x\\nb=${a}/y\\nc='$a'"), expand_vars=True)
+    >>> sorted(cnf.items())
+    [('a', 'x'), ('b', 'x/y'), ('c', '$a')]
     """
     ret = container()
+    vdics = [ret]
+    if anyconfig.utils.is_dict_like(expand_vars):
+        vdics.append(expand_vars)
 
-    for line in stream.readlines():
+    for line in stream:
         line = line.rstrip()
-        if line is None or not line:
+        if not line:
             continue
 
-        (key, val) = _parseline(line)
-        if key is None:
-            LOGGER.warning("Empty val in the line: %s", line)
+        res = _match(line)
+        if res is None:
+            LOGGER.warning("Invalid line found: %s", line)
             continue
 
-        ret[key] = val
+        (key, val, expandable) = res
+        ret[key] = expand(val, *vdics) if expand_vars and expandable else val
 
     return ret
 
@@ -107,8 +181,10 @@ class Parser(anyconfig.backend.base.StreamParser):
     Parser for Shell variable definition files.
     """
     _type = "shellvars"
+    _load_opts = ["ac_expand_vars"]
     _ordered = True
     _dict_opts = ["ac_dict"]
+    _allow_lines = True
 
     def load_from_stream(self, stream, container, **kwargs):
         """
@@ -117,11 +193,14 @@ class Parser(anyconfig.backend.base.StreamParser):
         :param stream:
             A file or file like object of shell scripts define shell variables
         :param container: callble to make a container object
-        :param kwargs: optional keyword parameters (ignored)
+        :param kwargs:
+            optional keyword parameters may contain 'ac_expand_vars', see
+            `expand_vars` parameter of :func:`load`
 
         :return: Dict-like object holding config parameters
         """
-        return load(stream, container=container)
+        return load(stream, container=container,
+                    expand_vars=kwargs.get("ac_expand_vars", False))
 
     def dump_to_stream(self, cnf, stream, **kwargs):
         """
@@ -131,7 +210,7 @@ class Parser(anyconfig.backend.base.StreamParser):
         :param stream: Shell script file or file like object
         :param kwargs: backend-specific optional keyword parameters :: dict
         """
-        for key, val in anyconfig.compat.iteritems(cnf):
-            stream.write("%s='%s'%s" % (key, val, os.linesep))
+        stream.writelines("%s='%s'%s" % (key, val, os.linesep)
+                          for key, val in anyconfig.compat.iteritems(cnf))
 
 # vim:sw=4:ts=4:et:
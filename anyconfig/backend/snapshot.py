@@ -0,0 +1,284 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""Binary snapshot backend:
+
+- Format to support: anyconfig native binary snapshot of configuration data
+  with the offset index of items, files have '.acsnap' extension
+- Requirements: It should be available always.
+- Development Status :: 3 - Alpha
+- Limitations:
+
+  - Values other than mapping objects are serialized with pickle, so that
+    snapshot files must not be loaded from untrusted sources like pickle
+    files. Also these are not portable among different python versions.
+
+  - Mapping objects in lists are not loaded lazily.
+
+- Special options:
+
+  - 'protocol': pickle protocol to serialize values on dump
+
+Snapshot files are memory-mapped on load and the mapping object returned,
+:class:`SnapshotMapping`, decodes the index of its items at the first access
+and each value only when it was accessed. So very large configuration data is
+opened fast and its pages are shared through the page cache across processes
+loading the same snapshot file. Use :func:`anyconfig.dicts.convert_to` to
+convert it to dicts, or give 'ac_dict' option to load everything into the
+mapping objects made with it at once.
+
+File format (all integers are unsigned 64 bits, little endian)::
+
+  MAGIC (8 bytes) | blocks ... | root offset | root size | MAGIC
+
+Each block is a pickled value or the index of a mapping object, a pickled list
+of (key, is_mapping, offset, size) of its items, and the root block is the
+index of the top level mapping object. Offsets are from the start of the file.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import io
+import mmap
+import os
+import struct
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import anyconfig.backend.base
+import anyconfig.dicts
+import anyconfig.utils
+
+from anyconfig.compat import OrderedDict
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+
+MAGIC = b"ACSNAP\x00\x01"
+_TRAILER = struct.Struct("<QQ8s")
+_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+class SnapshotMapping(MutableMapping):
+    """
+    Mapping object decodes its items from the snapshot lazily.
+
+    Items set or deleted are kept in memory and never written back to the
+    snapshot.
+    """
+    def __init__(self, buf, offset, size):
+        """
+        :param buf: Bytes-like object of the snapshot, e.g. mmap
+        :param offset: Offset of the index block of this mapping object
+        :param size: Size of the index block
+        """
+        self._buf = buf
+        self._offset = offset
+        self._size = size
+        self._index = None  # {key: (is_mapping, offset, size) or None}
+        self._data = {}  # Cache of values decoded or set.
+
+    def _entries(self):
+        """Decode the index of items at the first access."""
+        if self._index is None:
+            blk = self._buf[self._offset:self._offset + self._size]
+            self._index = OrderedDict((key, (is_map, off, size)) for
+                                      key, is_map, off, size
+                                      in pickle.loads(blk))
+        return self._index
+
+    def __getitem__(self, key):
+        try:
+            return self._data[key]
+        except KeyError:
+            pass
+
+        (is_map, off, size) = self._entries()[key]
+        if is_map:
+            val = SnapshotMapping(self._buf, off, size)
+        else:
+            val = pickle.loads(self._buf[off:off + size])
+
+        self._data[key] = val
+        return val
+
+    def __setitem__(self, key, val):
+        entries = self._entries()
+        if key not in entries:
+            entries[key] = None
+        self._data[key] = val
+
+    def __delitem__(self, key):
+        del self._entries()[key]
+        self._data.pop(key, None)
+
+    def __iter__(self):
+        return iter(self._entries())
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key):
+        return key in self._entries()
+
+    def __repr__(self):
+        return "<%s: %d items>" % (self.__class__.__name__, len(self))
+
+
+def _check_trailer(buf):
+    """
+    :param buf: Bytes-like object of the snapshot
+    :return: A tuple of (offset, size) of the root index block
+    :raises: ValueError if `buf` is not a snapshot
+    """
+    size = len(buf)
+    if size < len(MAGIC) + _TRAILER.size or buf[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a snapshot or broken one")
+
+    (off, rsize, magic) = _TRAILER.unpack(buf[size - _TRAILER.size:size])
+    if magic != MAGIC or off + rsize > size:
+        raise ValueError("Not a snapshot or broken one")
+
+    return (off, rsize)
+
+
+def load(buf, container, **options):
+    """
+    :param buf: Bytes-like object of the snapshot, e.g. bytes and mmap
+    :param container: callble to make a container object (not used)
+    :param options: Keyword options may contain 'ac_dict'
+
+    :return: :class:`SnapshotMapping` object or a mapping object made with
+        'ac_dict' if it was given
+    """
+    (off, size) = _check_trailer(buf)
+    cnf = SnapshotMapping(buf, off, size)
+
+    ac_dict = options.get("ac_dict")
+    if ac_dict and callable(ac_dict):
+        return anyconfig.dicts.convert_to(cnf, ac_dict=ac_dict)
+
+    return cnf
+
+
+class _Writer(object):
+    """Helper class to write blocks to stream and track their offsets."""
+
+    def __init__(self, stream, protocol=_PROTOCOL):
+        self.stream = stream
+        self.protocol = protocol
+        self.pos = 0
+
+    def write(self, data):
+        """
+        :param data: Bytes to write
+        :return: A tuple of (offset, size) of `data` written
+        """
+        self.stream.write(data)
+        ret = (self.pos, len(data))
+        self.pos += len(data)
+        return ret
+
+    def write_mapping(self, obj):
+        """
+        Write items of mapping object `obj` and then its index.
+
+        :return: A tuple of (offset, size) of the index block
+        """
+        index = []
+        for key, val in obj.items():
+            if anyconfig.utils.is_dict_like(val):
+                index.append((key, True) + self.write_mapping(val))
+            else:
+                index.append((key, False) +
+                             self.write(pickle.dumps(val, self.protocol)))
+
+        return self.write(pickle.dumps(index, self.protocol))
+
+
+def dump(cnf, stream, protocol=_PROTOCOL, **_options):
+    """
+    :param cnf: Mapping object to dump
+    :param stream: A file or file like object opened in binary mode
+    :param protocol: pickle protocol to serialize values
+    """
+    writer = _Writer(stream, protocol=protocol)
+    writer.write(MAGIC)
+    (off, size) = writer.write_mapping(cnf)
+    writer.write(_TRAILER.pack(off, size, MAGIC))
+
+
+class Parser(anyconfig.backend.base.StreamParser,
+             anyconfig.backend.base.BinaryFilesMixin):
+    """
+    Parser for anyconfig binary snapshot files.
+    """
+    _type = "snapshot"
+    _extensions = ["acsnap"]
+    _load_opts = ["ac_dict"]
+    _dump_opts = ["protocol"]
+    _ordered = True
+    _allow_buffer = True
+
+    load_from_string = anyconfig.backend.base.to_method(load)
+    dump_to_stream = anyconfig.backend.base.to_method(dump)
+
+    def load_from_stream(self, stream, container, **kwargs):
+        """
+        Load config from given file like object `stream`, read all at once.
+
+        :param stream: A file or file like object opened in binary mode
+        :param container: callble to make a container object
+        :param kwargs: optional keyword parameters, see :func:`load`
+
+        :return: Dict-like object holding config parameters
+        """
+        return load(stream.read(), container, **kwargs)
+
+    def load_from_path(self, filepath, container, **kwargs):
+        """
+        Load config from given file `filepath` mapped into memory. The file
+        is kept mapped while the mapping objects loaded from it are alive.
+
+        :param filepath: Config file path
+        :param container: callble to make a container object
+        :param kwargs: optional keyword parameters, see :func:`load`
+
+        :return: Dict-like object holding config parameters
+        """
+        if anyconfig.utils.get_compression(filepath) is not None:
+            with self.ropen(filepath) as inp:
+                return self.load_from_stream(inp, container, **kwargs)
+
+        with open(filepath, "rb") as inp:
+            if not os.fstat(inp.fileno()).st_size:
+                return container()
+            buf = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return load(buf, container, **kwargs)
+
+    # Files are always mapped into memory.
+    load_from_mmap = load_from_path
+
+    def dump_to_string(self, cnf, **kwargs):
+        """
+        Dump config `cnf` to bytes.
+
+        :param cnf: Configuration data to dump
+        :param kwargs: optional keyword parameters, see :func:`dump`
+
+        :return: Bytes represents the configuration
+        """
+        stream = io.BytesIO()
+        dump(cnf, stream, **kwargs)
+        return stream.getvalue()
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,506 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""SQLite backend:
+
+- Format to support: SQLite database files have a table of configuration
+  items flattened, https://www.sqlite.org
+- Requirements: sqlite3 (standard lib)
+- Development Status :: 3 - Alpha
+- Limitations:
+
+  - Keys of mapping objects are converted to strings.
+  - Values other than mapping objects, strings, numbers, booleans and None,
+    e.g. lists, are serialized as JSON data, and mapping objects in them are
+    not loaded lazily.
+
+- Special options: None
+
+Configuration data is dumped into the table 'anyconfig' of (path, parent,
+type, value) and path is the primary key. Path of each item is a JSON Pointer
+(RFC 6901) expression like '/a/b/c', and parent is the path of the mapping
+object has it.
+
+Data is loaded as :class:`SQLiteMapping` objects which fetch items from the
+database only when these are accessed: each item is looked up with its path in
+the index, items of a mapping object are listed with its path in the index of
+parent, and the whole subtree is loaded with a range query of paths, e.g.
+:func:`anyconfig.dicts.get` and :func:`anyconfig.dicts.convert_to` work
+without loading other items.
+
+Connections to database files are cached for each thread and reused while the
+files are not changed. Connections to old files are kept open while mapping
+objects loaded from them are alive.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import io
+import json
+import os
+import os.path
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+import anyconfig.backend.base
+import anyconfig.columnar
+import anyconfig.compat
+import anyconfig.utils
+
+from anyconfig.compat import OrderedDict
+
+try:
+    from urllib.request import pathname2url
+except ImportError:
+    from urllib import pathname2url
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+
+TABLE = "anyconfig"
+_SCHEMA = ("CREATE TABLE %s (path TEXT PRIMARY KEY, parent TEXT NOT NULL, "
+           "type TEXT NOT NULL, value)" % TABLE,
+           "CREATE INDEX %s_parent ON %s (parent)" % (TABLE, TABLE))
+
+_SELECT_ITEM = "SELECT type, value FROM %s WHERE path = ?" % TABLE
+_SELECT_ITEMS = ("SELECT path, type, value FROM %s WHERE parent = ? "
+                 "ORDER BY rowid" % TABLE)
+_SELECT_SUBTREE = ("SELECT path, parent, type, value FROM %s "
+                   "WHERE path > ? AND path < ? ORDER BY rowid" % TABLE)
+_INSERT = "INSERT INTO %s VALUES (?, ?, ?, ?)" % TABLE
+
+(_MAP, _NULL, _BOOL, _INT, _FLOAT, _STR, _JSON) = ("map", "null", "bool",
+                                                   "int", "float", "str",
+                                                   "json")
+_INT_RANGE = (-(1 << 63), (1 << 63) - 1)
+
+
+def _escape(key):
+    """
+    >>> _escape("a/b~c")
+    'a~1b~0c'
+    """
+    if not isinstance(key, anyconfig.compat.STR_TYPES):
+        key = str(key)
+
+    return key.replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(key):
+    """
+    >>> _unescape('a~1b~0c')
+    'a/b~c'
+    """
+    return key.replace('~1', '/').replace('~0', '~')
+
+
+def _key(path):
+    """
+    :param path: Path of an item
+    :return: The key of the item
+
+    >>> _key("/a/b~1c")
+    'b/c'
+    """
+    return _unescape(path.rsplit('/', 1)[-1])
+
+
+def _encode(val):
+    """
+    :param val: A value other than mapping objects
+    :return: A tuple of (type, value to store)
+
+    >>> _encode(True), _encode(1), _encode("a"), _encode([1, 2])
+    (('bool', 1), ('int', 1), ('str', 'a'), ('json', '[1, 2]'))
+    """
+    if val is None:
+        return (_NULL, None)
+    if isinstance(val, bool):
+        return (_BOOL, int(val))
+    if isinstance(val, anyconfig.compat.STR_TYPES):
+        return (_STR, val)
+    if isinstance(val, float):
+        return (_FLOAT, val)
+    if isinstance(val, int) and _INT_RANGE[0] <= val <= _INT_RANGE[1]:
+        return (_INT, val)
+
+    return (_JSON, json.dumps(val, default=anyconfig.columnar.json_default))
+
+
+def _decode(typ, val):
+    """
+    :param typ: Type of the value stored
+    :param val: Value stored
+    :return: Original value
+
+    >>> _decode('bool', 1), _decode('json', '[1, 2]')
+    (True, [1, 2])
+    """
+    if typ == _BOOL:
+        return bool(val)
+    if typ == _JSON:
+        return json.loads(val)
+
+    return val  # null, int, float and str
+
+
+def _iter_rows(cnf, path=''):
+    """
+    :param cnf: Mapping object to flatten
+    :param path: Path of `cnf`
+    :return: Generator yields (path, parent, type, value) of items in `cnf`
+    """
+    for key, val in cnf.items():
+        cpath = path + '/' + _escape(key)
+        if anyconfig.utils.is_dict_like(val):
+            yield (cpath, path, _MAP, None)
+            for row in _iter_rows(val, cpath):
+                yield row
+        else:
+            yield (cpath, path) + _encode(val)
+
+
+def _build(rows, path, container):
+    """
+    :param rows: An iterable yields (path, parent, type, value) of items in
+        the subtree of `path` in the order of items dumped
+    :param path: Path of the root of the subtree
+    :param container: callble to make a container object
+    :return: Mapping object
+    """
+    root = container()
+    nodes = {path: root}
+    for cpath, parent, typ, val in rows:
+        if typ == _MAP:
+            nodes[parent][_key(cpath)] = nodes[cpath] = container()
+        else:
+            nodes[parent][_key(cpath)] = _decode(typ, val)
+
+    return root
+
+
+class SQLiteMapping(MutableMapping):
+    """
+    Mapping object fetches its items from the database lazily.
+
+    Items set or deleted are kept in memory and never written back to the
+    database.
+    """
+    def __init__(self, conn, path=''):
+        """
+        :param conn: :class:`sqlite3.Connection` object
+        :param path: Path of this mapping object
+        """
+        self._conn = conn
+        self._path = path
+        self._data = OrderedDict()  # Cache of items fetched or set.
+        self._deleted = set()
+        self._complete = False  # All items were fetched?
+
+    def _item(self, cpath, typ, val):
+        """Make an item from given row."""
+        if typ == _MAP:
+            return SQLiteMapping(self._conn, cpath)
+
+        return _decode(typ, val)
+
+    def _fetch_all(self):
+        """Fetch all items of this mapping object at the first call."""
+        if self._complete:
+            return
+
+        data = OrderedDict()
+        for cpath, typ, val in self._conn.execute(_SELECT_ITEMS,
+                                                  (self._path, )):
+            key = _key(cpath)
+            if key in self._deleted:
+                continue
+            data[key] = self._data[key] if key in self._data else \
+                self._item(cpath, typ, val)
+
+        for key, val in self._data.items():  # Items set.
+            data.setdefault(key, val)
+
+        (self._data, self._deleted, self._complete) = (data, set(), True)
+
+    def __getitem__(self, key):
+        try:
+            return self._data[key]
+        except KeyError:
+            if self._complete or key in self._deleted:
+                raise
+
+        cpath = self._path + '/' + _escape(key)
+        row = self._conn.execute(_SELECT_ITEM, (cpath, )).fetchone()
+        if row is None:
+            raise KeyError(key)
+
+        val = self._data[key] = self._item(cpath, *row)
+        return val
+
+    def __setitem__(self, key, val):
+        self._deleted.discard(key)
+        self._data[key] = val
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+
+        self._data.pop(key, None)
+        if not self._complete:
+            self._deleted.add(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self):
+        self._fetch_all()
+        return iter(list(self._data.keys()))
+
+    def __len__(self):
+        self._fetch_all()
+        return len(self._data)
+
+    def __repr__(self):
+        return "<%s: %s>" % (self.__class__.__name__, self._path or '/')
+
+    def materialize(self, container=dict):
+        """
+        Load all items in the subtree of this mapping object at once with a
+        range query of their paths. Items set or deleted are not reflected.
+
+        :param container: callble to make a container object
+        :return: Mapping object made with `container`
+        """
+        rows = self._conn.execute(_SELECT_SUBTREE,
+                                  (self._path + '/', self._path + '0'))
+        return _build(rows, self._path, container)
+
+
+_POOL = threading.local()
+
+
+def _open(path):
+    """
+    Open the database file `path` in read-only mode if possible.
+
+    :param path: Absolute path of the database file
+    :return: :class:`sqlite3.Connection` object
+    """
+    try:
+        return sqlite3.connect("file:%s?mode=ro" % pathname2url(path),
+                               uri=True, check_same_thread=False)
+    except TypeError:  # sqlite3.connect does not support URIs < 3.4.
+        return sqlite3.connect(path, check_same_thread=False)
+
+
+def _copy(src, dst):
+    """
+    Copy the database `src` to `dst`.
+
+    :param src: :class:`sqlite3.Connection` object to copy from
+    :param dst: :class:`sqlite3.Connection` object to copy to
+    """
+    if getattr(src, "backup", None) is not None:
+        src.backup(dst)
+    else:  # Connection.backup is not available < 3.7.
+        dst.executescript('\n'.join(src.iterdump()))
+
+
+def _connect(filepath):
+    """
+    Get the connection to the database file `filepath` cached for current
+    thread or make new one and cache it.
+
+    :param filepath: Path of the database file
+    :return: :class:`sqlite3.Connection` object
+    """
+    conns = getattr(_POOL, "conns", None)
+    if conns is None:
+        conns = _POOL.conns = {}
+
+    path = os.path.abspath(filepath)
+    stat = os.stat(path)
+    key = (stat.st_ino, stat.st_size, stat.st_mtime)
+    (ckey, conn) = conns.get(path, (None, None))
+    if ckey != key:
+        # The old connection is not closed here as mappings loaded before may
+        # still use it, and it's closed when all of them were freed.
+        conn = _open(path)
+        conns[path] = (key, conn)
+
+    return conn
+
+
+def load(conn, container, **options):
+    """
+    :param conn: :class:`sqlite3.Connection` object
+    :param container: callble to make a container object (not used)
+    :param options: Keyword options may contain 'ac_dict'
+
+    :return: :class:`SQLiteMapping` object or a mapping object made with
+        'ac_dict' if it was given
+    """
+    cnf = SQLiteMapping(conn)
+    ac_dict = options.get("ac_dict")
+    if ac_dict and callable(ac_dict):
+        return cnf.materialize(ac_dict)
+
+    return cnf
+
+
+def dump(cnf, filepath):
+    """
+    Dump `cnf` to new database file `filepath` replaced atomically.
+
+    :param cnf: Mapping object to dump
+    :param filepath: Path of the database file
+    """
+    tmp = filepath + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+
+    conn = sqlite3.connect(tmp)
+    try:
+        with conn:
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+            conn.executemany(_INSERT, _iter_rows(cnf))
+    finally:
+        conn.close()
+
+    getattr(os, "replace", os.rename)(tmp, filepath)
+
+
+class Parser(anyconfig.backend.base.Parser,
+             anyconfig.backend.base.BinaryFilesMixin):
+    """
+    Parser for SQLite database files.
+    """
+    _type = "sqlite"
+    _extensions = ["sqlite", "sqlite3"]
+    _load_opts = ["ac_dict"]
+    _ordered = True
+
+    def load_from_path(self, filepath, container, **kwargs):
+        """
+        Load config from given database file `filepath`.
+
+        :param filepath: Config file path
+        :param container: callble to make a container object
+        :param kwargs: optional keyword parameters, see :func:`load`
+
+        :return: Dict-like object holding config parameters
+        """
+        if anyconfig.utils.get_compression(filepath) is not None:
+            with self.ropen(filepath) as inp:
+                return self.load_from_stream(inp, container, **kwargs)
+
+        if not os.path.getsize(filepath):
+            return container()
+
+        return load(_connect(filepath), container, **kwargs)
+
+    # Files are read with sqlite3 only as needed.
+    load_from_mmap = load_from_path
+
+    def load_from_stream(self, stream, container, **kwargs):
+        """
+        Load config from given file like object `stream` into an in-memory
+        database.
+
+        :param stream: A file or file like object opened in binary mode
+        :param container: callble to make a container object
+        :param kwargs: optional keyword parameters, see :func:`load`
+
+        :return: Dict-like object holding config parameters
+        """
+        (fd, tmp) = tempfile.mkstemp(suffix=".sqlite")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(stream, out)
+
+            if not os.path.getsize(tmp):
+                return container()
+
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            src = sqlite3.connect(tmp)
+            try:
+                _copy(src, conn)
+            finally:
+                src.close()
+        finally:
+            os.remove(tmp)
+
+        return load(conn, container, **kwargs)
+
+    def load_from_string(self, content, container, **kwargs):
+        """
+        Load config from given bytes `content`.
+
+        :param content: Bytes of the database file
+        :param container: callble to make a container object
+        :param kwargs: optional keyword parameters, see :func:`load`
+
+        :return: Dict-like object holding config parameters
+        """
+        return self.load_from_stream(io.BytesIO(content),
+                                     container, **kwargs)
+
+    def dump_to_path(self, cnf, filepath, **kwargs):
+        """
+        Dump config `cnf` to a database file `filepath`.
+
+        :param cnf: Configuration data to dump
+        :param filepath: Config file path
+        :param kwargs: optional keyword parameters (ignored)
+        """
+        if anyconfig.utils.get_compression(filepath) is not None:
+            with self.wopen(filepath) as out:
+                self.dump_to_stream(cnf, out, **kwargs)
+        else:
+            dump(cnf, filepath)
+
+    def dump_to_stream(self, cnf, stream, **kwargs):
+        """
+        Dump config `cnf` to a file or file-like object `stream` opened in
+        binary mode.
+
+        :param cnf: Configuration data to dump
+        :param stream: Config file or file like object
+        :param kwargs: optional keyword parameters (ignored)
+        """
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "cnf.sqlite")
+            dump(cnf, path)
+            with open(path, "rb") as inp:
+                shutil.copyfileobj(inp, stream)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def dump_to_string(self, cnf, **kwargs):
+        """
+        Dump config `cnf` to bytes.
+
+        :param cnf: Configuration data to dump
+        :param kwargs: optional keyword parameters (ignored)
+
+        :return: Bytes of the database file
+        """
+        stream = io.BytesIO()
+        self.dump_to_stream(cnf, stream, **kwargs)
+        return stream.getvalue()
+
+# vim:sw=4:ts=4:et:
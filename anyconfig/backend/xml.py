@@ -30,7 +30,10 @@ r"""XML backend:
 
 - Special Options:
 
-  - ac_parse_value: Try to parse values, elements' text and attributes.
+  - ac_parse_value: Try to parse values, elements' text and attributes. It
+    may be a list of names of typing rules instead of True to select them,
+    e.g. ["null", "bool", "int", "float", "str"]. See also
+    :func:`anyconfig.parser.mk_scalar_parser`.
 
   - merge_attrs: Merge attributes and mix with children nodes. Please note that
     information of attributes are lost after load if this option is used.
@@ -41,6 +44,14 @@ r"""XML backend:
 
 Changelog:
 
+.. versionchanged:: 0.9.5
+
+   - Values are parsed faster with memoization if 'ac_parse_value' is given,
+     and it can be a list of names of typing rules.
+   - Load data from bytes-like objects such as memoryview and mmap directly,
+     and parse them only once in python >= 3.8.
+   - Load data from files and streams in a single pass in python >= 3.8.
+
 .. versionchanged:: 0.8.2
 
    - Add special options, tags, merge_attrs and ac_parse_value
@@ -61,6 +72,7 @@ from io import BytesIO
 
 import operator
 import re
+import sys
 try:
     import xml.etree.cElementTree as ET
 except ImportError:
@@ -106,6 +118,71 @@ def _namespaces_from_file(xmlfile):
     return dict(flip(t) for _, t in _iterparse(xmlfile))
 
 
+# XMLParser calls start_ns of the target to notify namespaces in python >= 3.8.
+_TARGET_START_NS = sys.version_info >= (3, 8)
+
+if _TARGET_START_NS:
+    class _TreeBuilder(ET.TreeBuilder):
+        """
+        TreeBuilder collects namespaces while building the tree to avoid
+        parsing documents twice.
+        """
+        def __init__(self, *args, **kwargs):
+            super(_TreeBuilder, self).__init__(*args, **kwargs)
+            self.nspaces = dict()  # {namespace_uri: namespace_prefix}
+
+        def start_ns(self, prefix, uri):
+            """Namespace declaration handler"""
+            self.nspaces[uri] = prefix
+
+
+def _parse_string(content):
+    """
+    :param content: XML string or bytes-like object such as mmap
+    :return: A tuple of (root element, {namespace_uri: namespace_prefix})
+    """
+    if anyconfig.utils.is_buffer(content) and \
+            not anyconfig.compat.IS_PYTHON_3:
+        content = anyconfig.utils.bytes_from_buffer(content)  # Cannot feed.
+
+    if _TARGET_START_NS:
+        # Data is read from `content` directly without making copies of it.
+        builder = _TreeBuilder()
+        psr = ET.XMLParser(target=builder)
+        psr.feed(content)
+        return (psr.close(), builder.nspaces)
+
+    if anyconfig.utils.is_buffer(content):
+        content = anyconfig.utils.bytes_from_buffer(content)
+
+    root = ET.fromstring(content)
+    if anyconfig.compat.IS_PYTHON_3:
+        stream = BytesIO(content)
+    else:
+        stream = anyconfig.compat.StringIO(content)
+
+    return (root, _namespaces_from_file(stream))
+
+
+def _parse_stream(stream, bufsize=65536):
+    """
+    :param stream: XML file or file-like object
+    :param bufsize: Size of data to read from `stream` and parse at once
+    :return: A tuple of (root element, {namespace_uri: namespace_prefix})
+    """
+    if not _TARGET_START_NS:
+        return _parse_string(stream.read())
+
+    builder = _TreeBuilder()
+    psr = ET.XMLParser(target=builder)
+    data = stream.read(bufsize)
+    while data:
+        psr.feed(data)
+        data = stream.read(bufsize)
+
+    return (psr.close(), builder.nspaces)
+
+
 def _tweak_ns(tag, **options):
     """
     :param tag: XML tag element
@@ -177,8 +254,9 @@ def _parse_text(val, **options):
     """
     :return: Parsed value or value itself depends on `ac_parse_value`
     """
-    if val and options.get("ac_parse_value", False):
-        return anyconfig.parser.parse_single(val)
+    rules = options.get("ac_parse_value", False)
+    if val and rules:
+        return anyconfig.parser.parse_single(val, rules)
 
     return val
 
@@ -210,9 +288,10 @@ def _parse_attrs(elem, container=dict, **options):
     :return: Parsed value or value itself depends on `ac_parse_value`
     """
     adic = dict((_tweak_ns(a, **options), v) for a, v in elem.attrib.items())
-    if options.get("ac_parse_value", False):
-        return container(dict((k, anyconfig.parser.parse_single(v))
-                              for k, v in adic.items()))
+    rules = options.get("ac_parse_value", False)
+    if rules:
+        parse = anyconfig.parser.parse_single
+        return container(dict((k, parse(v, rules)) for k, v in adic.items()))
 
     return container(adic)
 
@@ -472,24 +551,21 @@ class Parser(anyconfig.backend.base.Parser,
     _load_opts = _dump_opts = ["tags", "merge_attrs", "ac_parse_value"]
     _ordered = True
     _dict_opts = ["ac_dict"]
+    _allow_buffer = True
 
     def load_from_string(self, content, container, **opts):
         """
         Load config from XML snippet (a string `content`).
 
         :param content:
-            XML snippet string of str (python 2) or bytes (python 3) type
+            XML snippet string of str (python 2) or bytes (python 3) type, or
+            bytes-like object such as bytearray, memoryview and mmap
         :param container: callble to make a container object
         :param opts: optional keyword parameters passed to
 
         :return: Dict-like object holding config parameters
         """
-        root = ET.fromstring(content)
-        if anyconfig.compat.IS_PYTHON_3:
-            stream = BytesIO(content)
-        else:
-            stream = anyconfig.compat.StringIO(content)
-        nspaces = _namespaces_from_file(stream)
+        (root, nspaces) = _parse_string(content)
         return root_to_container(root, container=container,
                                  nspaces=nspaces, **opts)
 
@@ -501,10 +577,8 @@ class Parser(anyconfig.backend.base.Parser,
 
         :return: Dict-like object holding config parameters
         """
-        root = ET.parse(filepath).getroot()
-        nspaces = _namespaces_from_file(filepath)
-        return root_to_container(root, container=container,
-                                 nspaces=nspaces, **opts)
+        with self.ropen(filepath) as inp:
+            return self.load_from_stream(inp, container, **opts)
 
     def load_from_stream(self, stream, container, **opts):
         """
@@ -514,9 +588,7 @@ class Parser(anyconfig.backend.base.Parser,
 
         :return: Dict-like object holding config parameters
         """
-        root = ET.parse(stream).getroot()
-        path = anyconfig.utils.get_path_from_stream(stream)
-        nspaces = _namespaces_from_file(path)
+        (root, nspaces) = _parse_stream(stream)
         return root_to_container(root, container=container,
                                  nspaces=nspaces, **opts)
 
@@ -2,8 +2,6 @@
 # Copyright (C) 2011 - 2017 Satoru SATOH <ssato @ redhat.com>
 # License: MIT
 #
-# type() is used to exactly match check instead of isinstance here.
-# pylint: disable=unidiomatic-typecheck
 r"""YAML backend:
 
 - Format to support: YAML, http://yaml.org
@@ -13,9 +11,7 @@ r"""YAML backend:
   - or PyYAML (yaml), http://pyyaml.org
 
 - Development Status :: 5 - Production/Stable
-- Limitations:
-
-  - Resuls is not ordered even if 'ac_ordered' or 'ac_dict' was given.
+- Limitations: None obvious
 
 - Special options:
 
@@ -24,13 +20,34 @@ r"""YAML backend:
 
   - Use 'ac_safe' boolean keyword option if you prefer to call yaml.safe_load
     and yaml.safe_dump instead of yaml.load and yaml.dump. Please note that
-    this option conflicts with 'ac_dict' option and these options cannot be
-    used at the same time.
+    this option conflicts with 'ac_dict' and 'ac_intern' options and these
+    options cannot be used at the same time.
+
+  - Loader and dumper classes use libyaml (CSafeLoader, CDumper, etc.) are
+    used if it's available. Use 'ac_libyaml' boolean keyword option and set it
+    to False if you prefer pure python implementations of them.
 
   - See also: http://pyyaml.org/wiki/PyYAMLDocumentation
 
 Changelog:
 
+.. versionchanged:: 0.9.5
+
+   - Support loading multiple documents in a stream one by one with
+     :meth:`Parser.load_all`.
+   - Use loader and dumper classes use libyaml if it's available and add
+     'ac_libyaml' option to select them.
+   - Do not modify loader and dumper classes in yaml module but create
+     customized subclasses of them once for each container and cache them.
+   - Dump mapping objects as they are without converting them to dicts to
+     keep the order of items.
+   - Dump frozen sequences, :class:`anyconfig.frozen.FrozenList`, and array
+     objects made with 'ac_array' option as lists.
+   - Dump records made with 'ac_columnar' option as lists of mappings.
+   - Make mapping objects from (key, value) pairs at once, so that immutable
+     mapping objects are made and keys and values are interned while loading
+     with 'ac_frozen' and 'ac_intern' options.
+
 .. versionchanged:: 0.9.3
 
    - Try ruamel.yaml instead of yaml (PyYAML) if it's available.
@@ -42,22 +59,56 @@ Changelog:
 """
 from __future__ import absolute_import
 
+import array
+import operator
+
 try:
     import warnings
     import ruamel.yaml as yaml
-    from ruamel.yaml import Loader, Dumper
+    _NAMES = dict(Loader="Loader", SafeLoader="SafeLoader", Dumper="Dumper",
+                  SafeDumper="SafeDumper")
     warnings.simplefilter('ignore', yaml.error.UnsafeLoaderWarning)
 except ImportError:
     import yaml
-    try:
-        from yaml import CSafeLoader as Loader, CDumper as Dumper
-    except ImportError:
-        from yaml import SafeLoader as Loader, Dumper
+    _NAMES = dict(Loader="SafeLoader", SafeLoader="SafeLoader",
+                  Dumper="Dumper", SafeDumper="SafeDumper")
 
+import anyconfig.arrays
 import anyconfig.backend.base
+import anyconfig.columnar
 import anyconfig.compat
+import anyconfig.dicts
+import anyconfig.frozen
 import anyconfig.utils
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+def _find_classes(prefix='', names=None):
+    """
+    :param prefix: Prefix of the names of loader and dumper classes, e.g. 'C'
+    :param names: A dict of {role: loader or dumper class name}
+    :return: A dict of {role: loader or dumper class} or None if some of them
+        are not available, e.g. libyaml is not available
+    """
+    if names is None:
+        names = _NAMES
+    try:
+        return dict((role, getattr(yaml, prefix + name)) for role, name
+                    in names.items())
+    except AttributeError:
+        return None
+
+
+PURE_CLASSES = _find_classes()
+LIBYAML_CLASSES = _find_classes('C')  # Loaders and dumpers use libyaml.
+LIBYAML = LIBYAML_CLASSES is not None
+
+(Loader, Dumper) = operator.itemgetter("Loader", "Dumper")(
+    LIBYAML_CLASSES or PURE_CLASSES)
 
 _MAPPING_TAG = yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG
 
@@ -76,12 +127,46 @@ def _filter_from_options(key, options):
                                            if k != key], options)
 
 
-def _customized_loader(container, loader=Loader, mapping_tag=_MAPPING_TAG):
+# Max number of customized classes to cache.
+MEMO_SIZE = 1024
+
+_CUSTOMIZED = {}  # {(base class, container): customized class}
+
+
+def _cached_subclass(base, container, customize):
     """
-    Create or update loader with making given callble `container` to make
-    mapping objects such as dict and OrderedDict, used to construct python
-    object from yaml mapping node internally.
+    Create a subclass of loader or dumper class `base` customized for given
+    callble `container` only once, and cache it to reuse later; the cache is
+    cleared when it becomes full. Constructors and representers are
+    registered to the subclass so that the global state of loader and dumper
+    classes in yaml module are never changed.
 
+    :param base: Base loader or dumper class
+    :param container: callble to make a container object
+    :param customize: Callable to register constructors or representers
+    :return: Customized subclass of `base`
+    """
+    key = (base, container)
+    cls = _CUSTOMIZED.get(key)
+    if cls is None:
+        name = "%s_%s" % (base.__name__, getattr(container, "__name__",
+                                                 "container"))
+        cls = type(name, (base, ), {})
+        customize(cls, container)
+        if len(_CUSTOMIZED) >= MEMO_SIZE:  # e.g. new lambdas for each call.
+            _CUSTOMIZED.clear()
+        cls = _CUSTOMIZED.setdefault(key, cls)  # Someone may set it already.
+
+    return cls
+
+
+def _customize_loader(loader, container, mapping_tag=_MAPPING_TAG):
+    """
+    Register constructors to given loader class to make given callble
+    `container` to make mapping objects such as dict and OrderedDict, used to
+    construct python object from yaml mapping node internally.
+
+    :param loader: Loader class to customize
     :param container: Set container used internally
     """
     def construct_mapping(loader, node, deep=False):
@@ -92,7 +177,7 @@ def _customized_loader(container, loader=Loader, mapping_tag=_MAPPING_TAG):
             msg = "expected a mapping node, but found %s" % node.id
             raise yaml.constructor.ConstructorError(None, None, msg,
                                                     node.start_mark)
-        mapping = container()
+        pairs = []
         for key_node, value_node in node.value:
             key = loader.construct_object(key_node, deep=deep)
             try:
@@ -103,10 +188,11 @@ def _customized_loader(container, loader=Loader, mapping_tag=_MAPPING_TAG):
                          "found unacceptable key (%s)" % exc,
                          key_node.start_mark)
                 raise yaml.constructor.ConstructorError(*eargs)
-            value = loader.construct_object(value_node, deep=deep)
-            mapping[key] = value
+            # Values must be constructed completely before the mapping.
+            value = loader.construct_object(value_node, deep=True)
+            pairs.append((key, value))
 
-        return mapping
+        return container(pairs)
 
     tag = "tag:yaml.org,2002:python/unicode"
 
@@ -119,20 +205,38 @@ def _customized_loader(container, loader=Loader, mapping_tag=_MAPPING_TAG):
     except NameError:
         pass
 
-    if type(container) != dict:
+    if container is not dict:
         loader.add_constructor(mapping_tag, construct_mapping)
-    return loader
 
 
-def _customized_dumper(container, dumper=Dumper):
+def _customize_dumper(dumper, container):
     """
-    Coutnerpart of :func:`_customized_loader` for dumpers.
+    Coutnerpart of :func:`_customize_loader` for dumpers.
+
+    Representers for `container` and sub classes of dict are registered to
+    dump mapping objects as they are without any conversions and keep the
+    order of items. Plain dicts are dumped by the representer of the base
+    class, sorts keys unless sort_keys=False was given. Frozen sequences, array
+    objects and records are dumped as lists, and other mapping objects as
+    mappings.
     """
     def container_representer(dumper, data, mapping_tag=_MAPPING_TAG):
         """Container representer.
         """
         return dumper.represent_mapping(mapping_tag, data.items())
 
+    def frozen_list_representer(dumper, data):
+        """Representer for :class:`anyconfig.frozen.FrozenList`"""
+        return dumper.represent_list(data)
+
+    def array_representer(dumper, data):
+        """Representer for array objects, see :mod:`anyconfig.arrays`"""
+        return dumper.represent_list(data.tolist())
+
+    def records_representer(dumper, data):
+        """Representer for :class:`anyconfig.columnar.Records`"""
+        return dumper.represent_list(data.to_list())
+
     def ustr_representer(dumper, data):
         """Unicode string representer"""
         tag = "tag:yaml.org,2002:python/unicode"
@@ -143,9 +247,59 @@ def _customized_dumper(container, dumper=Dumper):
     except NameError:
         pass
 
-    if type(container) != dict:
-        dumper.add_representer(container, container_representer)
-    return dumper
+    # Exact matches are tried first and these have higher priority than
+    # representers registered in the base class for some types like
+    # OrderedDict.
+    for ctype in (container, anyconfig.compat.OrderedDict):
+        if ctype is not dict:
+            dumper.add_representer(ctype, container_representer)
+    dumper.add_multi_representer(dict, container_representer)
+    dumper.add_representer(anyconfig.frozen.FrozenList,
+                           frozen_list_representer)
+    dumper.add_representer(anyconfig.columnar.Record, container_representer)
+    # Other mapping objects, e.g. :class:`anyconfig.typed.TypedConfig`.
+    dumper.add_multi_representer(Mapping, container_representer)
+    dumper.add_representer(anyconfig.columnar.Records, records_representer)
+    dumper.add_representer(array.array, array_representer)
+    if anyconfig.arrays.numpy is not None:
+        dumper.add_multi_representer(anyconfig.arrays.numpy.ndarray,
+                                     array_representer)
+
+
+def _customized_loader(container, loader=Loader, mapping_tag=_MAPPING_TAG):
+    """
+    Get the subclass of `loader` customized to make given callble `container`
+    to make mapping objects, created only once for each container.
+
+    :param container: Set container used internally
+    :param loader: Base loader class
+    :return: Customized loader class
+    """
+    def customize(cls, container):
+        """Customize the loader class `cls`."""
+        _customize_loader(cls, container, mapping_tag=mapping_tag)
+
+    return _cached_subclass(loader, container, customize)
+
+
+def _customized_dumper(container, dumper=Dumper):
+    """
+    Coutnerpart of :func:`_customized_loader` for dumpers.
+    """
+    return _cached_subclass(dumper, container, _customize_dumper)
+
+
+def _classes(**options):
+    """
+    :param options:
+        Keyword options may contain 'ac_libyaml' to select loader and dumper
+        classes use libyaml (True, the default) or pure python ones (False)
+    :return: A dict of {role: loader or dumper class}
+    """
+    if options.get("ac_libyaml", True) and LIBYAML:
+        return LIBYAML_CLASSES
+
+    return PURE_CLASSES
 
 
 def _yml_fnc(fname, *args, **options):
@@ -162,44 +316,75 @@ def _yml_fnc(fname, *args, **options):
     return fnc(*args, **_filter_from_options(key, options))
 
 
-def _yml_load(stream, container, **options):
-    """An wrapper of yaml.safe_load and yaml.load.
-
-    :param stream: a file or file-like object to load YAML content
+def _yml_load_options(container, **options):
+    """
     :param container: callble to make a container object
+    :param options: keyword options passed to :func:`_yml_load` and so on
 
-    :return: Mapping object
+    :return: A tuple of (container, options passed to yaml.*load*)
     """
+    classes = _classes(**options)
     if options.get("ac_safe", False):
-        options = {}  # yaml.safe_load does not process Loader opts.
+        # Loader opts are not processed to load safely.
+        options = dict(Loader=classes["SafeLoader"])
     elif not options.get("Loader"):
         maybe_container = options.get("ac_dict", False)
-        if maybe_container and callable(maybe_container):
+        if container is dict and maybe_container and callable(maybe_container):
             container = maybe_container
 
-        options["Loader"] = _customized_loader(container)
+        options["Loader"] = _customized_loader(container,
+                                               loader=classes["Loader"])
 
-    ret = _yml_fnc("load", stream, **_filter_from_options("ac_dict", options))
+    options = anyconfig.utils.filter_options(["Loader"], options)
+    return (container, options)
+
+
+def _yml_load(stream, container, **options):
+    """An wrapper of yaml.safe_load and yaml.load.
+
+    :param stream: a file or file-like object to load YAML content
+    :param container: callble to make a container object
+
+    :return: Mapping object
+    """
+    (container, options) = _yml_load_options(container, **options)
+    ret = _yml_fnc("load", stream, **options)
     return container() if ret is None else container(ret)
 
 
+def _yml_load_all(stream, container, **options):
+    """An wrapper of yaml.safe_load_all and yaml.load_all.
+
+    :param stream: a file or file-like object to load YAML documents
+    :param container: callble to make a container object
+
+    :return: Generator yields mapping objects, each of them is constructed
+        from a document in `stream` as soon as it was parsed
+    """
+    (container, options) = _yml_load_options(container, **options)
+    for ret in _yml_fnc("load_all", stream, **options):
+        yield container() if ret is None else container(ret)
+
+
 def _yml_dump(cnf, stream, **options):
     """An wrapper of yaml.safe_dump and yaml.dump.
 
     :param cnf: Mapping object to dump
     :param stream: a file or file-like object to dump YAML data
     """
-    if options.get("ac_safe", False):
-        options = {}
-    elif not options.get("Dumper", False):
+    classes = _classes(**options)
+    if options.get("ac_safe", False) or not options.get("Dumper", False):
         # TODO: Any other way to get its constructor?
-        cnf_type = type(cnf)
-        maybe_container = options.get("ac_dict", cnf_type)
-        options["Dumper"] = _customized_dumper(maybe_container)
-
-    # Type information and the order of items are lost on dump currently.
-    cnf = anyconfig.dicts.convert_to(cnf, ac_dict=dict)
-    options = _filter_from_options("ac_dict", options)
+        maybe_container = options.get("ac_dict", type(cnf))
+        base = classes["SafeDumper" if options.get("ac_safe") else "Dumper"]
+        options["Dumper"] = _customized_dumper(maybe_container, dumper=base)
+    else:
+        # Representers for containers may not be registered to the dumper
+        # given and type information and the order of items are lost.
+        cnf = anyconfig.dicts.convert_to(cnf, ac_dict=dict)
+
+    for key in ("ac_dict", "ac_safe", "ac_libyaml"):
+        options = _filter_from_options(key, options)
     return _yml_fnc("dump", cnf, stream, **options)
 
 
@@ -209,15 +394,18 @@ class Parser(anyconfig.backend.base.StreamParser):
     """
     _type = "yaml"
     _extensions = ["yaml", "yml"]
-    _load_opts = ["Loader", "ac_safe", "ac_dict"]
-    _dump_opts = ["stream", "ac_safe", "Dumper", "default_style",
+    _load_opts = ["Loader", "ac_safe", "ac_dict", "ac_libyaml"]
+    _dump_opts = ["stream", "ac_safe", "ac_libyaml", "Dumper", "default_style",
                   "default_flow_style", "canonical", "indent", "width",
                   "allow_unicode", "line_break", "encoding", "explicit_start",
-                  "explicit_end", "version", "tags"]
+                  "explicit_end", "version", "tags", "sort_keys"]
     _ordered = True
     _dict_opts = ["ac_dict"]
+    _allow_frozen = True
+    _allow_intern = True
 
     load_from_stream = anyconfig.backend.base.to_method(_yml_load)
+    load_all_from_stream = anyconfig.backend.base.to_method(_yml_load_all)
     dump_to_stream = anyconfig.backend.base.to_method(_yml_dump)
 
 # vim:sw=4:ts=4:et:
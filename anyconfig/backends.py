@@ -21,16 +21,21 @@ import anyconfig.utils
 import anyconfig.backend.base
 import anyconfig.backend.ini
 import anyconfig.backend.json
+import anyconfig.backend.ndjson
 import anyconfig.backend.pickle
 import anyconfig.backend.properties
 import anyconfig.backend.shellvars
+import anyconfig.backend.snapshot
+import anyconfig.backend.sqlite
 import anyconfig.backend.xml
 
 LOGGER = logging.getLogger(__name__)
 PARSERS = [anyconfig.backend.ini.Parser, anyconfig.backend.json.Parser,
-           anyconfig.backend.pickle.Parser,
+           anyconfig.backend.ndjson.Parser, anyconfig.backend.pickle.Parser,
            anyconfig.backend.properties.Parser,
-           anyconfig.backend.shellvars.Parser, anyconfig.backend.xml.Parser]
+           anyconfig.backend.shellvars.Parser,
+           anyconfig.backend.snapshot.Parser, anyconfig.backend.sqlite.Parser,
+           anyconfig.backend.xml.Parser]
 
 _NA_MSG = "%s is not available. Disabled %s support."
 
@@ -171,6 +176,8 @@ def find_by_file(path_or_stream, cps=_PARSERS_BY_EXT, is_path_=False):
     <class 'anyconfig.backend.json.Parser'>
     >>> find_by_file("a.json", is_path_=True)
     <class 'anyconfig.backend.json.Parser'>
+    >>> find_by_file("a.json.gz")
+    <class 'anyconfig.backend.json.Parser'>
     """
     if cps is None:
         cps = _list_parsers_by_extension(PARSERS)
@@ -180,7 +187,7 @@ def find_by_file(path_or_stream, cps=_PARSERS_BY_EXT, is_path_=False):
         if path_or_stream is None:
             return None  # There is no way to detect file path.
 
-    ext_ref = anyconfig.utils.get_file_extension(path_or_stream)
+    ext_ref = anyconfig.utils.get_file_type_extension(path_or_stream)
     return next((psrs[-1] for ext, psrs in cps if ext == ext_ref), None)
 
 
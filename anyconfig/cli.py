@@ -15,7 +15,9 @@ import sys
 
 import anyconfig.api as API
 import anyconfig.compat
+import anyconfig.dicts
 import anyconfig.globals
+import anyconfig.index
 import anyconfig.parser
 import anyconfig.utils
 
@@ -59,15 +61,20 @@ Examples:
   # Query/Get/set part of input config
   %(prog)s '/etc/foo.d/*.json' --query 'locs[?state == 'T'].name | sort(@)'
   %(prog)s '/etc/foo.d/*.json' --get a.b.c
+  %(prog)s '/etc/foo.d/*.json' --get a.b --flat
   %(prog)s '/etc/foo.d/*.json' --set a.b.c=1
   # Validate with JSON schema or generate JSON schema:
   %(prog)s --validate -S foo.conf.schema.yml '/etc/foo.d/*.xml'
-  %(prog)s --gen-schema '/etc/foo.d/*.xml' -o foo.conf.schema.yml"""
+  %(prog)s --gen-schema '/etc/foo.d/*.xml' -o foo.conf.schema.yml
+  # Compile input configs into a snapshot and use it while inputs unchanged:
+  %(prog)s --compile -S foo.conf.schema.yml '/etc/foo.d/*.xml' -o foo.acsnap
+  %(prog)s --snapshot foo.acsnap -S foo.conf.schema.yml '/etc/foo.d/*.xml'"""
 
 DEFAULTS = dict(loglevel=1, list=False, output=None, itype=None,
                 otype=None, atype=None, merge=API.MS_DICTS,
                 ignore_missing=False, template=False, env=False,
-                schema=None, validate=False, gen_schema=False)
+                schema=None, validate=False, gen_schema=False,
+                compile=False, snapshot=None, flat=False)
 
 
 def to_log_level(level):
@@ -109,6 +116,11 @@ _GET_HELP = ("Specify key path to get part of config, for example, "
              "expression (http://tools.ietf.org/html/rfc6901) such like "
              "'', '/a~1b', '/m~0n'. "
              "This option is not used with --query option at the same time. ")
+_FLAT_HELP = ("Output flattened config, a mapping of JSON Pointer paths to "
+              "values of all objects other than containers, under the path "
+              "given with --get option or all, for example, '--get a --flat' "
+              "to a config {'a': {'b': [0, 1]}} gives {'/a/b/0': 0, "
+              "'/a/b/1': 1}.")
 _SET_HELP = ("Specify key path to set (update) part of config, for "
              "example, '--set a.b.c=1' to a config {'a': {'b': {'c': 0, "
              "'d': 1}}} gives {'a': {'b': {'c': 1, 'd': 1}}}.")
@@ -151,9 +163,21 @@ def make_parser(defaults=None):
                       help="Generate JSON schema for givne config file[s] "
                            "and output it instead of (merged) configuration.")
 
+    cpog = parser.add_argument_group("Snapshot specific options")
+    cpog.add_argument("--compile", action="store_true",
+                      help="Compile input files into a snapshot file given "
+                           "with -o/--output option along with the manifest "
+                           "of them instead of output merged configuration.")
+    cpog.add_argument("--snapshot",
+                      help="Load the snapshot file compiled with --compile "
+                           "option from the same input files with the same "
+                           "options instead of them if these are not "
+                           "changed.")
+
     gspog = parser.add_argument_group("Query/Get/set options")
     gspog.add_argument("-Q", "--query", help=_QUERY_HELP)
     gspog.add_argument("--get", help=_GET_HELP)
+    gspog.add_argument("--flat", action="store_true", help=_FLAT_HELP)
     gspog.add_argument("--set", help=_SET_HELP)
 
     parser.add_argument("-o", "--output", help="Output file path")
@@ -220,6 +244,9 @@ def _parse_args(argv):
     if args.validate and args.schema is None:
         _exit_with_output("--validate option requires --scheme option", 1)
 
+    if args.compile and not args.output:
+        _exit_with_output("--compile option requires --output option", 1)
+
     return args
 
 
@@ -232,12 +259,20 @@ def _exit_if_load_failure(cnf, msg):
         _exit_with_output(msg, 1)
 
 
-def _do_get(cnf, get_path):
+def _do_get(cnf, get_path, flat=False):
     """
     :param cnf: Configuration object to print out
     :param get_path: key path given in --get option
+    :param flat: Flatten the part of configuration if True
     :return: updated Configuration object if no error
     """
+    if flat:
+        try:
+            return anyconfig.index.build(cnf).flatten(get_path)
+        except KeyError:
+            _exit_with_output("Failed to get result: err=Not found: %s" %
+                              get_path, 1)
+
     (cnf, err) = API.get(cnf, get_path)
     if cnf is None:  # Failed to get the result.
         _exit_with_output("Failed to get result: err=%s" % err, 1)
@@ -308,12 +343,18 @@ def _load_diff(args):
     """
     :param args: :class:`~argparse.Namespace` object
     """
+    opts = dict(ignore_missing=args.ignore_missing, ac_merge=args.merge,
+                ac_template=args.template, ac_schema=args.schema)
     try:
-        diff = API.load(args.inputs, args.itype,
-                        ignore_missing=args.ignore_missing,
-                        ac_merge=args.merge,
-                        ac_template=args.template,
-                        ac_schema=args.schema)
+        if args.compile:
+            diff = API.compile(args.inputs, args.output, args.itype, **opts)
+            if diff is not None:
+                _exit_with_output("Compiled: %s" % args.output)
+        else:
+            diff = API.load(args.inputs, args.itype,
+                            ac_snapshot=args.snapshot, **opts)
+            if args.snapshot:
+                diff = anyconfig.dicts.convert_to(diff)
     except API.UnknownParserTypeError:
         _exit_with_output("Wrong input type '%s'" % args.itype, 1)
     except API.UnknownFileTypeError:
@@ -333,8 +374,8 @@ def _do_filter(cnf, args):
     """
     if args.query:
         cnf = API.query(cnf, args.query)
-    elif args.get:
-        cnf = _do_get(cnf, args.get)
+    elif args.get or args.flat:
+        cnf = _do_get(cnf, args.get or '', flat=args.flat)
     elif args.set:
         (key, val) = args.set.split('=')
         API.set_(cnf, key, anyconfig.parser.parse(val))
@@ -0,0 +1,490 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""Columnar representation of lists of homogeneous records in configs.
+
+Lists of mapping objects have the same keys, e.g. inventories of hosts, cost
+a dict for each record. :func:`convert` replaces such lists which have
+:data:`MIN_LENGTH` or more items with :class:`Records` objects keep the keys
+only once and the values in a list or an array object for each key, and look
+like read-only sequences of mapping objects, :class:`Record` views of the
+rows made on access.
+
+Records are filtered with predicates evaluated column by column
+(:meth:`Records.where`) without making the views of rows, and
+:func:`anyconfig.query.query` pushes simple filter expressions down to them.
+
+- Only lists of dicts have the same keys are converted. Immutable ones, e.g.
+  frozen ones made with 'ac_frozen' option, are not.
+- :func:`anyconfig.dicts.convert_to` converts records back to lists of mapping
+  objects.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import array
+import numbers
+import operator
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:
+    from collections import Mapping, Sequence
+
+import anyconfig.arrays
+import anyconfig.compat
+import anyconfig.dicts
+import anyconfig.frozen
+import anyconfig.utils
+
+
+# Lists shorter than this are not converted as the memory saved is not much
+# and it looks that it's not worth losing list's interface.
+MIN_LENGTH = 1024
+
+_NUMBER_TYPES = (int, float)  # Fast path to check types of numbers.
+_SCALAR_TYPES = frozenset(anyconfig.compat.STR_TYPES +
+                          (bool, int, float, type(None)))
+
+# Comparison operators of filters, same as JMESPath's.
+_OPS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt,
+        "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+def _is_number(val):
+    """
+    :return: True if `val` is a number but not a bool like JMESPath
+
+    >>> _is_number(1), _is_number(0.1), _is_number(True), _is_number("1")
+    (True, True, False, False)
+    """
+    return isinstance(val, numbers.Real) and not isinstance(val, bool)
+
+
+def _match(column, oper, val, indices=None):
+    """
+    :param column: A list or an array object
+    :param oper: Comparison operator, one of '==', '!=', '<', '<=', '>', '>='
+    :param val: Value to compare with
+    :param indices: A list of indexes of items to test or None to test all
+    :return: A list of indexes of items match
+    :raises: ValueError if `oper` is unknown
+
+    >>> _match([1, True, 2, "a"], "==", 1), _match([1, True, 2, "a"], "<", 2)
+    ([0], [0])
+    """
+    if oper not in _OPS:
+        raise ValueError("Unknown operator: %r" % (oper, ))
+
+    if _is_number(val) and anyconfig.arrays.is_array(column) and \
+            not isinstance(column, array.array):
+        # numpy.ndarray: compare all of the items at once.
+        matched = [int(i) for i in _OPS[oper](column, val).nonzero()[0]]
+        if indices is None:
+            return matched
+
+        matched = frozenset(matched)
+        return [i for i in indices if i in matched]
+
+    items = enumerate(column) if indices is None else \
+        ((i, column[i]) for i in indices)
+
+    if oper in ("==", "!="):
+        if val is None or isinstance(val, bool):  # Singletons.
+            ret = [i for i, x in items if x is val]
+        elif _is_number(val):
+            ret = [i for i, x in items if x == val and not isinstance(x, bool)]
+        else:
+            ret = [i for i, x in items if x == val]
+
+        if oper == "==":
+            return ret
+
+        excludes = frozenset(ret)
+        return [i for i in (range(len(column)) if indices is None
+                            else indices) if i not in excludes]
+
+    if not _is_number(val):  # Ordering other than numbers is always false.
+        return []
+
+    fnc = _OPS[oper]
+    return [i for i, x in items
+            if (type(x) in _NUMBER_TYPES or _is_number(x)) and fnc(x, val)]
+
+
+def _take(column, indices):
+    """
+    :param column: A list or an array object
+    :param indices: A list of indexes of items to take
+    :return: An object of the same type of `column` has the items taken
+    """
+    if isinstance(column, array.array):
+        return array.array(column.typecode, [column[i] for i in indices])
+
+    if anyconfig.arrays.is_array(column):  # numpy.ndarray
+        return column[indices]
+
+    return [column[i] for i in indices]
+
+
+def _to_mapping(obj):
+    """
+    :return: A dict if `obj` is a :class:`Record` or `obj`
+    """
+    return dict(obj) if isinstance(obj, Record) else obj
+
+
+class Record(Mapping):
+    """
+    Read-only view of a row of :class:`Records`, made on access.
+    """
+    __slots__ = ("_records", "_index")
+
+    def __init__(self, records, index):
+        """
+        :param records: :class:`Records` object has this row
+        :param index: Index of this row
+        """
+        self._records = records
+        self._index = index
+
+    def __getitem__(self, key):
+        # pylint: disable=protected-access
+        return self._records._columns[self._records._positions[key]][
+            self._index]
+
+    def __iter__(self):
+        return iter(self._records.fields)
+
+    def __len__(self):
+        return len(self._records.fields)
+
+    def __contains__(self, key):
+        # pylint: disable=protected-access
+        return key in self._records._positions
+
+    def __eq__(self, other):
+        if anyconfig.utils.is_dict_like(other):
+            return dict(self) == dict(other)
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        ret = self.__eq__(other)
+        return ret if ret is NotImplemented else not ret
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, dict(self))
+
+
+class Records(Sequence):
+    """
+    Read-only sequence of mapping objects have the same keys, keeps the keys
+    once and the values in a list or an array object for each key.
+
+    >>> recs = Records(("name", "port"), [["a", "b"], [80, 443]])
+    >>> len(recs), recs[1]["port"], dict(recs[0])
+    (2, 443, {'name': 'a', 'port': 80})
+    >>> recs == [dict(name="a", port=80), dict(name="b", port=443)]
+    True
+    >>> recs.where("port", ">", 100).to_list()
+    [{'name': 'b', 'port': 443}]
+    """
+    __slots__ = ("fields", "_columns", "_positions", "_length")
+
+    def __init__(self, fields, columns):
+        """
+        :param fields: A tuple of keys of records
+        :param columns:
+            A list of lists or array objects of values for each key, which
+            must have the same length
+        :raises: ValueError if the numbers of keys and columns or the lengths
+            of columns do not match
+        """
+        if len(fields) != len(columns):
+            raise ValueError("Numbers of keys and columns do not match: "
+                             "%d != %d" % (len(fields), len(columns)))
+
+        lengths = set(len(col) for col in columns)
+        if len(lengths) > 1:
+            raise ValueError("Columns have different lengths: %r" %
+                             sorted(lengths))
+
+        self.fields = tuple(fields)
+        self._columns = tuple(columns)
+        self._positions = dict((key, idx) for idx, key in enumerate(fields))
+        self._length = lengths.pop() if lengths else 0
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(self._length)))
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("records index out of range")
+
+        return Record(self, index)
+
+    def __iter__(self):
+        for idx in range(self._length):
+            yield Record(self, idx)
+
+    def __eq__(self, other):
+        if isinstance(other, Records):
+            return self.to_list() == other.to_list()
+
+        if isinstance(other, (list, tuple)):
+            return self.to_list() == [_to_mapping(x) for x in other]
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        ret = self.__eq__(other)
+        return ret if ret is NotImplemented else not ret
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<%s: %d records of %r>" % (type(self).__name__, self._length,
+                                           self.fields)
+
+    def __reduce__(self):
+        return (type(self), (self.fields, list(self._columns)))
+
+    def column(self, key, indices=None):
+        """
+        :param key: Key of records
+        :param indices: A list of indexes of records to take values or None
+        :return: A list or an array object of the values of `key`
+        :raises: KeyError if records do not have `key`
+        """
+        column = self._columns[self._positions[key]]
+        return column if indices is None else _take(column, indices)
+
+    def to_list(self):
+        """
+        :return: A list of dicts of records
+        """
+        columns = [anyconfig.arrays.to_list(col) for col in self._columns]
+        return [dict(zip(self.fields, vals)) for vals in zip(*columns)]
+
+    def take(self, indices):
+        """
+        :param indices: An iterable yields indexes of records to take
+        :return: A new :class:`Records` object has the records taken
+        """
+        indices = list(indices)
+        return Records(self.fields, [_take(col, indices)
+                                     for col in self._columns])
+
+    def indices(self, *conds):
+        """
+        :param conds: Tuples of (key, operator, value), see :meth:`where`
+        :return: A list of indexes of records match all of `conds`
+        :raises: ValueError if some operators are unknown
+        """
+        indices = None
+        for key, oper, val in conds:
+            if key in self._positions:
+                indices = _match(self.column(key), oper, val, indices)
+            else:  # Values of missing keys are None.
+                indices = _match([None] * self._length, oper, val, indices)
+
+            if not indices:
+                return []
+
+        return list(range(self._length)) if indices is None else indices
+
+    def where(self, key, oper, val):
+        """
+        Filter records with a predicate on the values of `key`, evaluated on
+        the column without making the views of rows.
+
+        Comparisons are same as JMESPath's, that is, bools are not equal to
+        numbers and ordering comparisons are false unless both values are
+        numbers.
+
+        :param key: Key of records
+        :param oper: Comparison operator, one of '==', '!=', '<', '<=', '>',
+            '>='
+        :param val: Value to compare with
+        :return: A new :class:`Records` object has the records matched
+        :raises: ValueError if `oper` is unknown
+        """
+        return self.take(self.indices((key, oper, val)))
+
+
+def is_records(obj):
+    """
+    :param obj: Any object
+    :return: True if `obj` is a :class:`Records` object
+
+    >>> is_records(Records(("a", ), [[1]])), is_records([{"a": 1}])
+    (True, False)
+    """
+    return isinstance(obj, Records)
+
+
+def to_records(lst, array_kind=None):
+    """
+    :param lst: A list of mapping objects
+    :param array_kind:
+        "array" or "numpy" to store columns of numbers have
+        :data:`anyconfig.arrays.MIN_LENGTH` or more items as array objects,
+        see :func:`anyconfig.arrays.to_array`, or None
+    :return: :class:`Records` object has the items of `lst` or None if `lst`
+        cannot be converted as items are not dicts have the same keys or have
+        no keys
+
+    >>> to_records([dict(a=1, b="x"), dict(b="y", a=2)]).column("b")
+    ['x', 'y']
+    >>> to_records([dict(a=1), dict(b=2)]) is None
+    True
+    """
+    if not lst:
+        return None
+
+    first = lst[0]
+    ctype = type(first)
+    if not anyconfig.utils.is_dict_like(first) or \
+            anyconfig.frozen.is_frozen(first) or \
+            not all(type(x) is ctype for x in lst):
+        return None
+
+    keys = tuple(first)
+    if not keys:
+        return None
+
+    (nkeys, keyset) = (len(keys), frozenset(keys))
+    if not all(len(x) == nkeys and keyset.issuperset(x) for x in lst):
+        return None
+
+    columns = []
+    for key in keys:
+        column = [x[key] for x in lst]
+        if array_kind and len(column) >= anyconfig.arrays.MIN_LENGTH:
+            arr = anyconfig.arrays.to_array(column, array_kind)
+            if arr is not None:
+                column = arr
+        columns.append(column)
+
+    return Records(keys, columns)
+
+
+def _convert_items(lst, min_length, array_kind):
+    """
+    Convert lists of records in `lst` in place.
+    """
+    for idx, item in enumerate(lst):
+        if type(item) in _SCALAR_TYPES:
+            continue
+        new = _convert(item, min_length, array_kind)
+        if new is not item:
+            lst[idx] = new
+
+
+def _convert(obj, min_length, array_kind):
+    """
+    :return: :class:`Records` object made from `obj` or `obj` updated in place
+    """
+    if type(obj) is list:
+        if len(obj) >= min_length:
+            recs = to_records(obj, array_kind=array_kind)
+            if recs is not None:
+                # pylint: disable=protected-access
+                for column in recs._columns:
+                    if type(column) is list:
+                        _convert_items(column, min_length, array_kind)
+                return recs
+
+        _convert_items(obj, min_length, array_kind)
+
+    elif anyconfig.utils.is_dict_like(obj) and \
+            not anyconfig.frozen.is_frozen(obj):
+        for key, val in list(obj.items()):
+            if type(val) in _SCALAR_TYPES:
+                continue
+            new = _convert(val, min_length, array_kind)
+            if new is not val:
+                obj[key] = new
+
+    return obj
+
+
+def convert(obj, min_length=MIN_LENGTH, array_kind=None):
+    """
+    Convert large lists of homogeneous records in `obj` to :class:`Records`
+    objects.
+
+    :param obj: Mapping object, list or any other object
+    :param min_length: Min number of items of lists to convert
+    :param array_kind: See :func:`to_records`
+    :return: `obj` updated in place or :class:`Records` made from `obj`
+
+    >>> cnf = convert(dict(hosts=[dict(name="a"), dict(name="b")]),
+    ...               min_length=2)
+    >>> cnf["hosts"]
+    <Records: 2 records of ('name',)>
+    """
+    return _convert(obj, min_length, array_kind)
+
+
+def has_records(obj):
+    """
+    :param obj: Any object
+    :return: True if `obj` is or has some :class:`Records` objects
+
+    >>> has_records(dict(a=[1, dict(b=Records(("c", ), [[1]]))]))
+    True
+    """
+    if isinstance(obj, Records):
+        return True
+
+    if anyconfig.utils.is_dict_like(obj):
+        return any(has_records(val) for val in obj.values())
+
+    if isinstance(obj, (list, tuple)):
+        return any(has_records(item) for item in obj)
+
+    return False
+
+
+def to_plain(obj):
+    """
+    :param obj: Any object
+    :return: A copy of `obj` with :class:`Records` objects converted back to
+        lists of mapping objects if it has them or `obj` itself
+    """
+    if not has_records(obj):
+        return obj
+
+    return anyconfig.dicts.convert_to(obj)
+
+
+def json_default(obj):
+    """
+    Function passed to JSON dumpers as 'default' to dump :class:`Records`
+    objects, mapping objects other than dicts such as :class:`Record` and
+    :class:`anyconfig.typed.TypedConfig` objects, and array objects.
+
+    :param obj: An object JSON dumper does not know how to dump
+    :return: A list or a dict
+    :raises: TypeError if `obj` cannot be dumped
+    """
+    if isinstance(obj, Records):
+        return obj.to_list()
+
+    if anyconfig.utils.is_dict_like(obj):
+        return dict(obj)
+
+    return anyconfig.arrays.json_default(obj)
+
+# vim:sw=4:ts=4:et:
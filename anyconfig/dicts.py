@@ -11,13 +11,24 @@ r"""Utility functions to operate on mapping objects such as get, set and merge.
    define _update_* and merge functions based on classes in
    :mod:`m9dicts.dicts`
 
+.. versionchanged:: 0.9.5
+   add :func:`compile_path` to make accessors of paths reused, and cache
+   accessors of paths used recently in :func:`get` and :func:`set_`
+
 """
 from __future__ import absolute_import
-import functools
-import operator
 import re
+
+import anyconfig.arrays
+import anyconfig.compat
+import anyconfig.frozen
 import anyconfig.utils
 
+try:
+    from collections.abc import MutableSequence
+except ImportError:
+    from collections import MutableSequence
+
 
 # Merge strategies:
 MS_REPLACE = "replace"
@@ -30,6 +41,14 @@ PATH_SEPS = ('/', '.')
 
 _JSNP_GET_ARRAY_IDX_REG = re.compile(r"(?:0|[1-9][0-9]*)")
 _JSNP_SET_ARRAY_IDX = re.compile(r"(?:0|[1-9][0-9]*|-)")
+_DIGITS = frozenset("0123456789")
+
+# Max number of accessors of paths used recently to cache.
+ACCESSORS_CACHE_SIZE = 1024
+_ACCESSORS = anyconfig.compat.OrderedDict()  # {(path, ...): PathAccessor}
+_move_to_end = getattr(_ACCESSORS, "move_to_end",  # python < 3.2
+                       lambda key: _ACCESSORS.__setitem__(key,
+                                                          _ACCESSORS.pop(key)))
 
 
 def _jsnp_unescape(jsn_s):
@@ -44,6 +63,9 @@ def _jsnp_unescape(jsn_s):
     >>> _jsnp_unescape("~1aaa~1~0bbb")
     '/aaa/~bbb'
     """
+    if '~' not in jsn_s:
+        return jsn_s
+
     return jsn_s.replace('~1', '/').replace('~0', '~')
 
 
@@ -94,6 +116,270 @@ def mk_nested_dic(path, val, seps=PATH_SEPS):
     return ret
 
 
+def _to_array_index(key, idx_reg=_JSNP_GET_ARRAY_IDX_REG):
+    """
+    :param key: A key in path expression
+    :param idx_reg: Regex pattern of array indexes
+    :return: An int if `key` may be an array index or None
+
+    >>> [_to_array_index(k) for k in ("0", "12", "01", "1a", "-", "a")]
+    [0, 12, None, None, None, None]
+    """
+    if not isinstance(key, anyconfig.compat.STR_TYPES):
+        return None  # Keys of other types are used as they are.
+
+    if idx_reg is _JSNP_GET_ARRAY_IDX_REG and key[:1] not in _DIGITS:
+        return None
+
+    match = idx_reg.match(key)
+    if match and match.end() == len(key):
+        return int(key)
+
+    return None
+
+
+def _is_array_key(key, idx):
+    """
+    :param key: A key in path expression
+    :param idx: An int if `key` may be an array index or None
+    :return: True if `key` may point an item of arrays to set, e.g. '0', '-'
+    """
+    return idx is not None or key == '-'
+
+
+def _is_mutable_list(obj):
+    """
+    >>> _is_mutable_list([]), _is_mutable_list(()), _is_mutable_list({})
+    (True, False, False)
+    """
+    return isinstance(obj, MutableSequence)
+
+
+def _container_factory(dic):
+    """
+    :param dic: a dict[-like] object to set values
+    :return: Callable to make mapping objects of the same type as `dic`
+    """
+    cls = type(dic)
+    if cls is dict or not anyconfig.utils.is_dict_like(dic):
+        return dict
+
+    try:
+        cls()
+    except TypeError:  # It needs some arguments to make.
+        return dict
+
+    return cls
+
+
+def _set_item(obj, key, idx, val):
+    """
+    Set `val` to the item of `obj` pointed by `key` in place. Mapping objects
+    set to the existing mapping objects are merged into them.
+
+    :param obj: a dict[-like] object or a list to set `val`
+    :param key: A key in path expression
+    :param idx: An int if `key` may be an array index or None
+    :param val: Value to set
+    :raises: IndexError if the index is out of range of the list `obj`
+    """
+    if _is_array_key(key, idx) and _is_mutable_list(obj):
+        if idx is None or idx == len(obj):
+            obj.append(val)
+        else:
+            obj[idx] = val  # It may raise IndexError.
+        return
+
+    if anyconfig.utils.is_dict_like(val) and key in obj:
+        val0 = obj[key]
+        if anyconfig.utils.is_dict_like(val0):
+            merge(val0, val, ac_merge=MS_DICTS)
+            return
+
+    obj[key] = val
+
+
+def _get_or_make_child(obj, key, idx, make, array_keys=False):
+    """
+    Get the container pointed by `key` in `obj` or make new one and set it to
+    `obj` if it does not exist or is not a container.
+
+    :param obj: a dict[-like] object or a list
+    :param key: A key in path expression
+    :param idx: An int if `key` may be an array index or None
+    :param make: Callable to make new mapping objects
+    :param array_keys: True if the keys of the child are array indexes
+    :return: The child container of `obj`
+    """
+    if _is_array_key(key, idx) and _is_mutable_list(obj):
+        child = obj[idx] if idx is not None and idx < len(obj) else None
+    else:
+        try:
+            child = obj.get(key)
+        except AttributeError:  # It's a list.
+            child = None
+
+    if anyconfig.utils.is_dict_like(child) or \
+            (array_keys and _is_mutable_list(child)):
+        return child
+
+    child = make()
+    _set_item(obj, key, idx, child)
+    return child
+
+
+class PathAccessor(object):
+    """
+    Accessor to the object pointed by a path expression in nested dicts. The
+    path expression is parsed only once on its initialization, so that it's
+    much faster to get and set objects with the same path repeatedly.
+
+    Keys in the path are kept in `keys`, and pairs of them and array indexes
+    or None if keys cannot be indexes are kept in `items`.
+
+    >>> acc = PathAccessor("/a/b~1c/1/d")
+    >>> acc.keys
+    ('a', 'b/c', '1', 'd')
+    >>> acc.items[2]
+    ('1', 1)
+    >>> d = {'a': {'b/c': [1, {'d': 2}]}}
+    >>> (acc.get(d), acc.exists(d), acc.exists({}))
+    ((2, ''), True, False)
+    """
+    __slots__ = ("path", "keys", "items")
+
+    def __init__(self, path, seps=PATH_SEPS, idx_reg=_JSNP_GET_ARRAY_IDX_REG):
+        """
+        :param path:
+            Path expression to point object wanted or a tuple of keys
+        :param seps: Separator char candidates
+        :param idx_reg: Regex pattern of array indexes
+        """
+        if isinstance(path, tuple):
+            keys = list(path)
+        else:
+            keys = [_jsnp_unescape(p) for p in _split_path(path, seps)]
+        self.path = path
+        self.keys = tuple(keys)
+        self.items = tuple([(key, _to_array_index(key, idx_reg))
+                            for key in keys])
+
+    def __repr__(self):
+        return "<%s: %r>" % (self.__class__.__name__, self.path)
+
+    def _get(self, dic):
+        """
+        :param dic: a dict[-like] object
+        :return: The object pointed by the path in `dic`
+        :raises: TypeError, KeyError or IndexError if it was not found
+        """
+        for key, idx in self.items:
+            if idx is not None and anyconfig.utils.is_list_like(dic):
+                dic = dic[idx]
+            else:
+                dic = dic[key]
+
+        return dic
+
+    def get(self, dic):
+        """
+        :param dic: a dict[-like] object
+        :return: A tuple of (result_object, error_message) like :func:`get`
+        """
+        try:
+            return (self._get(dic), '')
+        except (TypeError, KeyError, IndexError) as exc:
+            return (None, str(exc))
+
+    def exists(self, dic):
+        """
+        :param dic: a dict[-like] object
+        :return: True if the object pointed by the path exists in `dic`
+        """
+        try:
+            self._get(dic)
+            return True
+        except (TypeError, KeyError, IndexError):
+            return False
+
+    def set(self, dic, val):
+        """
+        Set `val` to the object pointed by the path in `dic` in place like
+        :func:`set_`.
+
+        :param dic: a dict[-like] object to set `val`
+        :param val: Value to set
+        :raises: ValueError if the path is empty
+        """
+        if not self.keys:
+            raise ValueError("Empty path to set the value: %r" % self.path)
+
+        make = _container_factory(dic)
+        (key, idx) = self.items[0]
+        for nkey, nidx in self.items[1:]:
+            dic = _get_or_make_child(dic, key, idx, make,
+                                     _is_array_key(nkey, nidx))
+            (key, idx) = (nkey, nidx)
+
+        _set_item(dic, key, idx, val)
+
+
+def compile_path(path, seps=PATH_SEPS):
+    """
+    Parse path expression and make an accessor to get and set objects with
+    the path repeatedly. Accessors made recently are cached and reused.
+
+    :param path: Path expression to point object wanted or a tuple of keys
+    :param seps: Separator char candidates
+    :return: :class:`PathAccessor` object
+
+    >>> acc = compile_path("a.b")
+    >>> d = dict(a=dict(b=1))
+    >>> acc.get(d)
+    (1, '')
+    >>> acc.set(d, 2)
+    >>> d
+    {'a': {'b': 2}}
+    >>> compile_path(("a", "b/c")).keys
+    ('a', 'b/c')
+    """
+    return _get_accessor(path, seps)
+
+
+def _get_accessor(path, seps=PATH_SEPS, idx_reg=_JSNP_GET_ARRAY_IDX_REG):
+    """
+    Get the accessor of `path` from the LRU cache of accessors used recently
+    or make new one and cache it.
+
+    :param path: Path expression to point object wanted
+    :param seps: Separator char candidates
+    :param idx_reg: Regex pattern of array indexes
+    :return: :class:`PathAccessor` object
+    """
+    if not isinstance(seps, tuple):
+        seps = tuple(seps)
+
+    ckey = (path, seps, idx_reg)
+    try:
+        acc = _ACCESSORS[ckey]
+    except KeyError:
+        acc = PathAccessor(path, seps=seps, idx_reg=idx_reg)
+        if len(_ACCESSORS) >= ACCESSORS_CACHE_SIZE:
+            try:
+                _ACCESSORS.popitem(last=False)  # The least recently used one.
+            except KeyError:  # Emptied by other threads in the meantime.
+                pass
+        _ACCESSORS[ckey] = acc
+        return acc
+
+    try:
+        _move_to_end(ckey)
+    except KeyError:  # Evicted by other threads in the meantime.
+        pass
+
+    return acc
+
+
 def get(dic, path, seps=PATH_SEPS, idx_reg=_JSNP_GET_ARRAY_IDX_REG):
     """getter for nested dicts.
 
@@ -116,34 +402,132 @@ def get(dic, path, seps=PATH_SEPS, idx_reg=_JSNP_GET_ARRAY_IDX_REG):
     >>> get(d, "/a/b/d/-")  # doctest: +ELLIPSIS
     (None, 'list indices must be integers...')
     """
-    items = [_jsnp_unescape(p) for p in _split_path(path, seps)]
-    if not items:
-        return (dic, '')
-    try:
-        if len(items) == 1:
-            return (dic[items[0]], '')
-
-        prnt = functools.reduce(operator.getitem, items[:-1], dic)
-        arr = anyconfig.utils.is_list_like(prnt) and idx_reg.match(items[-1])
-        return (prnt[int(items[-1])], '') if arr else (prnt[items[-1]], '')
-
-    except (TypeError, KeyError, IndexError) as exc:
-        return (None, str(exc))
+    return _get_accessor(path, seps, idx_reg).get(dic)
 
 
 def set_(dic, path, val, seps=PATH_SEPS):
     """setter for nested dicts.
 
-    :param dic: a dict[-like] object support recursive merge operations
+    Containers missing in the path are made with the type of `dic`, and
+    mapping objects set to existing mapping objects are merged into them.
+    Items of lists are pointed by JSON Pointer array indexes, and '-' means
+    the end of lists to append items.
+
+    :param dic: a dict[-like] object to set `val`
     :param path: Path expression to point object wanted
+    :param val: Value to set
     :param seps: Separator char candidates
 
     >>> d = dict(a=1, b=dict(c=2, ))
     >>> set_(d, 'a.b.d', 3)
     >>> d['a']['b']['d']
     3
+    >>> d = dict(a=[1, 2])
+    >>> set_(d, '/a/0', 0)
+    >>> set_(d, '/a/-', 3)
+    >>> d
+    {'a': [0, 2, 3]}
     """
-    merge(dic, mk_nested_dic(path, val, seps), ac_merge=MS_DICTS)
+    _get_accessor(path, seps).set(dic, val)
+
+
+_NO_VALUE = object()  # Marker of trie nodes have no values to set.
+
+
+def _make_trie_node(idx=None, val=_NO_VALUE):
+    """
+    :param idx: An int if the key of the node may be an array index or None
+    :param val: Value to set or _NO_VALUE if the node is not a leaf
+    :return:
+        A trie node, a list of [idx, val, children, array_keys], children is
+        None if it's a leaf and array_keys is True if the keys of its children
+        are array indexes or None if it has no children yet
+    """
+    if val is not _NO_VALUE:
+        return [idx, val, None, None]
+
+    return [idx, val, anyconfig.compat.OrderedDict(), None]
+
+
+def _add_to_trie(root, items, val):
+    """
+    :param root: The root node of a trie of keys
+    :param items: A list of (key, array index or None) in the path
+    :param val: Value to set
+    :return: False if the path overlaps with the paths in the trie
+    """
+    node = root
+    for pos, (key, idx) in enumerate(items):
+        child = node[2].get(key)
+        last = pos == len(items) - 1
+        if child is None:
+            is_array = _is_array_key(key, idx)
+            if node[3] is None:
+                node[3] = is_array
+            elif node[3] != is_array:
+                return False  # It may point items in lists and mappings.
+
+            child = node[2][key] = _make_trie_node(idx, val if last else
+                                                   _NO_VALUE)
+        elif last or child[1] is not _NO_VALUE or key == '-':
+            return False  # Or new item may be appended to the list.
+        node = child
+
+    return True
+
+
+def _apply_trie(obj, node, make):
+    """
+    Set values in the trie of keys to `obj` recursively.
+
+    :param obj: a dict[-like] object or a list to set values
+    :param node: A trie node made by :func:`_make_trie_node`
+    :param make: Callable to make new mapping objects
+    """
+    for key, child in node[2].items():
+        if child[1] is not _NO_VALUE:
+            _set_item(obj, key, child[0], child[1])
+        else:
+            _apply_trie(_get_or_make_child(obj, key, child[0], make,
+                                           child[3]),
+                        child, make)
+
+
+def set_many(dic, items, seps=PATH_SEPS):
+    """
+    Set values with paths in bulk. Paths are grouped by their prefixes in a
+    trie, so that containers pointed by common prefixes are looked up only
+    once. The result is same as :func:`set_` was called for each item in
+    order.
+
+    :param dic: a dict[-like] object to set values
+    :param items:
+        A mapping object of {path: value} or an iterable yields (path, value)
+    :param seps: Separator char candidates
+    :raises: ValueError if some paths are empty
+
+    >>> d = dict(a=dict(b=1))
+    >>> set_many(d, [("a.c", 2), ("/a/d/e", 3), ("f", 4)])
+    >>> sorted(d["a"].items()), d["f"]
+    ([('b', 1), ('c', 2), ('d', {'e': 3})], 4)
+    """
+    if anyconfig.utils.is_dict_like(items):
+        items = items.items()
+
+    make = _container_factory(dic)
+    root = _make_trie_node()
+    for path, val in items:
+        acc = PathAccessor(path, seps=seps)  # Not cached as used only once.
+        if not acc.keys:
+            raise ValueError("Empty path to set the value: %r" % path)
+
+        if not _add_to_trie(root, acc.items, val):
+            # The path overlaps with previous ones and the order matters.
+            _apply_trie(dic, root, make)
+            root = _make_trie_node()
+            _add_to_trie(root, acc.items, val)
+
+    _apply_trie(dic, root, make)
 
 
 def _are_list_like(*objs):
@@ -194,7 +578,10 @@ def _merge_list(self, key, lst):
     :param key: self[key] will be updated
     :param lst: Other list to merge
     """
-    self[key] += [x for x in lst if x not in self[key]]
+    if anyconfig.arrays.is_array(self[key]) or anyconfig.arrays.is_array(lst):
+        self[key] = anyconfig.arrays.merge(self[key], lst)
+    else:
+        self[key] += [x for x in lst if x not in self[key]]
 
 
 def _merge_other(self, key, val):
@@ -313,6 +700,7 @@ def _make_recur(obj, make_fn, ac_ordered=False, ac_dict=None, **options):
     if ac_dict is None:
         ac_dict = anyconfig.compat.OrderedDict if ac_ordered else dict
 
+    options.update(ac_ordered=ac_ordered, ac_dict=ac_dict)
     return ac_dict((k, None if v is None else make_fn(v, **options))
                    for k, v in obj.items())
 
@@ -325,10 +713,15 @@ def _make_iter(obj, make_fn, **options):
 
     :return: Mapping object
     """
-    return type(obj)(make_fn(v, **options) for v in obj)
+    items = (make_fn(v, **options) for v in obj)
+    if not isinstance(obj, (list, tuple)):  # e.g. columnar records.
+        return list(items)
+
+    return type(obj)(items)
 
 
-def convert_to(obj, ac_ordered=False, ac_dict=None, **options):
+def convert_to(obj, ac_ordered=False, ac_dict=None, ac_frozen=False,
+               **options):
     """
     Convert a mapping objects to a dict or object of `to_type` recursively.
     Borrowed basic idea and implementation from bunch.unbunchify. (bunch is
@@ -337,6 +730,9 @@ def convert_to(obj, ac_ordered=False, ac_dict=None, **options):
     :param obj: A mapping objects or other primitive object
     :param ac_ordered: Use OrderedDict instead of dict to keep order of items
     :param ac_dict: Callable to convert `obj` to mapping object
+    :param ac_frozen:
+        Convert `obj` to immutable :class:`anyconfig.frozen.FrozenDict`
+        object in a single pass if True, takes precedence over `ac_dict`
     :param options: Optional keyword arguments.
 
     :return: A dict or OrderedDict or object of `cls`
@@ -346,11 +742,17 @@ def convert_to(obj, ac_ordered=False, ac_dict=None, **options):
     {'a': 1}
     >>> convert_to(OD((('a', OD((('b', OD((('c', 1), ))), ))), )), cls=dict)
     {'a': {'b': {'c': 1}}}
+    >>> convert_to(dict(a=[1, dict(b=2)]), ac_frozen=True)
+    FrozenDict({'a': FrozenList([1, FrozenDict({'b': 2})])})
     """
+    if ac_frozen:
+        return anyconfig.frozen.freeze(obj)
+
     options.update(ac_ordered=ac_ordered, ac_dict=ac_dict)
     if anyconfig.utils.is_dict_like(obj):
         return _make_recur(obj, convert_to, **options)
-    elif anyconfig.utils.is_list_like(obj):
+    elif anyconfig.utils.is_list_like(obj) and \
+            not anyconfig.arrays.is_array(obj):
         return _make_iter(obj, convert_to, **options)
 
     return obj
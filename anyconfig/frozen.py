@@ -0,0 +1,182 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""Immutable and hashable mapping and sequence types for config data.
+
+:class:`FrozenDict` and :class:`FrozenList` are made from mapping objects or
+(key, value) pairs and iterables respectively, and the mapping and sequence
+objects in them are frozen in the same construction pass, so that they can be
+given as 'ac_dict' to backends make mapping objects from (key, value) pairs
+directly while loading, e.g. JSON backend.
+
+Frozen objects are safe to share across threads and to use as keys of dicts
+and memos. Their structural hashes are computed only once and cached, and
+mapping objects of which hashes were cached and differ are compared in O(1).
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import anyconfig.compat
+import anyconfig.utils
+
+
+# Types of values never need to be frozen:
+_SCALAR_TYPES = tuple(set(anyconfig.compat.STR_TYPES +
+                          (bool, int, float, type(None))))
+
+
+def _immutable(self, *_args, **_kwargs):
+    """Raise TypeError as `self` is immutable."""
+    raise TypeError("'%s' object is immutable" % type(self).__name__)
+
+
+class FrozenList(tuple):
+    """
+    Immutable and hashable sequence compares equal to the list or tuple has
+    the same items.
+
+    >>> lst = FrozenList([1, [2, 3], dict(a=4)])
+    >>> lst == [1, [2, 3], dict(a=4)], isinstance(lst[2], FrozenDict)
+    (True, True)
+    >>> hash(lst) == hash(FrozenList(lst))
+    True
+    """
+    __slots__ = ()
+
+    def __new__(cls, items=()):
+        """
+        :param items: An iterable yields items may be frozen
+        """
+        return tuple.__new__(cls, [x if isinstance(x, _SCALAR_TYPES)
+                                   else freeze(x) for x in items])
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            other = tuple(other)
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, list(self))
+
+    def __reduce__(self):
+        return (type(self), (tuple(self), ))
+
+
+class FrozenDict(dict):
+    """
+    Immutable and hashable mapping object, made from the same arguments as
+    dict in a single pass and freezes mapping and sequence objects in it.
+
+    >>> fdic = FrozenDict([("a", 1), ("b", dict(c=[2]))])
+    >>> fdic == dict(a=1, b=dict(c=[2])), isinstance(fdic["b"], FrozenDict)
+    (True, True)
+    >>> hash(fdic) == hash(FrozenDict(fdic))
+    True
+    >>> fdic["a"] = 2  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    TypeError: 'FrozenDict' object is immutable
+    """
+    __slots__ = ("_hash", "__weakref__")
+
+    def __init__(self, *args, **kwargs):
+        """
+        :param args: A mapping object or an iterable yields (key, value)
+        :param kwargs: Items to set
+        """
+        dict.__init__(self, *args, **kwargs)
+        for key, val in [(k, v) for k, v in dict.items(self)
+                         if not isinstance(v, _FROZEN_TYPES)]:
+            dict.__setitem__(self, key, freeze(val))
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(frozenset(dict.items(self)))
+            return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+
+        if isinstance(other, FrozenDict) and \
+                getattr(self, "_hash", None) is not None and \
+                getattr(other, "_hash", None) is not None and \
+                self._hash != other._hash:
+            return False  # Short-circuit as both hashes were computed.
+
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, dict.__repr__(self))
+
+    def __reduce__(self):
+        return (type(self), (dict(self), ))
+
+    def copy(self):
+        """Frozen objects are never changed so that it's not copied."""
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = \
+        update = __ior__ = _immutable
+
+
+# Types of values never need to be frozen again.
+_FROZEN_TYPES = _SCALAR_TYPES + (FrozenDict, FrozenList)
+
+
+def is_frozen(obj):
+    """
+    :param obj: Any object
+    :return: True if `obj` is frozen mapping or sequence object
+
+    >>> is_frozen(FrozenDict()), is_frozen(FrozenList()), is_frozen({})
+    (True, True, False)
+    """
+    return isinstance(obj, (FrozenDict, FrozenList))
+
+
+def freeze(obj):
+    """
+    Freeze mapping and sequence objects in `obj` recursively. Frozen objects
+    are returned as they are.
+
+    :param obj: Any object
+    :return: :class:`FrozenDict`, :class:`FrozenList` or `obj` itself
+
+    >>> freeze(dict(a=[1, dict(b=2)]))
+    FrozenDict({'a': FrozenList([1, FrozenDict({'b': 2})])})
+    >>> freeze(1)
+    1
+    """
+    if isinstance(obj, _FROZEN_TYPES):
+        return obj
+
+    if isinstance(obj, list):  # Fast path for the most common case.
+        return FrozenList(obj)
+
+    if anyconfig.utils.is_dict_like(obj):
+        return FrozenDict(obj)
+
+    if anyconfig.utils.is_list_like(obj):
+        return FrozenList(obj)
+
+    return obj
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,303 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""Flat index of the paths of objects in nested dicts.
+
+An index made with :func:`build` maps the paths of all objects in a config,
+tuples of keys such as ('a', 'b', 'c'), to their parent containers and keys
+in a single traversal, so that objects are looked up with their paths in
+constant time regardless of their depth. Items of lists have the string of
+their indexes as keys in paths like JSON Pointer, e.g. ('a', '0').
+
+The index is kept up to date if the config is updated with
+:meth:`PathIndex.set`, but not if it's modified directly.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import anyconfig.compat
+import anyconfig.dicts
+import anyconfig.utils
+
+
+# Max number of path expressions parsed to memoize in each index.
+MEMO_SIZE = 1024
+
+
+def _is_container(obj):
+    """
+    >>> _is_container({}), _is_container([]), _is_container("abc")
+    (True, True, False)
+    """
+    return anyconfig.utils.is_dict_like(obj) or isinstance(obj, list)
+
+
+def _iter_children(obj):
+    """
+    :param obj: a dict[-like] object or a list
+    :return: Generator yields a tuple of (key in paths, key of `obj`)
+    """
+    if anyconfig.utils.is_dict_like(obj):
+        for key in obj.keys():
+            yield (key, key)
+    else:
+        for idx in range(len(obj)):
+            yield (str(idx), idx)
+
+
+def _iter_entries(path, obj):
+    """
+    Iterate the entries of all objects under `obj` recursively.
+
+    :param path: A tuple of keys, the path of `obj`
+    :param obj: Any object
+    :return: Generator yields a tuple of (path, parent container, key)
+    """
+    if not _is_container(obj):
+        return
+
+    for key, okey in _iter_children(obj):
+        cpath = path + (key, )
+        yield (cpath, obj, okey)
+        for entry in _iter_entries(cpath, obj[okey]):
+            yield entry
+
+
+def _escape(key):
+    """
+    Escape `key` in JSON Pointer expression.
+
+    >>> _escape("a/b~c")
+    'a~1b~0c'
+    """
+    if not isinstance(key, anyconfig.compat.STR_TYPES):
+        key = str(key)
+
+    return key.replace('~', '~0').replace('/', '~1')
+
+
+def to_json_pointer(path):
+    """
+    :param path: A tuple of keys
+    :return: JSON Pointer expression of `path`
+
+    >>> to_json_pointer(("a", "b/c", "0"))
+    '/a/b~1c/0'
+    >>> to_json_pointer(())
+    ''
+    """
+    return ''.join('/' + _escape(key) for key in path)
+
+
+class PathIndex(object):
+    """
+    Flat index maps the paths of objects in a config to their parent
+    containers and keys.
+
+    >>> idx = PathIndex(dict(a=dict(b=[1, dict(c=2)])))
+    >>> idx.get("a.b.1.c"), idx.get(("a", "b", "0"))
+    ((2, ''), (1, ''))
+    >>> sorted(idx.iter_paths("a.b"))
+    [('a', 'b', '0'), ('a', 'b', '1'), ('a', 'b', '1', 'c')]
+    >>> idx.set("a.b.1.d", 3)
+    >>> idx.get("/a/b/1/d")
+    (3, '')
+    """
+    def __init__(self, cnf):
+        """
+        :param cnf: a dict[-like] object to index
+        """
+        self.cnf = cnf
+        self._index = dict()  # {path: (parent, key)}
+        self._memo = dict()  # {path expression: path}
+        self._add(tuple(), cnf)
+
+    def __repr__(self):
+        return "<%s: %d paths>" % (self.__class__.__name__, len(self))
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __contains__(self, path):
+        return self.exists(path)
+
+    def _keys(self, path, seps=anyconfig.dicts.PATH_SEPS):
+        """
+        :param path: Path expression or a tuple of keys
+        :return: A tuple of keys
+        """
+        if isinstance(path, tuple):
+            return path
+
+        if seps is not anyconfig.dicts.PATH_SEPS:
+            return anyconfig.dicts.compile_path(path, seps=seps).keys
+
+        try:
+            return self._memo[path]
+        except KeyError:
+            pass
+
+        keys = anyconfig.dicts.compile_path(path).keys
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[path] = keys
+        return keys
+
+    def _add(self, path, obj):
+        """Add the entries of `obj` at `path` and objects under it."""
+        self._index.update((cpath, (prnt, key)) for cpath, prnt, key
+                           in _iter_entries(path, obj))
+
+    def _remove(self, path, obj):
+        """Remove the entries of objects under `obj` at `path`."""
+        for cpath, _prnt, _key in _iter_entries(path, obj):
+            self._index.pop(cpath, None)
+
+    def _lookup(self, keys):
+        """
+        :param keys: A tuple of keys
+        :return: The object pointed by `keys`
+        :raises: KeyError, IndexError or TypeError if it was not found
+        """
+        if not keys:
+            return self.cnf
+
+        (prnt, key) = self._index[keys]
+        return prnt[key]
+
+    def get(self, path, seps=anyconfig.dicts.PATH_SEPS):
+        """
+        :param path: Path expression or a tuple of keys
+        :param seps: Separator char candidates
+        :return:
+            A tuple of (result_object, error_message) like
+            :func:`anyconfig.dicts.get`
+        """
+        keys = self._keys(path, seps)
+        try:
+            (prnt, key) = self._index[keys]
+            return (prnt[key], '')
+        except KeyError:
+            if not keys:
+                return (self.cnf, '')
+        except (IndexError, TypeError):
+            pass
+
+        return (None, "Not found: %s" % to_json_pointer(keys))
+
+    def exists(self, path, seps=anyconfig.dicts.PATH_SEPS):
+        """
+        :param path: Path expression or a tuple of keys
+        :param seps: Separator char candidates
+        :return: True if the object pointed by `path` exists
+        """
+        keys = self._keys(path, seps)
+        return not keys or keys in self._index
+
+    def _top_of_changes(self, keys):
+        """
+        :param keys: A tuple of keys of the path to set the value
+        :return:
+            A tuple of (path, existing object or None), the path of the
+            topmost object may be changed or added when the value is set
+        """
+        obj = self.cnf
+        for pos in range(len(keys)):
+            if isinstance(obj, list):
+                return (keys[:pos], obj)  # Items may be appended or moved.
+
+            path = keys[:pos + 1]
+            try:
+                obj = self._lookup(path)
+            except (KeyError, IndexError, TypeError):
+                return (path, None)
+
+            if not _is_container(obj):
+                return (path, obj)
+
+        return (keys, obj)
+
+    def set(self, path, val, seps=anyconfig.dicts.PATH_SEPS):
+        """
+        Set `val` to the object pointed by `path` in the config with
+        :func:`anyconfig.dicts.set_` and update the index incrementally.
+
+        :param path: Path expression or a tuple of keys
+        :param val: Value to set
+        :param seps: Separator char candidates
+        """
+        (top, obj) = self._top_of_changes(self._keys(path, seps))
+        self._remove(top, obj)
+        if top:
+            self._index.pop(top, None)
+
+        try:
+            anyconfig.dicts.compile_path(path, seps=seps).set(self.cnf, val)
+        finally:  # Index objects under `top` again even if it failed.
+            if not top:
+                self._add(top, self.cnf)
+            else:
+                prnt = self._lookup(top[:-1])
+                if top[-1] in prnt:
+                    self._index[top] = (prnt, top[-1])
+                    self._add(top, prnt[top[-1]])
+
+    def iter_paths(self, prefix=(), seps=anyconfig.dicts.PATH_SEPS):
+        """
+        :param prefix: Path expression or a tuple of keys of a subtree
+        :param seps: Separator char candidates
+        :return: Generator yields the paths of all objects under `prefix`
+        :raises: KeyError if `prefix` was not found
+        """
+        keys = self._keys(prefix, seps)
+        try:
+            obj = self._lookup(keys)
+        except (IndexError, TypeError):
+            raise KeyError(prefix)
+
+        for path, _prnt, _key in _iter_entries(keys, obj):
+            yield path
+
+    def flatten(self, prefix=(), seps=anyconfig.dicts.PATH_SEPS):
+        """
+        :param prefix: Path expression or a tuple of keys of a subtree
+        :param seps: Separator char candidates
+        :return:
+            A mapping object of {JSON Pointer path: value} of all objects
+            other than containers under `prefix`
+        :raises: KeyError if `prefix` was not found
+
+        >>> PathIndex(dict(a=dict(b=[1, 2]), c=3)).flatten("a")
+        OrderedDict([('/a/b/0', 1), ('/a/b/1', 2)])
+        """
+        ret = anyconfig.compat.OrderedDict()
+        for path in self.iter_paths(prefix, seps=seps):
+            obj = self._lookup(path)
+            if not _is_container(obj) or not obj:
+                ret[to_json_pointer(path)] = obj
+
+        return ret
+
+
+def build(cnf):
+    """
+    Make the flat index of the paths of all objects in `cnf` in a single
+    traversal.
+
+    :param cnf: a dict[-like] object to index
+    :return: :class:`PathIndex` object
+
+    >>> idx = build({"a": {"b": {"c": {"d": 1}}}})
+    >>> idx.get("a.b.c.d")
+    (1, '')
+    >>> len(idx)
+    4
+    """
+    return PathIndex(cnf)
+
+# vim:sw=4:ts=4:et:
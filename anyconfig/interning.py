@@ -0,0 +1,216 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""Interning of keys and deduplication of values in configs.
+
+Configs of many tenants or hosts repeat the same keys and many of the same
+short string values, and each of them are allocated for every config loaded
+without interning. Containers made with :func:`make_container` intern keys and
+short string values of mapping objects as these are made from (key, value)
+pairs, so that backends make mapping objects from pairs, e.g. JSON and YAML,
+share them while loading.
+
+In the 'subtrees' mode, structurally identical mapping objects, of which keys
+and values are equal and of the same types, are also shared through a table
+of weak references, so that it requires the mapping objects are immutable,
+:class:`anyconfig.frozen.FrozenDict`.
+
+- Strings are interned with :func:`sys.intern` and freed when these are not
+  referenced any more. Unicode strings are not interned in python 2.
+- Lists in mapping objects are processed in place but lists are not shared.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import sys
+import weakref
+
+import anyconfig.compat
+import anyconfig.dicts
+import anyconfig.frozen
+import anyconfig.utils
+
+
+# Max length of string values to deduplicate. Longer values are rarely the
+# same and interning them costs more than the memory saved.
+MAX_VALUE_LEN = 64
+
+SUBTREES = "subtrees"
+
+# {hash: mapping object}, mapping objects are freed if not referenced.
+_SUBTREES = weakref.WeakValueDictionary()
+_CONTAINERS = dict()  # {(container, subtrees): function to make mappings}
+_MISSING = object()
+_SCALAR_TYPES = frozenset(anyconfig.compat.STR_TYPES +
+                          (bool, int, float, type(None)))
+
+try:
+    _intern = sys.intern
+except AttributeError:  # python 2
+    _intern = intern  # noqa: F821, pylint: disable=undefined-variable
+
+
+def intern_key(key):
+    """
+    :param key: Key of a mapping object
+    :return: The interned string equal to `key` or `key` itself
+
+    >>> intern_key("".join(["a", "b"])) is intern_key("ab")
+    True
+    """
+    if type(key) is str:  # Sub classes and unicode in py2 cannot be interned.
+        return _intern(key)
+
+    return key
+
+
+def intern_value(val):
+    """
+    :param val: Value of a mapping object
+    :return:
+        The interned string equal to `val` if it's short string, or `val`
+        itself. Lists are processed in place recursively.
+
+    >>> intern_value("".join(["a", "b"])) is intern_value("ab")
+    True
+    >>> intern_value(["".join(["a", "b"])])[0] is intern_value("ab")
+    True
+    """
+    if type(val) is str:
+        return _intern(val) if len(val) <= MAX_VALUE_LEN else val
+
+    if type(val) is list:
+        val[:] = [intern_value(item) for item in val]
+
+    return val
+
+
+def _same(obj, other):
+    """
+    Compare objects strictly, including the types of keys and values, e.g.
+    True, 1 and 1.0 are not the same although these are equal.
+
+    :param obj: Mapping object, list or any other object
+    :param other: Any object to compare with `obj`
+    :return: True if `obj` and `other` are equal and of the same types
+
+    >>> _same(dict(a=[1, dict(b=True)]), dict(a=[1, dict(b=True)]))
+    True
+    >>> _same(dict(a=[1, dict(b=True)]), dict(a=[1, dict(b=1)]))
+    False
+    >>> _same({1: 'a'}, {1.0: 'a'}), _same([1], (1, ))
+    (False, False)
+    """
+    if obj is other:
+        return True
+
+    otype = type(obj)
+    if otype is not type(other):
+        return False
+
+    if otype in _SCALAR_TYPES:
+        return obj == other
+
+    if isinstance(obj, dict) or anyconfig.utils.is_dict_like(obj):
+        if len(obj) != len(other):
+            return False
+        for key, val in obj.items():
+            oval = other.get(key, _MISSING)
+            if oval is not val and not _same(val, oval):
+                return False
+        if all(type(key) is str for key in obj):
+            return True  # Keys of `other` equal to them must be str also.
+        keys = dict((key, key) for key in other)  # To get keys in `other`.
+        return all(type(keys[key]) is type(key) for key in obj)
+
+    if isinstance(obj, (list, tuple)):
+        return len(obj) == len(other) and \
+            all(_same(x, y) for x, y in zip(obj, other))
+
+    return obj == other
+
+
+def _share(obj):
+    """
+    :param obj: :class:`anyconfig.frozen.FrozenDict` object
+    :return: The mapping object same as `obj` made already or `obj`
+    """
+    try:
+        key = hash(obj)
+    except TypeError:  # It has unhashable values.
+        return obj
+
+    # True, 1 and 1.0 are equal and have the same hash but these must not be
+    # shared, so the types of values are taken into account also. Others are
+    # compared strictly with :func:`_same` later.
+    key = hash((key, frozenset(map(type, obj.values()))))
+    other = _SUBTREES.get(key)
+    if other is not None and _same(obj, other):
+        return other
+
+    _SUBTREES[key] = obj  # Or replace one of which hash collides.
+    return obj
+
+
+def make_container(container=dict, subtrees=False):
+    """
+    Make a function to make mapping objects with interned keys and values from
+    (key, value) pairs, made only once for each pair of arguments.
+
+    :param container: Callable to make mapping objects from (key, value) pairs
+    :param subtrees:
+        Share structurally identical mapping objects if True. Mapping objects
+        are made with :class:`anyconfig.frozen.FrozenDict` in this mode.
+    :return: Function to make mapping objects
+
+    >>> make = make_container(subtrees=True)
+    >>> make([("a", dict(b=1))]) is make(dict(a=dict(b=1)))
+    True
+    """
+    if subtrees:
+        container = anyconfig.frozen.FrozenDict
+
+    key = (container, subtrees)
+    try:
+        return _CONTAINERS[key]
+    except KeyError:
+        pass
+
+    def make(*args):
+        """Make a mapping object from (key, value) pairs or mapping object."""
+        if not args:
+            obj = container()
+        else:
+            pairs = args[0]
+            if type(pairs) is not list and \
+                    anyconfig.utils.is_dict_like(pairs):
+                pairs = pairs.items()
+            obj = container([(_intern(k) if type(k) is str else k,
+                              intern_value(v)) for k, v in pairs])
+
+        return _share(obj) if subtrees else obj
+
+    make.__name__ = "interned_" + getattr(container, "__name__", "container")
+    return _CONTAINERS.setdefault(key, make)
+
+
+def intern_tree(obj, container=dict, subtrees=False):
+    """
+    Make a copy of `obj` with interned keys and values.
+
+    :param obj: Mapping object or any other object
+    :param container: Callable to make mapping objects
+    :param subtrees: Share structurally identical mapping objects if True
+    :return: A copy of `obj` or `obj` itself if it's not a container
+
+    >>> cnf = intern_tree([dict(a=1), dict(a=1)], subtrees=True)
+    >>> cnf[0] is cnf[1]
+    True
+    """
+    make = make_container(container, subtrees=subtrees)
+    ret = anyconfig.dicts.convert_to(obj, ac_dict=make)
+    return intern_value(ret) if type(ret) is list else ret
+
+# vim:sw=4:ts=4:et:
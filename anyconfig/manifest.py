@@ -0,0 +1,223 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""Manifests of compiled config snapshots.
+
+A manifest records the source files of a config snapshot made with
+:func:`anyconfig.api.compile`, with their stat data and content hashes, and
+the digest of options used to load them. It is saved as a JSON file next to
+the snapshot, '<snapshot>.manifest', and used to check if the snapshot is
+still fresh cheaply: sources are hashed only if their stat data were changed.
+
+.. note::
+
+   Files included from template config files are not tracked.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import hashlib
+import json
+import logging
+import os
+import os.path
+
+import anyconfig.archive
+import anyconfig.utils
+
+
+LOGGER = logging.getLogger(__name__)
+
+VERSION = 1
+EXTENSION = ".manifest"
+
+# Options do not change the data of snapshots.
+_IGNORED_OPTS = ("ac_snapshot", "ac_query", "ac_dict", "ac_ordered",
+                 "ac_frozen", "ac_intern", "ac_schema_class", "ac_mmap",
+                 "ac_lazy", "ac_marker", "marker")
+
+
+def manifest_path(output):
+    """
+    :param output: Path of snapshot file
+    :return: Path of the manifest file of the snapshot
+
+    >>> manifest_path("/a/b.acsnap")
+    '/a/b.acsnap.manifest'
+    """
+    return output + EXTENSION
+
+
+def list_sources(path_specs, ac_schema=None, ac_marker='*', **_options):
+    r"""
+    :param path_specs:
+        A path or a list of paths or path patterns such as r'/a/b/\*.json' or
+        path specs of archives such as r'/a/b.tar.gz!/c/\*.yml'
+    :param ac_schema: Path of schema file or None
+    :param ac_marker: Glob marker to detect paths patterns
+    :return: A list of paths of source files
+    :raises: ValueError if `path_specs` contains file or file-like objects
+    """
+    specs = [path_specs] if anyconfig.utils.is_path(path_specs) else \
+        list(path_specs)
+    if ac_schema is not None:
+        specs.append(ac_schema)
+
+    sources = []
+    for spec in specs:
+        if not anyconfig.utils.is_path(spec):
+            raise ValueError("Not a path or path pattern: %r" % spec)
+
+        arc = anyconfig.archive.split_path_spec(spec)
+        if arc is not None:
+            spec = arc[0]
+
+        sources.extend(anyconfig.utils.normpath(path) for path
+                       in anyconfig.utils.norm_paths([spec], marker=ac_marker))
+
+    return sources
+
+
+def _stat(path):
+    """
+    :param path: File path
+    :return: A list of [size, mtime in ns] or None if `path` does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return [stat.st_size, getattr(stat, "st_mtime_ns",
+                                  int(stat.st_mtime * 1000000000))]
+
+
+def _hash(path, bufsize=1048576):
+    """
+    :param path: File path
+    :return: SHA-256 hex digest of the content of file `path`
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as inp:
+        for data in iter(lambda: inp.read(bufsize), b''):
+            digest.update(data)
+
+    return digest.hexdigest()
+
+
+def _to_str(obj):
+    """
+    :param obj: Any object cannot be serialized as JSON data
+    :return: A string represents `obj` stable among processes
+    """
+    if not hasattr(obj, "__name__"):
+        obj = type(obj)
+
+    return "%s.%s" % (getattr(obj, "__module__", ''), obj.__name__)
+
+
+def options_digest(**options):
+    """
+    :param options: Keyword options to load source files
+    :return: SHA-256 hex digest of `options` which may change loaded data
+
+    >>> dig = options_digest(ac_merge="replace")
+    >>> dig == options_digest(ac_merge="replace", ac_query="a")
+    True
+    >>> options_digest() == options_digest(ac_merge="replace")
+    False
+    """
+    opts = dict((key, val) for key, val in options.items()
+                if key not in _IGNORED_OPTS)
+    content = json.dumps(opts, sort_keys=True, default=_to_str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def make(path_specs, **options):
+    """
+    Make a manifest of the sources specified by `path_specs`. It should be
+    made before loading them to detect changes made while loading.
+
+    :param path_specs: Paths or path patterns, see :func:`list_sources`
+    :param options: Keyword options to load source files
+    :return: A dict represents the manifest
+    """
+    sources = []
+    for path in list_sources(path_specs, **options):
+        stat = _stat(path)
+        sources.append([path, stat, None if stat is None else _hash(path)])
+
+    return dict(version=VERSION, options=options_digest(**options),
+                sources=sources)
+
+
+def save(manifest, output):
+    """
+    Save the manifest of the snapshot `output` after the snapshot was saved.
+
+    :param manifest: A dict made by :func:`make`
+    :param output: Path of snapshot file
+    """
+    manifest = dict(manifest, snapshot=_stat(output))
+    path = manifest_path(output)
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as out:
+        json.dump(manifest, out)
+
+    getattr(os, "replace", os.rename)(tmp, path)
+
+
+def _is_fresh_source(path, stat, digest):
+    """
+    :param path: Path of source file
+    :param stat: Stat data of the source in the manifest
+    :param digest: Content hash of the source in the manifest
+    :return: True if the source is not changed
+    """
+    cur = _stat(path)
+    if cur == stat:
+        return True
+
+    if cur is None or stat is None or cur[0] != stat[0]:
+        return False
+
+    return _hash(path) == digest  # Only its mtime was changed.
+
+
+def is_fresh(output, path_specs, **options):
+    """
+    Check if the snapshot `output` of the sources specified by `path_specs`
+    is still fresh.
+
+    :param output: Path of snapshot file
+    :param path_specs: Paths or path patterns, see :func:`list_sources`
+    :param options: Keyword options to load source files
+    :return: True if the snapshot and all of its sources are not changed
+    """
+    try:
+        with open(manifest_path(output)) as inp:
+            manifest = json.load(inp)
+    except (IOError, OSError, ValueError):
+        LOGGER.debug("No valid manifest for: %s", output)
+        return False
+
+    if manifest.get("version") != VERSION or \
+            manifest.get("options") != options_digest(**options) or \
+            manifest.get("snapshot") is None or \
+            manifest["snapshot"] != _stat(output):
+        return False
+
+    sources = manifest.get("sources", [])
+    try:
+        paths = list_sources(path_specs, **options)
+    except ValueError:
+        return False
+
+    if paths != [src[0] for src in sources]:
+        return False  # Some sources were added or removed.
+
+    return all(_is_fresh_source(*src) for src in sources)
+
+# vim:sw=4:ts=4:et:
@@ -6,20 +6,192 @@
 """
 from __future__ import absolute_import
 
+import functools
 import re
 
+import anyconfig.compat
+
 
 INT_PATTERN = re.compile(r"^(\d|([1-9]\d+))$")
 BOOL_PATTERN = re.compile(r"^(true|false)$", re.I)
 STR_PATTERN = re.compile(r"^['\"](.*)['\"]$")
 
+# Rules to infer types of values: null (None), bool, int, float and str
+# (quoted strings). Values do not match any rules are kept as strings.
+RULES = ("bool", "int", "str")
+ALL_RULES = ("null", "bool", "int", "float", "str")
+MEMO_SIZE = 1024
+
+_QUOTES = ("'", '"')
+_NUM_HEADS = frozenset("0123456789+-.")
+_NUM_TAILS = frozenset("0123456789.")
+_SIGNS = ("+", "-")
+_BOOLS = dict(true=True, false=False)
+_NULLS = ("null", "none", "~")
 
-def parse_single(str_):
+
+def _infer(null, bool_, int_, float_, quoted, str_):
+    """
+    Infer the type of the value `str_` represents and convert it. The head of
+    `str_` is checked first to select candidates of its type and only these
+    are tried, so that it's processed in mostly one scan without regex.
+
+    Flags to select typing rules come first to bind them with
+    functools.partial.
+
+    :param null: Parse null values, e.g. 'null', 'none' and '~', as None
+    :param bool_: Parse 'true' and 'false' (case insensitive) as bools
+    :param int_: Parse integers, e.g. '123' and '-1', as ints
+    :param float_: Parse floats, e.g. '0.1' and '1e-3', as floats
+    :param quoted: Strip quotes around strings, e.g. '"a string"'
+    :param str_: a string to parse
+
+    :return: None | Bool | Int | Float | String
+    """
+    str_ = str_.strip()
+    if not str_:
+        return ''
+
+    head = str_[0]
+    if head in _NUM_HEADS:
+        if int_:
+            digits = str_[1:] if head in _SIGNS else str_
+            if digits.isdigit() and (digits[0] != '0' or len(digits) == 1):
+                try:
+                    return int(str_)
+                except ValueError:  # e.g. non-ascii digits.
+                    pass
+
+        if float_ and str_[-1] in _NUM_TAILS and '_' not in str_ and \
+                ('.' in str_ or 'e' in str_ or 'E' in str_):
+            try:
+                return float(str_)
+            except ValueError:
+                pass
+
+    elif head in _QUOTES:
+        if quoted and len(str_) > 1 and str_[-1] in _QUOTES:
+            return str_[1:-1]
+
+    elif len(str_) < 6:
+        low = str_.lower()
+        if bool_ and low in _BOOLS:
+            return _BOOLS[low]
+
+        if null and low in _NULLS:
+            return None
+
+    return str_
+
+
+def _to_rules(rules):
+    """
+    :param rules: A name or a list of names of typing rules
+    :return: A tuple of names of typing rules
+    :raises: TypeError if `rules` is neither a string nor a list of strings
+
+    >>> _to_rules("int"), _to_rules(["null", "int"])
+    (('int',), ('null', 'int'))
+    """
+    if isinstance(rules, anyconfig.compat.STR_TYPES):
+        return (rules, )
+
+    try:
+        rules = tuple(rules)
+    except TypeError:
+        rules = None
+
+    if rules is None or not all(isinstance(r, anyconfig.compat.STR_TYPES)
+                                for r in rules):
+        raise TypeError("Typing rules must be a name or a list of names of "
+                        "them but got: %r" % (rules, ))
+    return rules
+
+
+def mk_scalar_parser(rules=RULES, memo_size=MEMO_SIZE):
+    """
+    Make a function to parse strings represent some single values with given
+    typing rules, memoizes results of strings parsed recently.
+
+    :param rules:
+        A name or a list of names of typing rules to apply, some of ALL_RULES,
+        'null', 'bool', 'int', 'float' and 'str'
+    :param memo_size:
+        Max number of results to memoize; the memo is cleared when it becomes
+        full. Results are not memoized at all if it's 0.
+
+    :return: A function takes a string and returns a value parsed
+    :raises:
+        TypeError if `rules` is not a name or a list of names of typing rules,
+        or ValueError if some of them are unknown
+
+    >>> parse = mk_scalar_parser(ALL_RULES)
+    >>> [parse(s) for s in ("1", "-2", "0.1", "false", "null", "'1'", "01")]
+    [1, -2, 0.1, False, None, '1', '01']
+    >>> parse = mk_scalar_parser(["int"])
+    >>> [parse(s) for s in ("1", "0.1", "true")]
+    [1, '0.1', 'true']
+    """
+    rules = _to_rules(rules)
+    unknowns = [r for r in rules if r not in ALL_RULES]
+    if unknowns:
+        raise ValueError("Unknown typing rules: %s" % ', '.join(unknowns))
+
+    infer = functools.partial(_infer, *(r in rules for r in ALL_RULES))
+    if not memo_size:
+        return infer
+
+    memo = dict()
+
+    def parse(str_):
+        """Parse `str_` and memoize the result"""
+        try:
+            return memo[str_]
+        except KeyError:
+            pass
+
+        ret = infer(str_)
+        if len(memo) >= memo_size:
+            memo.clear()
+        memo[str_] = ret
+        return ret
+
+    return parse
+
+
+_PARSERS = {RULES: mk_scalar_parser()}  # {rules: function to parse values}
+
+
+def _get_scalar_parser(rules=None):
+    """
+    :param rules:
+        A name or a list of names of typing rules, or None or any other
+        values, e.g. True and 1, to apply the default rules
+    :return: A memoized function made by :func:`mk_scalar_parser`
+    :raises: TypeError if `rules` is a list contains other than names
+    """
+    if not isinstance(rules, anyconfig.compat.STR_TYPES):
+        try:
+            iter(rules)
+        except TypeError:
+            return _PARSERS[RULES]  # e.g. ac_parse_value=True
+
+    rules = _to_rules(rules)
+    try:
+        return _PARSERS[rules]
+    except KeyError:
+        return _PARSERS.setdefault(rules, mk_scalar_parser(rules))
+
+
+def parse_single(str_, rules=None):
     """
     Very simple parser to parse expressions represent some single values.
 
     :param str_: a string to parse
-    :return: Int | Bool | String
+    :param rules:
+        A list of names of typing rules to apply, see :func:`mk_scalar_parser`
+        or None to apply the default rules, RULES
+    :return: Int | Bool | String, or Float | None also if rules allow them
 
     >>> parse_single(None)
     ''
@@ -29,6 +201,8 @@ def parse_single(str_):
     123
     >>> parse_single("True")
     True
+    >>> parse_single("false")
+    False
     >>> parse_single("a string")
     'a string'
     >>> parse_single('"a string"')
@@ -37,35 +211,29 @@ def parse_single(str_):
     'a string'
     >>> parse_single("0.1")
     '0.1'
+    >>> parse_single("0.1", ALL_RULES)
+    0.1
     >>> parse_single("    a string contains extra whitespaces     ")
     'a string contains extra whitespaces'
-    """
-    if str_ is None:
-        return ''
 
-    str_ = str_.strip()
+    .. versionchanged:: 0.9.5
 
-    if not str_:
+       Parse strings in one scan without regex and memoize results. Add
+       'rules' parameter. Fix parsing 'false' as True.
+    """
+    if str_ is None:
         return ''
 
-    if BOOL_PATTERN.match(str_) is not None:
-        return bool(str_)
-
-    if INT_PATTERN.match(str_) is not None:
-        return int(str_)
-
-    if STR_PATTERN.match(str_) is not None:
-        return str_[1:-1]
-
-    return str_
+    return _get_scalar_parser(rules)(str_)
 
 
-def parse_list(str_, sep=","):
+def parse_list(str_, sep=",", rules=None):
     """
     Simple parser to parse expressions reprensent some list values.
 
     :param str_: a string to parse
     :param sep: Char to separate items of list
+    :param rules: Typing rules, see :func:`parse_single`
     :return: [Int | Bool | String]
 
     >>> parse_list("")
@@ -79,7 +247,8 @@ def parse_list(str_, sep=","):
     >>> parse_list("a,b,")
     ['a', 'b']
     """
-    return [parse_single(x) for x in str_.split(sep) if x]
+    parse = _get_scalar_parser(rules)
+    return [parse(x) for x in str_.split(sep) if x]
 
 
 def attr_val_itr(str_, avs_sep=":", vs_sep=",", as_sep=";"):
@@ -147,13 +316,13 @@ def parse_attrlist(str_, avs_sep=":", vs_sep=",", as_sep=";"):
     return dict(parse_attrlist_0(str_, avs_sep, vs_sep, as_sep))
 
 
-def parse(str_, lsep=",", avsep=":", vssep=",", avssep=";"):
+def parse(str_, lsep=",", avsep=":", vssep=",", avssep=";", rules=None):
     """Generic parser"""
     if avsep in str_:
         return parse_attrlist(str_, avsep, vssep, avssep)
     elif lsep in str_:
-        return parse_list(str_, lsep)
+        return parse_list(str_, lsep, rules=rules)
 
-    return parse_single(str_)
+    return parse_single(str_, rules=rules)
 
 # vim:sw=4:ts=4:et:
@@ -6,19 +6,129 @@ r"""anyconfig.query module to support query data with JMESPath expressions.
 
 Changelog:
 
+.. versionchanged:: 0.9.5
+
+   - Push simple filter expressions on :class:`anyconfig.columnar.Records`
+     down to them, e.g. 'hosts[?port > `1024`].name', evaluated column by
+     column without making the views of rows. Other expressions are evaluated
+     by JMESPath after records are converted back to lists of dicts.
+
 .. versionadded:: 0.8.3
 
    - Added to query config data with JMESPath expression, http://jmespath.org
 """
 from __future__ import absolute_import
+
+import json
+import numbers
+import re
+
 try:
     import jmespath
 except ImportError:
     pass
 
+import anyconfig.arrays
+import anyconfig.columnar
+import anyconfig.utils
 from anyconfig.globals import LOGGER
 
 
+_IDENT = r"[A-Za-z_][A-Za-z0-9_]*"
+_LITERAL = r"`(?:[^`\\]|\\.)*`|'(?:[^'\\]|\\.)*'"
+
+# Expressions can be pushed down to records: [path][?cond && ...][.field]
+_FILTER_RE = re.compile(r"^\s*(?P<path>%s(?:\.%s)*)?\[\?(?P<conds>[^\]]+)\]"
+                        r"(?:\.(?P<field>%s))?\s*$" % (_IDENT, _IDENT, _IDENT))
+_ORDERINGS = ("<", "<=", ">", ">=")
+_COND_RE = re.compile(r"^\s*(?P<key>%s)\s*(?P<op>==|!=|<=|>=|<|>)\s*"
+                      r"(?P<val>%s)\s*$" % (_IDENT, _LITERAL))
+
+
+def _parse_literal(literal):
+    """
+    :param literal: JSON literal in backquotes or raw string in single quotes
+    :return: The value of `literal`
+    :raises: ValueError if `literal` is not valid
+
+    >>> _parse_literal("`1024`"), _parse_literal("'a\\\\'b'")
+    (1024, "a'b")
+    """
+    if literal.startswith('`'):
+        return json.loads(literal[1:-1].replace("\\`", '`'))
+
+    return literal[1:-1].replace("\\'", "'")
+
+
+def _parse_filter(expression):
+    """
+    :param expression: JMESPath expression
+    :return: A tuple of (a list of keys of the path, a list of (key,
+        operator, value) of conditions, key to project or None) if
+        `expression` can be pushed down to records or None
+
+    >>> _parse_filter("a.b[?c >= `1` && d == 'x'].e")
+    (['a', 'b'], [('c', '>=', 1), ('d', '==', 'x')], 'e')
+    >>> _parse_filter("a[?c > d]") is None, _parse_filter("a[?c > 'x']")
+    (True, None)
+    """
+    match = _FILTER_RE.match(expression)
+    if not match:
+        return None
+
+    conds = []
+    for cexp in match.group("conds").split("&&"):
+        cmatch = _COND_RE.match(cexp)
+        if not cmatch:
+            return None
+        try:
+            val = _parse_literal(cmatch.group("val"))
+        except ValueError:
+            return None
+
+        oper = cmatch.group("op")
+        if oper in _ORDERINGS and (isinstance(val, bool) or
+                                   not isinstance(val, numbers.Real)):
+            return None  # Leave orderings of others, e.g. strings, JMESPath.
+        conds.append((cmatch.group("key"), oper, val))
+
+    path = match.group("path")
+    return (path.split('.') if path else [], conds, match.group("field"))
+
+
+def _pushdown(data, expression):
+    """
+    Evaluate `expression` on records in `data` if possible.
+
+    :param data: Target object to query
+    :param expression: JMESPath expression
+    :return: A tuple of (True, result) if `expression` was pushed down to
+        records or (False, None)
+    """
+    parsed = _parse_filter(expression)
+    if parsed is None:
+        return (False, None)
+
+    (keys, conds, field) = parsed
+    for key in keys:
+        if not anyconfig.utils.is_dict_like(data) or key not in data:
+            return (False, None)
+        data = data[key]
+
+    if not anyconfig.columnar.is_records(data):
+        return (False, None)
+
+    indices = data.indices(*conds)
+    if field is None:
+        return (True, data.take(indices))
+
+    if field not in data.fields:
+        return (True, [])
+
+    vals = anyconfig.arrays.to_list(data.column(field, indices))
+    return (True, [val for val in vals if val is not None])
+
+
 def query(data, **options):
     """
     Filter data with given JMESPath expression.
@@ -36,9 +146,13 @@ def query(data, **options):
     if expression is None or not expression:
         return data
 
+    (pushed, ret) = _pushdown(data, expression)
+    if pushed:
+        return ret
+
     try:
         pexp = jmespath.compile(expression)
-        return pexp.search(data)
+        return pexp.search(anyconfig.columnar.to_plain(data))
     except ValueError as exc:  # jmespath.exceptions.*Error inherit from it.
         LOGGER.warning("Failed to compile or search: exp=%s, exc=%r",
                        expression, exc)
@@ -4,6 +4,11 @@
 #
 """anyconfig.schema module.
 
+.. versionchanged:: 0.9.5
+   :func:`gen_schema` generates schema of array objects made with 'ac_array'
+   option and records made with 'ac_columnar' option, and :func:`validate`
+   validates configs have records
+
 .. versionchanged:: 0.9.4
    Change parameter passed to :func:`validate`, s/.*safe/ac_schema_safe/g
 
@@ -26,6 +31,8 @@ try:
 except ImportError:
     pass
 
+import anyconfig.arrays
+import anyconfig.columnar
 import anyconfig.compat
 import anyconfig.utils
 
@@ -114,6 +121,7 @@ def validate(data, schema, ac_schema_safe=True, ac_schema_errors=False,
     :return: (True if validation succeeded else False, error message[s])
     """
     options = anyconfig.utils.filter_options(("cls", ), options)
+    data = anyconfig.columnar.to_plain(data)  # jsonschema needs lists.
     if ac_schema_errors:
         return _validate_all(data, schema, **options)
 
@@ -203,6 +211,12 @@ def gen_schema(data, **options):
     elif isinstance(data, dict):
         scm = object_to_schema(data, **options)
 
+    elif anyconfig.arrays.is_array(data):
+        scm = array_to_schema(anyconfig.arrays.to_list(data), **options)
+
+    elif anyconfig.columnar.is_records(data):
+        scm = array_to_schema(data.to_list(), **options)
+
     elif _type in (list, tuple) or hasattr(data, "__iter__"):
         scm = array_to_schema(data, **options)
 
@@ -0,0 +1,349 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+r"""Typed config classes made from JSON schema.
+
+:func:`make_class` makes a class with `__slots__` for the properties of an
+object node of JSON schema, and classes for its object properties and items of
+arrays recursively. Instances of these classes keep the values in slots
+instead of hash tables of dicts, so that they need much less memory than dicts
+if there are very many of them, e.g. configs of tenants.
+
+Classes are made only once for each schema and cached.
+
+- Instances are mapping objects, so that these can be dumped, merged and
+  queried as dicts. Values of properties kept in slots can be changed as
+  attributes but items cannot be set or deleted with [] operator.
+- Properties of which names are not valid identifiers, start with '_' or are
+  the names of the methods of mapping objects such as 'items' are kept in a
+  dict made only for the instances have them, and accessed only with []
+  operator.
+- Properties not found in configs are not set unless the schema gives their
+  default values. Default values are copied for each instance.
+- '$ref', 'allOf', 'anyOf' and 'oneOf' in the schema are not processed and
+  the values of such properties are kept as they are.
+
+.. versionadded:: 0.9.5
+"""
+from __future__ import absolute_import
+
+import copy
+import keyword
+import re
+
+import anyconfig.compat
+import anyconfig.frozen
+import anyconfig.utils
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+# Max number of classes to cache.
+MEMO_SIZE = 1024
+
+_MEMO = dict()  # {(frozen schema, name): class}
+_IDENT_RE = re.compile(r"^[A-Za-z]\w*$")
+_SCALAR_TYPES = frozenset(anyconfig.compat.STR_TYPES +
+                          (bool, int, float, type(None)))
+
+
+def _is_attr_name(key):
+    """
+    :param key: Property name
+    :return: True if `key` can be the name of slot
+
+    >>> _is_attr_name("a_b"), _is_attr_name("a-b"), _is_attr_name("_a")
+    (True, False, False)
+    >>> _is_attr_name("class"), _is_attr_name(1), _is_attr_name("items")
+    (False, False, False)
+    """
+    return isinstance(key, anyconfig.compat.STR_TYPES) and \
+        _IDENT_RE.match(key) is not None and not keyword.iskeyword(key) and \
+        not hasattr(TypedConfig, key)
+
+
+def _class_name(key):
+    """
+    :param key: Property name
+    :return: CamelCase name of the class made for `key`
+
+    >>> _class_name("a_b-c")
+    'ABC'
+    """
+    return ''.join(part[:1].upper() + part[1:] for part
+                   in re.split(r"[\W_]+", str(key)) if part) or "Object"
+
+
+def _is_object_schema(schema):
+    """
+    :param schema: Schema of a node
+    :return: True if `schema` is of an object has some properties
+    """
+    return anyconfig.utils.is_dict_like(schema) and \
+        schema.get("type", "object") == "object" and \
+        bool(schema.get("properties"))
+
+
+def _to_instance(cls):
+    """
+    :param cls: Class made by :func:`make_class`
+    :return: Function to convert mapping objects to instances of `cls`
+    """
+    def convert(val):
+        """Convert `val` to an instance of `cls` if it's a mapping object."""
+        if anyconfig.utils.is_dict_like(val) and not isinstance(val, cls):
+            return cls(val)
+        return val
+
+    return convert
+
+
+def _to_instances(cls):
+    """
+    :param cls: Class made by :func:`make_class`
+    :return: Function to convert mapping objects in lists to `cls` instances
+    """
+    convert = _to_instance(cls)
+
+    def convert_items(val):
+        """Convert items of `val` if it's a list."""
+        if anyconfig.utils.is_list_like(val):
+            return [convert(item) for item in val]
+        return val
+
+    return convert_items
+
+
+def _to_plain(val):
+    """
+    :param val: Value of a property
+    :return: `val` converted to plain mapping objects and lists
+    """
+    if isinstance(val, TypedConfig):
+        return val._asdict()  # pylint: disable=protected-access
+
+    if isinstance(val, list):
+        return [_to_plain(item) for item in val]
+
+    return val
+
+
+_MISSING = object()
+
+# Mapping does not have __slots__ and instances of its subclasses have
+# __dict__ in python 2, so that its methods are added later instead.
+_BASE = Mapping if anyconfig.compat.IS_PYTHON_3 else object
+
+
+class TypedConfig(_BASE):
+    """
+    Base class of the classes made by :func:`make_class`.
+
+    Instances are made from mapping objects or keyword arguments like dicts,
+    and values of properties are accessed as attributes or with [] operator.
+    """
+    __slots__ = ("_extra", )
+
+    _fields = ()  # Names of properties kept in slots
+    _defaults = {}  # {name: default value}
+    _converters = {}  # {name: function to convert the value}
+
+    def __init__(self, *args, **kwargs):
+        """
+        :param args: A mapping object or an iterable yields (key, value)
+        :param kwargs: Properties to set
+        """
+        dic = dict(*args, **kwargs)
+        for name in self._fields:
+            val = dic.pop(name, _MISSING)
+            if val is _MISSING:
+                val = self._defaults.get(name, _MISSING)
+                if val is _MISSING:
+                    continue
+                if type(val) not in _SCALAR_TYPES:
+                    val = copy.deepcopy(val)  # Not to share mutable ones.
+
+            conv = self._converters.get(name)
+            setattr(self, name, val if conv is None else conv(val))
+
+        self._extra = dic or None
+
+    def __getattr__(self, name):
+        # Called only if the slot `name` was not set.
+        if name != "_extra" and self._extra and name in self._extra:
+            return self._extra[name]
+
+        raise AttributeError("'%s' object has no attribute '%s'" %
+                             (type(self).__name__, name))
+
+    def _items(self):
+        """
+        :return: Generator yields (name, value) of properties set
+        """
+        for name in self._fields:
+            val = getattr(self, name, _MISSING)
+            if val is not _MISSING:
+                yield (name, val)
+
+        if self._extra:
+            for item in self._extra.items():
+                yield item
+
+    def _asdict(self):
+        """
+        :return: A dict of properties, converted to dicts recursively
+        """
+        return dict((key, _to_plain(val)) for key, val in self._items())
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            val = getattr(self, key, _MISSING)
+            if val is not _MISSING:
+                return val
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self):
+        return (key for key, _val in self._items())
+
+    def __len__(self):
+        return sum(1 for _key in self)
+
+    def __eq__(self, other):
+        if isinstance(other, TypedConfig):
+            return type(self) is type(other) and \
+                self._asdict() == other._asdict()
+
+        if anyconfig.utils.is_dict_like(other):
+            return self._asdict() == _to_plain(dict(other))
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        ret = self.__eq__(other)
+        return ret if ret is NotImplemented else not ret
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self._asdict())
+
+
+if not anyconfig.compat.IS_PYTHON_3:
+    for _name in ("get", "keys", "items", "values", "iterkeys", "iteritems",
+                  "itervalues"):
+        setattr(TypedConfig, _name, Mapping.__dict__[_name])
+    Mapping.register(TypedConfig)
+
+
+def _make_class(schema, name):
+    """
+    :param schema: Schema of an object node
+    :param name: Class name
+    :return: A sub class of :class:`TypedConfig`
+    """
+    props = schema.get("properties") or {}
+    fields = tuple(key for key in props if _is_attr_name(key))
+    defaults = {}
+    converters = {}
+
+    for key in fields:
+        scm = props[key]
+        if not anyconfig.utils.is_dict_like(scm):
+            continue
+
+        if "default" in scm:
+            defaults[key] = scm["default"]
+
+        if _is_object_schema(scm):
+            converters[key] = _to_instance(make_class(scm, _class_name(key)))
+        elif scm.get("type") == "array" and \
+                _is_object_schema(scm.get("items")):
+            cls = make_class(scm["items"], _class_name(key) + "Item")
+            converters[key] = _to_instances(cls)
+
+    return type(str(name), (TypedConfig, ),
+                dict(__slots__=fields, _fields=fields, _defaults=defaults,
+                     _converters=converters))
+
+
+def make_class(schema, name=None):
+    """
+    Make a class with `__slots__` for the properties of the object node of
+    JSON schema `schema`, made only once for each schema and cached.
+
+    :param schema: JSON schema object of an object node
+    :param name: Class name or None to use 'title' in `schema` or 'Config'
+    :return: A sub class of :class:`TypedConfig`
+    :raises: ValueError if `schema` is not of an object has some properties
+
+    >>> scm = {"type": "object",
+    ...        "properties": {"name": {"type": "string"},
+    ...                       "db": {"type": "object",
+    ...                              "properties": {
+    ...                                  "port": {"type": "integer",
+    ...                                           "default": 5432}}}}}
+    >>> cls = make_class(scm)
+    >>> cnf = cls(name="a", db={})
+    >>> cnf.name, cnf.db.port, type(cnf.db).__name__
+    ('a', 5432, 'Db')
+    >>> make_class(scm) is cls
+    True
+    """
+    if not _is_object_schema(schema):
+        raise ValueError("Not a schema of an object has properties: %r" %
+                         (schema, ))
+
+    if name is None:
+        name = _class_name(schema.get("title") or "Config")
+
+    key = (anyconfig.frozen.freeze(schema), name)
+    try:
+        return _MEMO[key]
+    except KeyError:
+        pass
+
+    cls = _make_class(schema, name)
+    if len(_MEMO) >= MEMO_SIZE:
+        _MEMO.clear()
+    _MEMO[key] = cls
+
+    return cls
+
+
+def to_typed(cnf, schema_class):
+    """
+    Convert a config to an instance of the class made from JSON schema.
+
+    :param cnf: Mapping object represents configuration data
+    :param schema_class:
+        Class made by :func:`make_class` or JSON schema object to make it
+    :return: An instance of the class or `cnf` as it is if it's not a mapping
+        object, e.g. None returned when validation failed
+
+    >>> scm = {"properties": {"a": {"type": "integer"}}}
+    >>> to_typed({"a": 1, "b-c": 2}, scm)
+    Config({'a': 1, 'b-c': 2})
+    """
+    if not anyconfig.utils.is_dict_like(cnf):
+        return cnf
+
+    if not isinstance(schema_class, type):
+        schema_class = make_class(schema_class)
+
+    return schema_class(cnf)
+
+# vim:sw=4:ts=4:et:
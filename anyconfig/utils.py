@@ -8,6 +8,7 @@ from __future__ import absolute_import
 
 import collections
 import glob
+import mmap
 import os.path
 import types
 
@@ -30,6 +31,48 @@ def get_file_extension(file_path):
     return ""
 
 
+# {file extension: name of the module to (de)compress files}
+COMPRESSIONS = dict(gz="gzip", bz2="bz2", xz="lzma")
+
+
+def get_compression(file_path):
+    """
+    :param file_path: File path
+    :return:
+        Extension of compressed file, one of the keys of COMPRESSIONS, or None
+        if `file_path` is not the path of compressed files
+
+    >>> get_compression("/a/b.json.gz")
+    'gz'
+    >>> get_compression("/a/b.yml.xz")
+    'xz'
+    >>> get_compression("/a/b.json") is None
+    True
+    """
+    ext = get_file_extension(file_path)
+    return ext if ext in COMPRESSIONS else None
+
+
+def get_file_type_extension(file_path):
+    """
+    Get the extension of file to detect its type, which is not the extension
+    of compressed files but the extension before it.
+
+    :param file_path: File path
+
+    >>> get_file_type_extension("/a/b.json")
+    'json'
+    >>> get_file_type_extension("/a/b.json.gz")
+    'json'
+    >>> get_file_type_extension("/a/b.gz")
+    ''
+    """
+    if get_compression(file_path) is not None:
+        file_path = os.path.splitext(file_path)[0]
+
+    return get_file_extension(file_path)
+
+
 def sglob(files_pattern):
     """
     glob.glob alternative of which results sorted always.
@@ -105,6 +148,67 @@ def is_path(path_or_stream):
     return isinstance(path_or_stream, anyconfig.compat.STR_TYPES)
 
 
+# Bytes-like objects provide buffers; bytes is str in python 2.
+BUFFER_TYPES = (bytearray, memoryview, mmap.mmap)
+if anyconfig.compat.IS_PYTHON_3:
+    BUFFER_TYPES += (bytes, )
+
+
+def is_buffer(obj):
+    """
+    Is given object `obj` a bytes-like object provides a buffer, e.g. bytes,
+    bytearray, memoryview and mmap?
+
+    :param obj: Any object
+    :return: True if `obj` is a bytes-like object
+
+    >>> is_buffer(bytearray(b"a: 1"))
+    True
+    >>> is_buffer(memoryview(b"a: 1"))
+    True
+    >>> is_buffer(u"a: 1")
+    False
+    """
+    return isinstance(obj, BUFFER_TYPES)
+
+
+def bytes_from_buffer(buf):
+    """
+    Make bytes from a bytes-like object `buf`. Data of `buf` is copied unlike
+    :func:`decode_buffer`.
+
+    :param buf: A bytes-like object, see :func:`is_buffer`
+    :return: Bytes (str in python 2) of the content of `buf`
+
+    >>> bytes_from_buffer(memoryview(b"a: 1")) == b"a: 1"
+    True
+    """
+    if isinstance(buf, memoryview):
+        return buf.tobytes()  # bytes(buf) is its repr in python 2.
+    if isinstance(buf, mmap.mmap):
+        return buf[:]  # Same as the above.
+
+    return bytes(buf)
+
+
+def decode_buffer(buf, encoding="utf-8"):
+    """
+    Decode a bytes-like object `buf` to a string directly without making any
+    intermediate copies of it.
+
+    :param buf: A bytes-like object, see :func:`is_buffer`
+    :param encoding: Encoding of the content of `buf`
+    :return: A (unicode) string
+
+    >>> decode_buffer(memoryview(b"a: 1")) == u"a: 1"
+    True
+    """
+    if anyconfig.compat.IS_PYTHON_3:
+        return str(buf, encoding)
+
+    return bytes_from_buffer(buf).decode(encoding)
+
+
 def get_path_from_stream(maybe_stream):
     """
     Try to get file path from given stream `stream`.
@@ -140,7 +244,7 @@ def _try_to_get_extension(path_or_strm):
     if path is None:
         return None
 
-    return get_file_extension(path) or None
+    return get_file_type_extension(path) or None
 
 
 def are_same_file_types(paths):
@@ -0,0 +1,14 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Micro benchmarks of anyconfig backends and APIs.
+
+Each module in this package is a script to run a set of benchmarks, and it
+should be run from the top dir of the source tree like this::
+
+  $ python -m bench.yaml_backend
+
+They are not run as test cases because it takes some time to finish them and
+results depend on the environment heavily.
+"""
@@ -0,0 +1,64 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of memory saved by storing large numeric lists as arrays.
+
+Load a JSON config has large lists of ints and floats, e.g. lookup tables and
+weights of models, with and without 'ac_array' option, and compare the memory
+kept and allocated at the peak measured with tracemalloc and the time to load
+it::
+
+  $ python -m bench.arrays
+"""
+from __future__ import absolute_import, print_function
+
+import anyconfig.api
+import anyconfig.arrays as TT
+import bench.common as BC
+
+
+def make_cnf(nitems):
+    """
+    :param nitems: Number of items of each list
+    :return: A dict has large lists of numbers
+    """
+    return dict(name="model", table=[i * 7 for i in range(nitems)],
+                weights=[i / 3.0 for i in range(nitems)],
+                labels=["label-%d" % i for i in range(16)])
+
+
+def main(nitems=1000000):
+    """Entrypoint.
+    """
+    content = anyconfig.api.dumps(make_cnf(nitems), "json")
+
+    def load(**options):
+        """Load the config."""
+        return lambda: anyconfig.api.loads(content, ac_parser="json",
+                                           **options)
+
+    cases = [("lists", {}), ("ac_array='array'", dict(ac_array=TT.ARRAY))]
+    if TT.numpy is not None:
+        cases.append(("ac_array='numpy'", dict(ac_array=TT.NUMPY)))
+
+    for peak, title in ((False, "Memory to keep"),
+                        (True, "Peak memory to load")):
+        results = []
+        for label, opts in cases:
+            (cnf, size) = BC.measure_memory(load(**opts), peak=peak)
+            assert TT.to_list(cnf["table"])[-1] == (nitems - 1) * 7
+            results.append((label, size))
+
+        BC.report_memory("%s the config has lists of %d numbers" %
+                         (title, nitems), results)
+
+    BC.report("Time to load the config has lists of %d numbers" % nitems,
+              [(label, BC.measure(load(**opts), number=3))
+               for label, opts in cases])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,112 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of loading data from bytes-like objects.
+
+Measure the peak memory allocated to load data from mmap objects directly and
+to load data from strings or bytes copied from them, and to load files with
+and without 'ac_mmap' option::
+
+  $ python -m bench.buffers
+"""
+# pylint: disable=protected-access
+from __future__ import absolute_import, print_function
+
+import contextlib
+import mmap
+import os
+
+import anyconfig.backend.json
+import anyconfig.backend.pickle
+import anyconfig.backend.properties
+import anyconfig.backend.xml
+import bench.common as BC
+
+from io import BytesIO
+
+
+def make_cnf(nitems=20000):
+    """
+    :param nitems: Number of items in the config
+    :return: A config object to load and dump
+    """
+    return dict(("key_%d" % i, dict(name="name-%d" % i, value="%d" % i))
+                for i in range(nitems))
+
+
+@contextlib.contextmanager
+def mapped(path):
+    """
+    :param path: File path
+    :return: mmap object maps the file of `path`
+    """
+    with open(path, 'rb') as inp:
+        buf = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buf
+        finally:
+            buf.close()
+
+
+def xml_loads_with_copies(buf):
+    """
+    Load XML data in the old way; copy data to bytes and parse it twice to
+    get namespaces.
+    """
+    XML = anyconfig.backend.xml
+    content = bytes(buf)
+    root = XML.ET.fromstring(content)
+    nspaces = XML._namespaces_from_file(BytesIO(content))
+    return XML.root_to_container(root, container=dict, nspaces=nspaces)
+
+
+def main(nitems=20000):
+    """Entrypoint.
+    """
+    cnf = make_cnf(nitems)
+    json_psr = anyconfig.backend.json.Parser()
+    xml_psr = anyconfig.backend.xml.Parser()
+    pkl_psr = anyconfig.backend.pickle.Parser()
+
+    cases = [("JSON", json_psr,
+              [("copy and decode",
+                lambda b: json_psr.loads(bytes(b).decode("utf-8"))),
+               ("mmap", json_psr.loads),
+               ("mmap w/ orjson",
+                lambda b: json_psr.loads(b, ac_json_engine="orjson"))]),
+             ("XML", xml_psr,
+              [("copy and parse twice", xml_loads_with_copies),
+               ("mmap", xml_psr.loads)]),
+             ("Pickle", pkl_psr,
+              [("copy", lambda b: pkl_psr.loads(bytes(b))),
+               ("mmap", pkl_psr.loads)])]
+
+    for title, psr, loaders in cases:
+        path = BC.workdir_path("buffers." + psr.extensions()[0])
+        psr.dump(cnf, path)
+        with mapped(path) as buf:
+            BC.report_memory("%s loads: %d items, %d bytes" %
+                             (title, nitems, len(buf)),
+                             [(label, BC.measure_memory(lambda: fnc(buf))[1])
+                              for label, fnc in loaders])
+        os.remove(path)
+
+    pcnf = dict(("key.%d" % i, "value %d" % i) for i in range(nitems * 5))
+    for psr, data in ((json_psr, cnf), (xml_psr, cnf), (pkl_psr, cnf),
+                      (anyconfig.backend.properties.Parser(), pcnf)):
+        path = BC.workdir_path("mmap." + psr.extensions()[0])
+        psr.dump(data, path)
+        BC.report_memory("%s load: %d bytes" % (psr.type(),
+                                                os.path.getsize(path)),
+                         [(label, BC.measure_memory(lambda: psr.load(path,
+                                                                     **o))[1])
+                          for label, o in (("read", {}),
+                                           ("ac_mmap", dict(ac_mmap=True)))])
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
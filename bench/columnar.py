@@ -0,0 +1,81 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of memory saved by storing lists of records in columns.
+
+Load a JSON config has the inventory of very many hosts, a list of dicts have
+the same keys, with and without 'ac_columnar' option, and compare the memory
+kept measured with tracemalloc and the time to load and query it::
+
+  $ python -m bench.columnar
+"""
+from __future__ import absolute_import, print_function
+
+import anyconfig.api
+import anyconfig.columnar as TT
+import bench.common as BC
+
+
+QUERY = "hosts[?port >= `9000` && up == `true`].name"
+
+
+def make_cnf(nhosts):
+    """
+    :param nhosts: Number of hosts
+    :return: A dict has the inventory of hosts
+    """
+    return dict(hosts=[dict(name="host-%d" % i, ip="10.%d.%d.%d" %
+                            (i >> 16, (i >> 8) & 255, i & 255),
+                            port=8000 + i % 2000, up=bool(i % 3),
+                            role=["web", "db", "cache"][i % 3])
+                       for i in range(nhosts)])
+
+
+def main(nhosts=100000):
+    """Entrypoint.
+    """
+    content = anyconfig.api.dumps(make_cnf(nhosts), "json")
+
+    def load(**options):
+        """Load the config."""
+        return lambda: anyconfig.api.loads(content, ac_parser="json",
+                                           **options)
+
+    cases = [("dicts", {}), ("ac_columnar=True", dict(ac_columnar=True)),
+             ("ac_columnar=True, ac_array='array'",
+              dict(ac_columnar=True, ac_array="array"))]
+
+    results = []
+    for label, opts in cases:
+        (cnf, size) = BC.measure_memory(load(**opts), peak=False)
+        assert cnf["hosts"][-1]["name"] == "host-%d" % (nhosts - 1)
+        results.append((label, size))
+
+    BC.report_memory("Memory to keep the inventory of %d hosts" % nhosts,
+                     results)
+
+    BC.report("Time to load the inventory of %d hosts" % nhosts,
+              [(label, BC.measure(load(**opts), number=3))
+               for label, opts in cases])
+
+    cnf = load()()
+    recs = load(ac_columnar=True)()
+
+    def filter_dicts():
+        """Filter dicts as JMESPath does."""
+        return [host["name"] for host in cnf["hosts"]
+                if host["port"] >= 9000 and host["up"] is True]
+
+    assert filter_dicts() == anyconfig.api.query(recs, QUERY)
+    BC.report("Time to query %r" % QUERY,
+              [("dicts (list comprehension)", BC.measure(filter_dicts, 10)),
+               ("ac_columnar=True (pushdown)",
+                BC.measure(lambda: anyconfig.api.query(recs, QUERY), 10))])
+    assert TT.is_records(recs["hosts"])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,86 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Common utility routines for benchmarks.
+"""
+from __future__ import absolute_import, print_function
+
+import gc
+import os
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:  # python < 3.4
+    tracemalloc = None
+
+
+def measure(fnc, number=10, repeat=3):
+    """
+    :param fnc: Callable to measure the time to run it
+    :param number: Number of times to call `fnc` in a round
+    :param repeat: Number of rounds
+
+    :return: The best average time in seconds to call `fnc` once
+    """
+    return min(timeit.repeat(fnc, number=number, repeat=repeat)) / number
+
+
+def measure_memory(fnc, peak=True):
+    """
+    :param fnc: Callable to measure the peak memory allocated while running it
+    :param peak:
+        Measure the memory allocated at the peak if True or the memory still
+        allocated after it finished, e.g. kept by the result, if False
+    :return: A tuple of (result of `fnc`, memory allocated in bytes)
+    :raises: RuntimeError if tracemalloc module is not available
+    """
+    if tracemalloc is None:
+        raise RuntimeError("tracemalloc module is required to measure memory")
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        ret = fnc()
+        (cur, peak_) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return (ret, peak_ if peak else cur)
+
+
+def report(title, results, unit="sec", ratio=True):
+    """
+    Print out benchmark results.
+
+    :param title: Title of the benchmark
+    :param results: A list of (label, value), value is time or memory size
+    :param unit: Unit of the values
+    :param ratio: Print ratios to the first value also if True
+    """
+    print("# " + title)
+    base = results[0][1] if results and ratio else None
+    for label, val in results:
+        ratio = (" (x%.2f)" % (base / val)) if base and val else ''
+        print("  %-40s %12.6f %s%s" % (label, val, unit, ratio))
+    print('')
+
+
+def report_memory(title, results):
+    """
+    :param title: Title of the benchmark
+    :param results: A list of (label, peak memory allocated in bytes)
+    """
+    report(title, [(l, v / 1024.0) for l, v in results], unit="KiB")
+
+
+def workdir_path(filename):
+    """
+    :param filename: File name
+    :return: Path of given file in the work dir
+    """
+    workdir = os.environ.get("BENCH_WORKDIR", "/tmp")
+    return os.path.join(workdir, "anyconfig-bench-" + filename)
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,56 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of compiled config snapshots.
+
+Compare loading many config files with loading the snapshot compiled from
+them after checking its manifest::
+
+  $ python -m bench.compile
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import shutil
+
+import anyconfig.api as API
+import bench.common as BC
+
+
+def main(nfiles=300, nitems=50):
+    """Entrypoint.
+    """
+    workdir = BC.workdir_path("compile.d")
+    if not os.path.exists(workdir):
+        os.makedirs(workdir)
+
+    for i in range(nfiles):
+        cnf = dict(("section_%d" % k,
+                    dict(("key_%d_%d" % (i, j), "value %d" % j)
+                         for j in range(nitems)))
+                   for k in range(10))
+        API.dump(cnf, os.path.join(workdir, "%03d.json" % i))
+
+    pattern = os.path.join(workdir, "*.json")
+    output = os.path.join(workdir, "cnf.acsnap")
+    API.compile(pattern, output)
+
+    def load_snapshot():
+        """Load the snapshot and read a value"""
+        return API.load(pattern, ac_snapshot=output)["section_0"]["key_0_0"]
+
+    assert load_snapshot() == API.load(pattern)["section_0"]["key_0_0"]
+
+    BC.report("load %d JSON files" % nfiles,
+              [("multi_load", BC.measure(lambda: API.load(pattern),
+                                         number=3)),
+               ("ac_snapshot", BC.measure(load_snapshot, number=3))])
+
+    shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
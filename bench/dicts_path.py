@@ -0,0 +1,116 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of getting and setting values in nested dicts with paths.
+
+Compare the old implementation of :func:`anyconfig.dicts.get` parses paths
+every time, the new one caches accessors of paths used recently and the
+accessors made with :func:`anyconfig.dicts.compile_path` for the workload
+reads and writes the same paths repeatedly, and setting values one by one
+and in bulk with :func:`anyconfig.dicts.set_many` for the workload applies
+many overrides::
+
+  $ python -m bench.dicts_path
+"""
+from __future__ import absolute_import, print_function
+
+import functools
+import operator
+
+import anyconfig.dicts as TT
+import anyconfig.utils
+import bench.common as BC
+
+
+def get_with_parsing(dic, path, seps=TT.PATH_SEPS,
+                     idx_reg=TT._JSNP_GET_ARRAY_IDX_REG):
+    """The old implementation of :func:`anyconfig.dicts.get`.
+    """
+    items = [TT._jsnp_unescape(p) for p in TT._split_path(path, seps)]
+    if not items:
+        return (dic, '')
+    try:
+        if len(items) == 1:
+            return (dic[items[0]], '')
+
+        prnt = functools.reduce(operator.getitem, items[:-1], dic)
+        arr = anyconfig.utils.is_list_like(prnt) and idx_reg.match(items[-1])
+        return (prnt[int(items[-1])], '') if arr else (prnt[items[-1]], '')
+
+    except (TypeError, KeyError, IndexError) as exc:
+        return (None, str(exc))
+
+
+def set_with_parsing(dic, path, val, seps=TT.PATH_SEPS):
+    """The old implementation of :func:`anyconfig.dicts.set_`.
+    """
+    TT.merge(dic, TT.mk_nested_dic(path, val, seps), ac_merge=TT.MS_DICTS)
+
+
+def main(npaths=100, nloops=1000):
+    """Entrypoint.
+    """
+    paths = ["/section_%d/subsection/key_%d" % (i % 10, i)
+             for i in range(npaths)]
+    dic = dict(("section_%d" % i, dict(subsection=dict())) for i in range(10))
+    for path in paths:
+        TT.set_(dic, path, "value")
+
+    accs = [TT.compile_path(p) for p in paths]
+    nops = npaths * nloops
+
+    def run_get(get):
+        """Make a function to get values with `get`"""
+        return lambda: [get(dic, p) for _ in range(nloops) for p in paths]
+
+    assert run_get(get_with_parsing)() == run_get(TT.get)()
+    BC.report("Get values with %d paths %d times" % (npaths, nops),
+              [("parse paths every time",
+                BC.measure(run_get(get_with_parsing), number=1)),
+               ("dicts.get w/ cache", BC.measure(run_get(TT.get), number=1)),
+               ("compiled accessors",
+                BC.measure(lambda: [a.get(dic) for _ in range(nloops)
+                                    for a in accs], number=1))])
+
+    def run_set(set_):
+        """Make a function to set values with `set_`"""
+        return lambda: [set_(dic, p, 1) for _ in range(nloops) for p in paths]
+
+    BC.report("Set values with %d paths %d times" % (npaths, nops),
+              [("parse paths every time",
+                BC.measure(run_set(set_with_parsing), number=1)),
+               ("dicts.set_ w/ cache",
+                BC.measure(run_set(TT.set_), number=1)),
+               ("compiled accessors",
+                BC.measure(lambda: [a.set(dic, 1) for _ in range(nloops)
+                                    for a in accs], number=1))])
+
+    overrides = [("/app/services/service_%d/env/key_%d" % (i % 100, i), i)
+                 for i in range(nops)]
+
+    def apply_overrides(set_):
+        """Make a function to apply all overrides to a dict"""
+        def apply_all():
+            """Apply overrides"""
+            dic = dict()
+            for path, val in overrides:
+                set_(dic, path, val)
+            return dic
+        return apply_all
+
+    assert apply_overrides(set_with_parsing)() == \
+        apply_overrides(TT.set_)()
+    BC.report("Apply %d overrides" % nops,
+              [("merge nested dicts",
+                BC.measure(apply_overrides(set_with_parsing), number=1)),
+               ("dicts.set_", BC.measure(apply_overrides(TT.set_), number=1)),
+               ("dicts.set_many",
+                BC.measure(lambda: TT.set_many(dict(), overrides),
+                           number=1))])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
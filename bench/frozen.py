@@ -0,0 +1,74 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of loading immutable configs and comparing them.
+
+Compare the ways to get configs safe to share, loading them and making
+defensive deep copies, freezing them after loaded and loading them frozen
+with 'ac_frozen' option, and the costs to compare them::
+
+  $ python -m bench.frozen
+"""
+from __future__ import absolute_import, print_function
+
+import copy
+
+import anyconfig.api
+import anyconfig.frozen as TT
+import bench.common as BC
+
+
+def make_cnf(depth, width):
+    """
+    :param depth: Depth of nested dicts
+    :param width: Number of items in each dict
+    :return: Nested dicts have lists of values as leaves
+    """
+    if depth == 0:
+        return dict(("key_%d" % i, [i, "val_%d" % i]) for i in range(width))
+
+    return dict(("key_%d" % i, make_cnf(depth - 1, width))
+                for i in range(width))
+
+
+def main(depth=6, width=6, nloops=3):
+    """Entrypoint.
+    """
+    content = anyconfig.api.dumps(make_cnf(depth, width), "json")
+
+    def loads(**options):
+        """Load the config from `content`"""
+        return anyconfig.api.loads(content, ac_parser="json", **options)
+
+    BC.report("Load a config of %d bytes" % len(content),
+              [("loads + deepcopy",
+                BC.measure(lambda: copy.deepcopy(loads()), number=nloops)),
+               ("loads + freeze",
+                BC.measure(lambda: TT.freeze(loads()), number=nloops)),
+               ("loads w/ ac_frozen",
+                BC.measure(lambda: loads(ac_frozen=True), number=nloops))])
+
+    # Configs differ only at the last leaf so that comparing dicts walks
+    # all of their items.
+    (dic, dic2) = (loads(), loads())
+    last = dic2
+    for _ in range(depth):
+        last = last["key_%d" % (width - 1)]
+    last["key_%d" % (width - 1)] = None
+    (cnf, cnf2) = (TT.freeze(dic), TT.freeze(dic2))
+    (hash(cnf), hash(cnf2))
+
+    neqs = 1000
+    BC.report("Compare configs differ %d times" % neqs,
+              [("dicts", BC.measure(lambda: [dic == dic2 for _ in range(neqs)],
+                                    number=1)),
+               ("frozen w/ cached hashes",
+                BC.measure(lambda: [cnf == cnf2 for _ in range(neqs)],
+                           number=1))])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,65 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of looking up objects in nested dicts with paths.
+
+Compare :func:`anyconfig.dicts.get` walks nested dicts and the flat index of
+paths made with :func:`anyconfig.index.build` for the workload looks up deep
+keys repeatedly::
+
+  $ python -m bench.index
+"""
+from __future__ import absolute_import, print_function
+
+import anyconfig.api
+import anyconfig.dicts
+import anyconfig.index as TT
+import bench.common as BC
+
+
+def make_cnf(depth, width):
+    """
+    :param depth: Depth of nested dicts
+    :param width: Number of items in each dict
+    :return: Nested dicts
+    """
+    if depth == 0:
+        return dict(("key_%d" % i, i) for i in range(width))
+
+    return dict(("key_%d" % i, make_cnf(depth - 1, width))
+                for i in range(width))
+
+
+def main(depth=8, width=4, nloops=100):
+    """Entrypoint.
+    """
+    cnf = make_cnf(depth, width)
+    paths = [".".join("key_%d" % ((i + j) % width) for j in range(depth + 1))
+             for i in range(width * 20)]
+    tpaths = [tuple(p.split('.')) for p in paths]
+    idx = TT.build(cnf)
+    nops = len(paths) * nloops
+
+    def run(data, get):
+        """Make a function to get values with `get`"""
+        return lambda: [get(data, p) for _ in range(nloops) for p in paths]
+
+    assert run(cnf, anyconfig.dicts.get)() == run(idx, anyconfig.api.get)()
+    BC.report("Get %d values at depth %d" % (nops, depth + 1),
+              [("dicts.get", BC.measure(run(cnf, anyconfig.dicts.get),
+                                        number=1)),
+               ("api.get w/ index",
+                BC.measure(run(idx, anyconfig.api.get), number=1)),
+               ("get w/ index and path tuples",
+                BC.measure(lambda: [idx.get(p) for _ in range(nloops)
+                                    for p in tpaths], number=1))])
+
+    BC.report("Build the index of %d objects" % len(idx),
+              [("index.build", BC.measure(lambda: TT.build(cnf), number=1))])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
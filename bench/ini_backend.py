@@ -0,0 +1,67 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of INI backend.
+
+Compare the engine uses configparser module and the built-in single pass
+one::
+
+  $ python -m bench.ini_backend
+"""
+from __future__ import absolute_import, print_function
+
+import os
+
+import anyconfig.backend.ini as TT
+import bench.common as BC
+
+
+def make_content(nsects=1000, nopts=10):
+    """
+    :param nsects: Number of sections
+    :param nopts: Number of options in each section
+    :return: INI-style content string
+    """
+    lines = ["[DEFAULT]", "basedir = /var/lib", ""]
+    for i in range(nsects):
+        lines.append("[section_%d]" % i)
+        lines.append("# A comment line in section %d" % i)
+        lines.extend("key_%d = value %d, item %d" % (j, j, i) for j
+                     in range(nopts))
+        lines.append("path = %%(basedir)s/%d" % i)
+        lines.append("")
+
+    return os.linesep.join(lines)
+
+
+def main(nsects=1000, nopts=10):
+    """Entrypoint.
+    """
+    psr = TT.Parser()
+    path = BC.workdir_path("ini.ini")
+    with open(path, 'w') as out:
+        out.write(make_content(nsects, nopts))
+
+    def load(**options):
+        """Load from the file"""
+        with psr.ropen(path) as inp:
+            return psr.load(inp, **options)
+
+    assert load() == load(ac_engine="fast")
+
+    for opts, title in ((dict(), "load"),
+                        (dict(ac_parse_value=True), "load w/ ac_parse_value")):
+        BC.report("INI %s: %d sections x %d options" % (title, nsects, nopts),
+                  [(label, BC.measure(lambda: load(ac_engine=engine, **opts),
+                                      number=3))
+                   for label, engine in (("configparser", "configparser"),
+                                         ("fast", "fast"))])
+
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,79 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of memory saved by interning keys and values in configs.
+
+Load the JSON configs of very many tenants repeat the same keys, the same
+short string values and the same subtrees, and keep all of them, with and
+without 'ac_intern' option, and compare the memory allocated measured with
+tracemalloc::
+
+  $ python -m bench.interning
+"""
+from __future__ import absolute_import, print_function
+
+import anyconfig.api
+import anyconfig.interning as TT
+import bench.common as BC
+
+
+REGIONS = ["us-east-1", "us-west-2", "eu-west-1", "ap-northeast-1"]
+
+
+def make_cnf(idx):
+    """
+    :param idx: Index of tenant
+    :return: A dict represents the config of a tenant
+    """
+    region = REGIONS[idx % len(REGIONS)]
+    return dict(id=idx, name="tenant-%d" % idx, region=region,
+                plan=["free", "standard", "premium"][idx % 3],
+                database=dict(engine="postgresql", port=5432,
+                              host="db.%s.example.com" % region,
+                              options=dict(sslmode="require", pool_size=10)),
+                logging=dict(level="info", format="json",
+                             handlers=["console", "syslog"]),
+                features=dict(sso=bool(idx % 2), audit_log=True,
+                              api_version="v2"))
+
+
+def main(ntenants=20000):
+    """Entrypoint.
+    """
+    contents = [anyconfig.api.dumps(make_cnf(i), "json")
+                for i in range(ntenants)]
+
+    def load_all(**options):
+        """Load all of the configs and keep them."""
+        return lambda: [anyconfig.api.loads(c, ac_parser="json", **options)
+                        for c in contents]
+
+    # Strings interned already are not counted.
+    load_all(ac_intern=True)()
+
+    results = []
+    for label, opts in (("dicts", {}),
+                        ("ac_intern=True", dict(ac_intern=True)),
+                        ("ac_frozen=True", dict(ac_frozen=True)),
+                        ("ac_intern='subtrees'",
+                         dict(ac_intern=TT.SUBTREES))):
+        (cnfs, size) = BC.measure_memory(load_all(**opts))
+        assert cnfs[-1] == make_cnf(ntenants - 1)
+        results.append((label, size))
+
+    BC.report_memory("Memory to load and keep the configs of %d tenants" %
+                     ntenants, results)
+
+    BC.report("Time to load the configs of %d tenants" % ntenants,
+              [(label, BC.measure(load_all(**opts), number=1))
+               for label, opts in (("dicts", {}),
+                                   ("ac_intern=True", dict(ac_intern=True)),
+                                   ("ac_intern='subtrees'",
+                                    dict(ac_intern=TT.SUBTREES)))])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,65 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of JSON backend.
+
+Compare JSON engines available to load and dump data::
+
+  $ python -m bench.json_backend
+"""
+# pylint: disable=protected-access
+from __future__ import absolute_import, print_function
+
+import anyconfig.backend.json as TT
+import bench.common as BC
+
+from anyconfig.compat import OrderedDict
+
+
+def make_cnf(nitems=10000):
+    """
+    :param nitems: Number of items in the config
+    :return: A config object to load and dump
+    """
+    return dict(("key_%d" % i,
+                 dict(name="name-%d" % i, value=i, ratio=i / 3.0,
+                      enabled=i % 2 == 0, tags=["a", "b", "c"]))
+                for i in range(nitems))
+
+
+def main(nitems=10000):
+    """Entrypoint.
+    """
+    psr = TT.Parser()
+    cnf = make_cnf(nitems)
+    cnf_s = psr.dumps(cnf)
+
+    engines = [TT.DEFAULT_ENGINE.name]  # The baseline.
+    engines += [n for n in TT.ENGINES
+                if n not in engines and TT._find_engine(n) is not None]
+    print("Available JSON engines: %s, selected in 'auto' mode: %s\n" %
+          (', '.join(engines), TT.get_engine("auto").name))
+
+    for opts, title in ((dict(), "load"),
+                        (dict(ac_dict=OrderedDict), "load w/ ac_dict")):
+        BC.report("JSON %s: %d items" % (title, nitems),
+                  [(name, BC.measure(lambda: psr.loads(cnf_s,
+                                                       ac_json_engine=name,
+                                                       **opts)))
+                   for name in engines])
+
+    for opts, title in ((dict(), "dump"),
+                        (dict(indent=2, sort_keys=True),
+                         "dump w/ indent and sort_keys")):
+        BC.report("JSON %s: %d items" % (title, nitems),
+                  [(name, BC.measure(lambda: psr.dumps(cnf,
+                                                       ac_json_engine=name,
+                                                       **opts)))
+                   for name in engines])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
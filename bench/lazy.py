@@ -0,0 +1,80 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of loading INI and Java properties files lazily.
+
+Load a large INI file and a large Java properties file and access a few
+sections and values of them, with and without 'ac_lazy' option, and compare
+the time and the memory allocated at the peak measured with tracemalloc::
+
+  $ python -m bench.lazy
+"""
+from __future__ import absolute_import, print_function
+
+import os
+
+import anyconfig.api
+import bench.common as BC
+import bench.ini_backend
+import bench.properties_backend
+
+
+def _load_and_access(path, keys, **options):
+    """
+    :param path: Config file path
+    :param keys: Keys of the items to access
+    :return: A list of the items accessed
+    """
+    cnf = anyconfig.api.load(path, **options)
+    return [cnf[key] for key in keys]
+
+
+def _compare(title, path, keys, **options):
+    """
+    :param title: Title of the benchmark
+    :param path: Config file path
+    :param keys: Keys of the items to access
+    """
+    variants = (("eager", dict(options)),
+                ("ac_lazy", dict(options, ac_lazy=True)))
+
+    res = [_load_and_access(path, keys, **opts) for _label, opts in variants]
+    assert res[0] == res[1]
+
+    BC.report("%s: load and access %d items" % (title, len(keys)),
+              [(label, BC.measure(lambda o=opts: _load_and_access(path, keys,
+                                                                  **o),
+                                  number=3))
+               for label, opts in variants])
+    BC.report_memory("%s: peak memory" % title,
+                     [(label, BC.measure_memory(lambda o=opts:
+                                                _load_and_access(path, keys,
+                                                                 **o))[1])
+                      for label, opts in variants])
+
+
+def main(nsects=10000, nopts=10, nlines=1000000):
+    """Entrypoint.
+    """
+    path = BC.workdir_path("lazy.ini")
+    with open(path, 'w') as out:
+        out.write(bench.ini_backend.make_content(nsects, nopts))
+
+    _compare("INI %d sections x %d options" % (nsects, nopts), path,
+             ["section_0", "section_%d" % (nsects - 1)], ac_engine="fast")
+    os.remove(path)
+
+    path = BC.workdir_path("lazy.properties")
+    with open(path, 'w') as out:
+        out.write(bench.properties_backend.make_content(nlines))
+
+    _compare("Java properties %d lines" % nlines, path,
+             ["key.1.a", "key.%d.a" % (nlines - 1)])
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,73 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of NDJSON backend.
+
+Compare loading records from NDJSON file with the ones from JSON file has an
+array of them, and the peak memory to iterate records one by one::
+
+  $ python -m bench.ndjson_backend
+"""
+from __future__ import absolute_import, print_function
+
+import json
+import os
+
+import anyconfig.backend.ndjson as TT
+import bench.common as BC
+
+
+def make_records(nrecords=100000):
+    """
+    :param nrecords: Number of records
+    :return: A generator yields records
+    """
+    return (dict(name="host-%d" % i, enabled=bool(i % 2),
+                 opts=dict(port=8000 + i % 100, tags=["a", "b"]))
+            for i in range(nrecords))
+
+
+def main(nrecords=100000):
+    """Entrypoint.
+    """
+    psr = TT.Parser()
+    path = BC.workdir_path("records.ndjson")
+    jpath = BC.workdir_path("records.json")
+
+    psr.dump(make_records(nrecords), path)
+    with open(jpath, 'w') as out:
+        json.dump(dict(records=list(make_records(nrecords))), out)
+
+    def load_json():
+        """Load records from JSON and make a mapping of them"""
+        with open(jpath) as inp:
+            return dict((rec["name"], rec) for rec
+                        in json.load(inp)["records"])
+
+    def iterate():
+        """Iterate records one by one"""
+        return sum(1 for _rec in psr.load_all(path))
+
+    assert load_json() == psr.load(path, ac_key="name")
+
+    title = "%d records" % nrecords
+    BC.report("NDJSON load: " + title,
+              [("json + dict", BC.measure(load_json, number=3)),
+               ("ndjson ac_key", BC.measure(lambda: psr.load(path,
+                                                             ac_key="name"),
+                                            number=3)),
+               ("ndjson load_all", BC.measure(iterate, number=3))])
+
+    BC.report_memory("NDJSON load: " + title,
+                     [("json + dict", BC.measure_memory(load_json)[1]),
+                      ("ndjson load_all", BC.measure_memory(iterate)[1])])
+
+    os.remove(path)
+    os.remove(jpath)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
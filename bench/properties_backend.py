@@ -0,0 +1,67 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of Java properties backend.
+
+Measure the throughput (lines per second) of the loader and the dumper::
+
+  $ python -m bench.properties_backend
+"""
+from __future__ import absolute_import, print_function
+
+import os
+
+import anyconfig.backend.properties as TT
+import anyconfig.compat
+import bench.common as BC
+
+
+def make_content(nlines=100000):
+    """
+    :param nlines: Number of lines in the content
+    :return: Java properties content string
+    """
+    lines = ("# a comment line %d" % i if i % 10 == 0 else
+             "key.%d.a = value %d, url=http\\://example.com/%d" % (i, i, i)
+             if i % 10 != 5 else
+             "key.%d.b: \\%s    continued line %d" % (i, os.linesep, i)
+             for i in range(nlines))
+    return os.linesep.join(lines)
+
+
+def main(nlines=100000):
+    """Entrypoint.
+    """
+    psr = TT.Parser()
+    content = make_content(nlines)
+    path = BC.workdir_path("properties.properties")
+    with open(path, 'w') as out:
+        out.write(content)
+
+    def load():
+        """Load from the file"""
+        with psr.ropen(path) as inp:
+            return psr.load(inp)
+
+    cnf = load()
+
+    def dump():
+        """Dump to a string stream"""
+        psr.dump(cnf, anyconfig.compat.StringIO())
+
+    for title, fnc, nitems in (("load", load, nlines),
+                               ("dump", dump, len(cnf))):
+        elapsed = BC.measure(fnc, number=3)
+        BC.report("Java properties %s: %d lines" % (title, nitems),
+                  [("elapsed time", elapsed),
+                   ("throughput [lines/sec]", nitems / elapsed)],
+                  unit='', ratio=False)
+
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
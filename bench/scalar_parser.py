@@ -0,0 +1,83 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of the parser of scalar values used with 'ac_parse_value'.
+
+Compare the parser tries regex patterns in turn (the old implementation of
+:func:`anyconfig.parser.parse_single`) and the new one with and without
+memoization::
+
+  $ python -m bench.scalar_parser
+"""
+from __future__ import absolute_import, print_function
+
+import anyconfig.parser as TT
+import bench.common as BC
+
+
+def parse_single_with_regex(str_):
+    """The old implementation of :func:`anyconfig.parser.parse_single`.
+    """
+    if str_ is None:
+        return ''
+
+    str_ = str_.strip()
+
+    if not str_:
+        return ''
+
+    if TT.BOOL_PATTERN.match(str_) is not None:
+        return bool(str_)
+
+    if TT.INT_PATTERN.match(str_) is not None:
+        return int(str_)
+
+    if TT.STR_PATTERN.match(str_) is not None:
+        return str_[1:-1]
+
+    return str_
+
+
+def make_values(nvalues=1000000, nuniqs=500):
+    """
+    :param nvalues: Number of values
+    :param nuniqs: Number of unique values; literals in configs are repeated
+    :return: A list of strings
+    """
+    uniqs = [("true", "%d" % i, "'quoted %d'" % i, "value_%d" % i, "0.%d" % i,
+              " false ")[i % 6] for i in range(nuniqs)]
+    return [uniqs[i % nuniqs] for i in range(nvalues)]
+
+
+def main(nvalues=1000000):
+    """Entrypoint.
+    """
+    vals = make_values(nvalues)
+
+    def run(parse):
+        """Make a function to parse all values with `parse`"""
+        return lambda: [parse(v) for v in vals]
+
+    BC.report("Parse %d values with the default rules" % nvalues,
+              [("regex", BC.measure(run(parse_single_with_regex), number=1)),
+               ("one scan w/o memo",
+                BC.measure(run(TT.mk_scalar_parser(memo_size=0)), number=1)),
+               ("one scan w/ memo",
+                BC.measure(run(TT.mk_scalar_parser()), number=1)),
+               ("parse_single", BC.measure(run(TT.parse_single), number=1))])
+
+    BC.report("Parse %d values with all rules" % nvalues,
+              [("one scan w/o memo",
+                BC.measure(run(TT.mk_scalar_parser(TT.ALL_RULES,
+                                                   memo_size=0)),
+                           number=1)),
+               ("one scan w/ memo",
+                BC.measure(run(TT.mk_scalar_parser(TT.ALL_RULES)),
+                           number=1))])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
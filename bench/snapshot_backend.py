@@ -0,0 +1,68 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of binary snapshot backend.
+
+Compare the time and the peak memory to open a large config and read a value
+in it from pickle and snapshot files::
+
+  $ python -m bench.snapshot_backend
+"""
+from __future__ import absolute_import, print_function
+
+import os
+
+import anyconfig.backend.pickle
+import anyconfig.backend.snapshot as TT
+import bench.common as BC
+
+
+def make_cnf(nsects=1000, nopts=100):
+    """
+    :param nsects: Number of sections
+    :param nopts: Number of options in each section
+    :return: A dict of sections
+    """
+    return dict(("section_%d" % i,
+                 dict(("key_%d" % j, dict(value="value %d" % j, index=j,
+                                          tags=["a", "b", "c"]))
+                      for j in range(nopts)))
+                for i in range(nsects))
+
+
+def main(nsects=1000, nopts=100):
+    """Entrypoint.
+    """
+    cnf = make_cnf(nsects, nopts)
+    psrs = ((anyconfig.backend.pickle.Parser(), "pickle"),
+            (TT.Parser(), "snapshot"))
+    paths = {}
+    for psr, label in psrs:
+        paths[label] = BC.workdir_path("cnf." + psr.extensions()[0])
+        psr.dump(cnf, paths[label])
+
+    key = "section_%d" % (nsects // 2)
+
+    def get_fn(psr, label):
+        """Make a function to load the config and read a value in it"""
+        return lambda: psr.load(paths[label])[key]["key_0"]["value"]
+
+    for psr, label in psrs:
+        assert get_fn(psr, label)() == cnf[key]["key_0"]["value"]
+
+    title = ("open and read a value: %d sections x %d options, %d bytes" %
+             (nsects, nopts, os.path.getsize(paths["snapshot"])))
+    BC.report(title, [(label, BC.measure(get_fn(psr, label), number=3))
+                      for psr, label in psrs])
+    BC.report_memory(title, [(label, BC.measure_memory(get_fn(psr, label))[1])
+                             for psr, label in psrs])
+
+    for path in paths.values():
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
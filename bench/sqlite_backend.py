@@ -0,0 +1,63 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of SQLite backend.
+
+Compare the time and the peak memory to load a large config and read some
+values in it with :func:`anyconfig.dicts.get` from JSON and SQLite files::
+
+  $ python -m bench.sqlite_backend
+"""
+from __future__ import absolute_import, print_function
+
+import os
+
+import anyconfig.backend.json
+import anyconfig.backend.sqlite as TT
+import anyconfig.dicts
+import bench.common as BC
+
+
+def main(nsects=500, nopts=500, nreads=200):
+    """Entrypoint.
+    """
+    cnf = dict(("section_%d" % i,
+                dict(("key_%d" % j, dict(value="value %d" % j, index=j))
+                     for j in range(nopts)))
+               for i in range(nsects))
+    paths = ["/section_%d/key_%d/value" % (i * 7 % nsects, i % nopts)
+             for i in range(nreads)]
+
+    psrs = ((anyconfig.backend.json.Parser(), "json"),
+            (TT.Parser(), "sqlite"))
+    files = {}
+    for psr, label in psrs:
+        files[label] = BC.workdir_path("cnf." + psr.extensions()[0])
+        psr.dump(cnf, files[label])
+
+    def get_fn(psr, label):
+        """Make a function to load the config and read values in it"""
+        def read():
+            """Load and read values"""
+            data = psr.load(files[label])
+            return [anyconfig.dicts.get(data, path)[0] for path in paths]
+        return read
+
+    assert get_fn(*psrs[0])() == get_fn(*psrs[1])()
+
+    title = "load and read %d values: %d keys" % (nreads,
+                                                  nsects * nopts * 3)
+    BC.report(title, [(label, BC.measure(get_fn(psr, label), number=3))
+                      for psr, label in psrs])
+    BC.report_memory(title, [(label, BC.measure_memory(get_fn(psr, label))[1])
+                             for psr, label in psrs])
+
+    for path in files.values():
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
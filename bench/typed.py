@@ -0,0 +1,60 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of memory used by typed config objects.
+
+Compare the memory allocated for configs of very many tenants kept in dicts
+and in the instances of the classes made with
+:func:`anyconfig.typed.make_class` from JSON schema, measured with
+tracemalloc::
+
+  $ python -m bench.typed
+"""
+from __future__ import absolute_import, print_function
+
+import anyconfig.schema
+import anyconfig.typed as TT
+import bench.common as BC
+
+
+def make_cnf(idx):
+    """
+    :param idx: Index of tenant
+    :return: A dict represents the config of a tenant
+    """
+    return dict(id=idx, name="tenant-%d" % idx, enabled=bool(idx % 2),
+                quota=idx * 10, region=None,
+                db=dict(host="db%d.example.com" % idx, port=5432,
+                        user="u%d" % idx, pool=10))
+
+
+def main(ntenants=100000):
+    """Entrypoint.
+    """
+    cnfs = [make_cnf(i) for i in range(ntenants)]
+    cls = TT.make_class(anyconfig.schema.gen_schema(cnfs[0]))
+
+    # Values are shared by both so that only containers are measured.
+    (_ret, dsize) = BC.measure_memory(lambda: [dict(c, db=dict(c["db"]))
+                                               for c in cnfs])
+    (ret, tsize) = BC.measure_memory(lambda: [cls(c) for c in cnfs])
+    assert ret[-1] == cnfs[-1]
+
+    BC.report_memory("Memory to keep the configs of %d tenants" % ntenants,
+                     [("dicts", dsize), ("typed objects", tsize)])
+    BC.report("Memory per config", [("dicts", dsize / ntenants),
+                                    ("typed objects", tsize / ntenants)],
+              unit="bytes")
+
+    BC.report("Access an attribute of %d configs" % ntenants,
+              [("dicts", BC.measure(lambda: [c["db"]["port"] for c in cnfs],
+                                    number=3)),
+               ("typed objects",
+                BC.measure(lambda: [c.db.port for c in ret], number=3))])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
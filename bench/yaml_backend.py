@@ -0,0 +1,67 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+"""Benchmarks of YAML backend.
+
+Compare loader and dumper classes use libyaml and pure python ones::
+
+  $ python -m bench.yaml_backend
+"""
+# pylint: disable=protected-access
+from __future__ import absolute_import, print_function
+
+import anyconfig.backend.yaml as TT
+import bench.common as BC
+
+from anyconfig.compat import OrderedDict
+
+
+def make_cnf(nitems=1000):
+    """
+    :param nitems: Number of items in the config
+    :return: A config object to load and dump
+    """
+    return OrderedDict(("key_%d" % i,
+                        OrderedDict((("name", "name-%d" % i),
+                                     ("value", i), ("enabled", i % 2 == 0),
+                                     ("tags", ["a", "b", "c"]))))
+                       for i in range(nitems))
+
+
+def main(nitems=1000):
+    """Entrypoint.
+    """
+    psr = TT.Parser()
+    cnf = make_cnf(nitems)
+    cnf_s = psr.dumps(cnf)
+
+    modes = [("pure", False)]
+    if TT.LIBYAML:
+        modes.append(("libyaml", True))
+    else:
+        print("libyaml is not available; only pure python mode is tested")
+
+    for opts, title in ((dict(), "load"), (dict(ac_safe=True), "safe load"),
+                        (dict(ac_dict=OrderedDict), "load w/ ac_dict")):
+        BC.report("YAML %s: %d items" % (title, nitems),
+                  [(label, BC.measure(lambda: psr.loads(cnf_s, ac_libyaml=c,
+                                                        **opts)))
+                   for label, c in modes])
+
+    BC.report("YAML dump: %d items" % nitems,
+              [(label, BC.measure(lambda: psr.dumps(cnf, ac_libyaml=c)))
+               for label, c in modes])
+
+    # Dumper given explicitly needs the conversion of `cnf` to dicts.
+    dumper = TT._customized_dumper(dict)
+    BC.report("YAML dump w/ and w/o conversion to dicts: %d items" % nitems,
+              [("w/ conversion", BC.measure(lambda: psr.dumps(cnf,
+                                                              Dumper=dumper))),
+               ("w/o conversion", BC.measure(lambda: psr.dumps(cnf)))])
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:sw=4:ts=4:et:
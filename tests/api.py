@@ -14,9 +14,14 @@ import unittest
 
 import anyconfig.api as TT
 import anyconfig.backends
+import anyconfig.backend.snapshot
 import anyconfig.compat
 import anyconfig.dicts
+import anyconfig.frozen
+import anyconfig.schema
 import anyconfig.template
+import anyconfig.typed
+import tests.archive
 import tests.common
 
 from tests.common import CNF_0, SCM_0, dicts_equal
@@ -132,6 +137,14 @@ class Test_20_dumps_and_loads(TestBase):
                        ensure_ascii=False)
         self.assert_dicts_equal(res, self.cnf)
 
+    def test_32_dumps_and_loads__w_ac_frozen(self):
+        res = TT.loads(TT.dumps(self.cnf, "json"), "json", ac_frozen=True)
+        self.assert_dicts_equal(res, self.cnf)
+        self.assertTrue(isinstance(res, anyconfig.frozen.FrozenDict))
+        self.assertTrue(isinstance(res["b"]["b"],
+                                   anyconfig.frozen.FrozenList))
+        self.assertRaises(TypeError, res.update, dict(a=2))
+
     def test_40_loads_wo_type(self):
         cnf_s = "requires:bash,zsh"
         self.assertTrue(TT.loads(cnf_s) is None)
@@ -355,6 +368,54 @@ class Test_32_single_load(unittest.TestCase):
             self._load_and_dump_with_opened_files("a.yml")
 
 
+class Test_34_iterload(TestBaseWithIO):
+
+    def setUp(self):
+        super(Test_34_iterload, self).setUp()
+        self.y_path = os.path.join(self.workdir, "a.yml")
+
+    def test_10_iterload__json(self):
+        TT.dump(self.cnf, self.a_path)
+        cnfs = list(TT.iterload(self.a_path))
+        self.assertEqual(len(cnfs), 1)
+        self.assert_dicts_equal(cnfs[0], self.cnf)
+
+    def test_20_iterload__yaml_documents(self):
+        if "yaml" not in anyconfig.backends.list_types():
+            return
+
+        docs = [TT.dumps(self.cnf, "yaml"), TT.dumps(self.upd, "yaml")]
+        with open(self.y_path, 'w') as out:
+            out.write("---" + os.linesep + ("---" + os.linesep).join(docs))
+
+        cnfs = list(TT.iterload(self.y_path))
+        self.assertEqual(len(cnfs), 2)
+        self.assert_dicts_equal(cnfs[0], self.cnf)
+        self.assert_dicts_equal(cnfs[1], self.upd)
+
+    def test_30_single_load__w_ac_load_all(self):
+        if "yaml" not in anyconfig.backends.list_types():
+            return
+
+        docs = [TT.dumps(self.cnf, "yaml"), TT.dumps(self.upd, "yaml")]
+        with open(self.y_path, 'w') as out:
+            out.write("---" + os.linesep + ("---" + os.linesep).join(docs))
+
+        exp = copy.deepcopy(self.upd)  # Assume MS_DICTS strategy was used.
+        exp["b"]["c"] = self.dic["b"]["c"]
+        exp["name"] = self.dic["name"]
+
+        cnf = TT.single_load(self.y_path, ac_load_all=True)
+        self.assert_dicts_equal(cnf, exp)
+
+        cnf = TT.load(self.y_path, ac_load_all=True, ac_merge=TT.MS_REPLACE)
+        self.assert_dicts_equal(cnf["b"], self.upd["b"])
+
+        cnf = TT.single_load(self.y_path, ac_load_all=True, ac_frozen=True)
+        self.assert_dicts_equal(cnf, exp)
+        self.assertTrue(anyconfig.frozen.is_frozen(cnf))
+
+
 class TestBaseWithIOMultiFiles(TestBaseWithIO):
 
     def setUp(self):
@@ -488,6 +549,164 @@ class Test_42_multi_load(TestBaseWithIOMultiFiles):
         self.assert_dicts_equal(res, self.exp)
         self.assertTrue(isinstance(res, MyODict))
 
+    def test_70_multi_load__w_ac_frozen_option(self):
+        TT.dump(self.dic, self.a_path)
+        TT.dump(self.upd, self.b_path)
+
+        res = TT.multi_load(self.g_path, ac_frozen=True)
+        self.assert_dicts_equal(res, self.exp)
+        self.assertTrue(anyconfig.frozen.is_frozen(res))
+        self.assertTrue(anyconfig.frozen.is_frozen(res["b"]["b"]))
+        self.assertEqual(hash(res), hash(anyconfig.frozen.freeze(self.exp)))
+
+    def test_80_multi_load__w_ac_schema_class_option(self):
+        TT.dump(self.dic, self.a_path)
+        TT.dump(self.upd, self.b_path)
+
+        scm = anyconfig.schema.gen_schema(self.exp)
+        res = TT.multi_load(self.g_path, ac_schema_class=scm)
+        self.assertTrue(isinstance(res, anyconfig.typed.TypedConfig))
+        self.assertEqual(res.b.d, self.exp["b"]["d"])
+        self.assertEqual(res, self.exp)
+
+
+class Test_44_multi_load_compressed_files(TestBaseWithIOMultiFiles):
+
+    def test_10_multi_load__compressed_files(self):
+        (a_path, b_path) = (self.a_path + ".gz", self.b_path + ".bz2")
+        TT.dump(self.dic, a_path)
+        TT.dump(self.upd, b_path)
+
+        with open(a_path, "rb") as inp:
+            self.assertEqual(inp.read(2), b"\x1f\x8b")  # gzip magic
+
+        self.assert_dicts_equal(TT.load(a_path), self.dic)
+        self.assert_dicts_equal(TT.multi_load([a_path, b_path]), self.exp)
+
+
+class Test_46_load_archive(TestBaseWithIO):
+
+    members = [("conf.d/20-c.json", b'{"a": 3, "c": {"d": 4}}'),
+               ("conf.d/00-a.json", b'{"a": 1, "c": {"e": 5}}'),
+               ("conf.d/10-b.json", b'{"a": 2}'),
+               ("conf.d/README", b"Not a config file"),
+               ("other.json", b'{"other": true}')]
+
+    ref = dict(a=3, c=dict(d=4, e=5))
+
+    def test_10_load_archive__tar(self):
+        path = os.path.join(self.workdir, "bundle.tar.gz")
+        tests.archive.make_tar(path, self.members)
+
+        self.assert_dicts_equal(TT.load_archive(path, "conf.d/*"), self.ref)
+        self.assert_dicts_equal(TT.load(path + "!/conf.d/*.json"), self.ref)
+
+        cnf = TT.load(path + "!/conf.d/*.json", ac_merge=TT.MS_REPLACE)
+        self.assert_dicts_equal(cnf, dict(a=3, c=dict(d=4)))
+
+    def test_20_load_archive__zip(self):
+        path = os.path.join(self.workdir, "bundle.zip")
+        tests.archive.make_zip(path, self.members)
+
+        self.assert_dicts_equal(TT.load(path + "!/conf.d/*.json"), self.ref)
+        self.assertTrue(TT.load(path + "!/")["other"])
+
+    def test_30_load_archive__no_members_matched(self):
+        path = os.path.join(self.workdir, "bundle.tar")
+        tests.archive.make_tar(path, self.members)
+        self.assertEqual(TT.load_archive(path, "*.yml"), dict())
+
+    def test_32_load_archive__yaml_and_ini(self):
+        if "yaml" not in anyconfig.backends.list_types():
+            return  # YAML backend is not available in this env.
+
+        members = [("conf.d/00-a.yml", b"a: 1\nc:\n  e: 5\n"),
+                   ("conf.d/10-b.ini", b"[c]\nd = 4\n"),
+                   ("conf.d/20-c.yml", u"name: \u3042\n".encode("utf-8"))]
+        ref = dict(a=1, c=dict(d="4", e=5), name=u"\u3042")
+
+        for ext, make in (("tar.gz", tests.archive.make_tar),
+                          ("zip", tests.archive.make_zip)):
+            path = os.path.join(self.workdir, "bundle." + ext)
+            make(path, members)
+            self.assert_dicts_equal(TT.load(path + "!/conf.d/*"), ref)
+            self.assert_dicts_equal(TT.load(path + "!/"), ref)
+
+        path = os.path.join(self.workdir, "bundle.tar")
+        tests.archive.make_tar(path, [("a.yml",
+                                       u"a: \u3042\n".encode("euc-jp"))])
+        self.assertEqual(TT.load(path + "!/*.yml", ac_encoding="euc-jp"),
+                         dict(a=u"\u3042"))
+
+    def test_40_load_archive__w_ac_frozen_option(self):
+        path = os.path.join(self.workdir, "bundle.tar")
+        tests.archive.make_tar(path, self.members)
+
+        cnf = TT.load_archive(path, "conf.d/*", ac_frozen=True)
+        self.assert_dicts_equal(cnf, self.ref)
+        self.assertTrue(anyconfig.frozen.is_frozen(cnf))
+
+
+class Test_48_compile(TestBaseWithIOMultiFiles):
+
+    def setUp(self):
+        super(Test_48_compile, self).setUp()
+        self.s_path = os.path.join(self.workdir, "cnf.acsnap")
+        TT.dump(self.dic, self.a_path)
+        TT.dump(self.upd, self.b_path)
+
+    def _load(self, **options):
+        return TT.load(self.g_path, ac_snapshot=self.s_path, **options)
+
+    def test_10_compile_and_load(self):
+        cnf = TT.compile(self.g_path, self.s_path)
+        self.assert_dicts_equal(cnf, self.exp)
+        self.assertTrue(os.path.exists(self.s_path + ".manifest"))
+
+        cnf = self._load()
+        self.assertTrue(isinstance(cnf, anyconfig.backend.snapshot.
+                                   SnapshotMapping))
+        self.assert_dicts_equal(cnf, self.exp)
+
+    def test_20_load_if_sources_changed(self):
+        TT.compile(self.g_path, self.s_path)
+
+        TT.dump(self.upd, self.a_path)
+        cnf = self._load()
+        self.assertTrue(isinstance(cnf, dict))
+        self.assert_dicts_equal(cnf, self.upd)
+
+    def test_22_load_if_sources_added(self):
+        TT.compile(self.g_path, self.s_path)
+
+        TT.dump(dict(z=1), os.path.join(self.workdir, "c.json"))
+        self.assertEqual(self._load()["z"], 1)
+
+    def test_24_load_if_options_changed(self):
+        TT.compile(self.g_path, self.s_path)
+
+        cnf = self._load(ac_merge=TT.MS_REPLACE)
+        self.assertTrue(isinstance(cnf, dict))
+        self.assertFalse("c" in cnf["b"])
+
+    def test_26_load_if_only_mtime_changed(self):
+        TT.compile(self.g_path, self.s_path)
+
+        os.utime(self.a_path, (0, 0))
+        cnf = self._load()
+        self.assertFalse(isinstance(cnf, dict))
+
+    def test_30_compile_streams(self):
+        with self.assertRaises(ValueError):
+            TT.compile([anyconfig.compat.StringIO()], self.s_path)
+
+    def test_40_load__w_ac_frozen_option(self):
+        TT.compile(self.g_path, self.s_path)
+
+        cnf = self._load(ac_frozen=True)
+        self.assert_dicts_equal(cnf, self.exp)
+        self.assertTrue(anyconfig.frozen.is_frozen(cnf))
+
 
 class Test_50_load_and_dump(TestBaseWithIOMultiFiles):
 
@@ -0,0 +1,90 @@
+#
+# Copyright (C) 2017 Satoru SATOH <ssato at redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring, invalid-name
+from __future__ import absolute_import
+
+import io
+import os.path
+import tarfile
+import unittest
+import zipfile
+
+import anyconfig.archive as TT
+import anyconfig.utils
+import tests.common
+
+
+MEMBERS = [("conf.d/10-b.json", b'{"b": 2}'),
+           ("conf.d/00-a.json", b'{"a": 1}'),
+           ("README", b"Not a config file")]
+
+
+def make_tar(path, members=None):
+    if members is None:
+        members = MEMBERS
+
+    mode = "w:" + (anyconfig.utils.get_compression(path) or '')
+    with tarfile.open(path, mode) as tar:
+        for name, content in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+
+
+def make_zip(path, members=None):
+    if members is None:
+        members = MEMBERS
+
+    with zipfile.ZipFile(path, 'w') as zipf:
+        for name, content in members:
+            zipf.writestr(name, content)
+
+
+class Test_10_split_path_spec(unittest.TestCase):
+
+    def test_10_not_archive_paths(self):
+        for spec in ("a.json", "a.json!/b.json", None):
+            self.assertTrue(TT.split_path_spec(spec) is None)
+
+    def test_20_archive_paths(self):
+        for ext in ("tar", "tar.gz", "tgz", "tar.bz2", "tar.xz", "zip"):
+            path = "/a/b." + ext
+            self.assertEqual(TT.split_path_spec(path + "!/c/*.json"),
+                             (path, "c/*.json"))
+
+
+class Test_20_iter_members(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tests.common.setup_workdir()
+
+    def tearDown(self):
+        tests.common.cleanup_workdir(self.workdir)
+
+    def _assert_members(self, path):
+        res = [(name, inp.read()) for name, inp
+               in TT.iter_members(path, "conf.d/*.json")]
+        self.assertEqual(res, MEMBERS[:2])
+
+        res = [name for name, _inp in TT.iter_members(path)]
+        self.assertEqual(res, [m[0] for m in MEMBERS])
+
+    def test_10_tar(self):
+        for ext in ("tar", ) + tuple("tar." + c for c
+                                     in tests.common.COMPRESSIONS):
+            path = os.path.join(self.workdir, "a." + ext)
+            make_tar(path)
+            self._assert_members(path)
+
+    def test_20_zip(self):
+        path = os.path.join(self.workdir, "a.zip")
+        make_zip(path)
+        self._assert_members(path)
+
+    def test_30_not_archive(self):
+        with self.assertRaises(ValueError):
+            list(TT.iter_members(os.path.join(self.workdir, "a.json")))
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,149 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato at redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring, invalid-name
+from __future__ import absolute_import
+
+import array
+import copy
+import os.path
+import unittest
+
+import anyconfig.api
+import anyconfig.arrays as TT
+import anyconfig.backends
+import anyconfig.dicts
+import anyconfig.frozen
+import anyconfig.schema
+import tests.common
+
+
+INTS = list(range(TT.MIN_LENGTH))
+FLOATS = [float(i) / 2 for i in range(TT.MIN_LENGTH)]
+CNF = dict(a=INTS, b=dict(c=FLOATS, d=[1, 2]), e=[INTS[:], "x"])
+
+
+class Test_10_to_array(unittest.TestCase):
+
+    def test_10_to_array(self):
+        arr = TT.to_array(INTS)
+        self.assertTrue(TT.is_array(arr))
+        self.assertEqual(arr.tolist(), INTS)
+        self.assertEqual(TT.to_array(FLOATS).typecode, 'd')
+        self.assertEqual(TT.item_type(arr), "integer")
+        self.assertEqual(TT.item_type(TT.to_array(FLOATS)), "number")
+
+    def test_20_to_array__not_converted(self):
+        for lst in ([1, 2.0], [True, False], ["a"], [None], [2 ** 64]):
+            self.assertTrue(TT.to_array(lst) is None, lst)
+
+    def test_30_to_list(self):
+        self.assertEqual(TT.to_list(TT.to_array(INTS)), INTS)
+        self.assertEqual(TT.to_list("a"), "a")
+
+
+class Test_20_convert(unittest.TestCase):
+
+    def test_10_convert(self):
+        cnf = TT.convert(copy.deepcopy(CNF))
+        self.assertTrue(isinstance(cnf["a"], array.array))
+        self.assertTrue(isinstance(cnf["b"]["c"], array.array))
+        self.assertEqual(cnf["b"]["d"], [1, 2])
+        self.assertTrue(isinstance(cnf["e"][0], array.array))
+        self.assertEqual(cnf["e"][1], "x")
+
+    def test_20_convert__min_length(self):
+        cnf = TT.convert(dict(a=[1, 2]), min_length=2)
+        self.assertTrue(isinstance(cnf["a"], array.array))
+
+    def test_30_convert__numpy(self):
+        cnf = TT.convert(dict(a=INTS[:]), kind=TT.NUMPY)
+        self.assertTrue(TT.is_array(cnf["a"]))
+        self.assertEqual(cnf["a"].tolist(), INTS)
+
+    def test_32_convert__true(self):
+        cnf = TT.convert(dict(a=INTS[:]), kind=True)
+        self.assertTrue(isinstance(cnf["a"], array.array))
+
+    def test_40_convert__unknown_kind(self):
+        self.assertRaises(ValueError, TT.convert, {}, "list")
+
+    def test_50_convert__frozen(self):
+        cnf = TT.convert(anyconfig.frozen.freeze(CNF))
+        self.assertTrue(isinstance(cnf["a"], anyconfig.frozen.FrozenList))
+
+    def test_60_merge(self):
+        arr = TT.merge(TT.to_array([1, 2]), [2, 3])
+        self.assertTrue(isinstance(arr, array.array))
+        self.assertEqual(arr.tolist(), [1, 2, 3])
+        self.assertEqual(TT.merge(TT.to_array([1]), ["a"]), [1, "a"])
+
+        cnf = dict(a=TT.to_array([1, 2]))
+        anyconfig.dicts.merge(cnf, dict(a=[2, 3]),
+                              ac_merge=anyconfig.dicts.MS_DICTS_AND_LISTS)
+        self.assertEqual(cnf["a"].tolist(), [1, 2, 3])
+
+    def test_70_gen_schema(self):
+        scm = anyconfig.schema.gen_schema(dict(a=TT.to_array(FLOATS)))
+        self.assertEqual(scm["properties"]["a"],
+                         dict(type="array", items=dict(type="number")))
+
+
+class Test_30_load(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tests.common.setup_workdir()
+
+    def tearDown(self):
+        tests.common.cleanup_workdir(self.workdir)
+
+    def _check(self, ptype):
+        if ptype not in anyconfig.backends.list_types():
+            return
+
+        content = anyconfig.api.dumps(CNF, ptype)
+        cnf = anyconfig.api.loads(content, ac_parser=ptype, ac_array=TT.ARRAY)
+        self.assertTrue(isinstance(cnf["a"], array.array))
+        self.assertTrue(isinstance(cnf["b"]["c"], array.array))
+        self.assertEqual(cnf["b"]["d"], [1, 2])
+
+        # Arrays are dumped as lists.
+        cnf2 = anyconfig.api.loads(anyconfig.api.dumps(cnf, ptype),
+                                   ac_parser=ptype)
+        self.assertTrue(tests.common.dicts_equal(cnf2, CNF))
+
+        path = os.path.join(self.workdir, "a." + ptype)
+        anyconfig.api.dump(cnf, path)
+        self.assertTrue(tests.common.dicts_equal(anyconfig.api.load(path),
+                                                 CNF))
+
+    def test_10_load__json(self):
+        self._check("json")
+
+    def test_20_load__yaml(self):
+        self._check("yaml")
+
+    def test_22_load__ndjson(self):
+        self._check("ndjson")
+
+    def test_24_load__sqlite(self):
+        self._check("sqlite")
+
+    def test_26_load__true(self):
+        content = anyconfig.api.dumps(CNF, "json")
+        cnf = anyconfig.api.loads(content, ac_parser="json", ac_array=True)
+        self.assertTrue(isinstance(cnf["a"], array.array))
+
+    def test_30_multi_load(self):
+        paths = [os.path.join(self.workdir, "%d.json" % i) for i in range(2)]
+        anyconfig.api.dump(dict(a=INTS), paths[0])
+        anyconfig.api.dump(dict(a=[TT.MIN_LENGTH]), paths[1])
+
+        cnf = anyconfig.api.multi_load(
+            paths, ac_array=TT.ARRAY,
+            ac_merge=anyconfig.dicts.MS_DICTS_AND_LISTS)
+        self.assertTrue(isinstance(cnf["a"], array.array))
+        self.assertEqual(cnf["a"].tolist(), INTS + [TT.MIN_LENGTH])
+
+# vim:sw=4:ts=4:et:
@@ -7,6 +7,7 @@
 from __future__ import absolute_import
 
 import copy
+import mmap
 import os.path
 import unittest
 
@@ -178,6 +179,17 @@ class Test_20_dump_and_load(TestBaseWithIO):
             self.assertTrue(cnf)
             self._assert_dicts_equal(cnf, cls=MyDict)
 
+    def test_18_load_with_ac_mmap_option(self):
+        if self.is_ready():
+            cnf = self.psr.load(self.cnf_path, ac_mmap=True)
+            self.assertTrue(cnf)
+            self._assert_dicts_equal(cnf)
+
+            with open(self.cnf_path, 'w') as out:
+                out.write('')
+            cnf = self.psr.load(self.cnf_path, ac_mmap=True)
+            self.assertEqual(cnf, dict())
+
     def test_30_dump(self):
         if self.is_ready():
             self.psr.dump(self.cnf, self.cnf_path)
@@ -185,6 +197,19 @@ class Test_20_dump_and_load(TestBaseWithIO):
             self.assertTrue(cnf)
             self._assert_dicts_equal(cnf)
 
+    def test_34_dump_and_load_compressed_files(self):
+        if self.is_ready():
+            for ext in tests.common.COMPRESSIONS:
+                path = "%s.%s" % (self.cnf_path, ext)
+                self.psr.dump(self.cnf, path)
+                cnf = self.psr.load(path)
+                self.assertTrue(cnf)
+                self._assert_dicts_equal(cnf)
+
+            if not tests.common.LZMA_FOUND:
+                with self.assertRaises(ValueError):
+                    self.psr.dump(self.cnf, self.cnf_path + ".xz")
+
     def test_32_dump_to_stream(self):
         if self.is_ready():
             with self.psr.wopen(self.cnf_path) as strm:
@@ -194,4 +219,30 @@ class Test_20_dump_and_load(TestBaseWithIO):
             self.assertTrue(cnf)
             self._assert_dicts_equal(cnf)
 
+
+class Test_30_loads_from_buffers(TestBaseWithIO):
+
+    def test_10_loads_from_buffers(self):
+        if self.is_ready():
+            content = self.cnf_s
+            if not isinstance(content, bytes):
+                content = _bytes(content)
+
+            for buf in (content, bytearray(content), memoryview(content)):
+                cnf = self.psr.loads(buf)
+                self.assertTrue(cnf)
+                self._assert_dicts_equal(cnf)
+
+    def test_20_loads_from_mmap(self):
+        if self.is_ready():
+            with open(self.cnf_path, 'rb') as inp:
+                buf = mmap.mmap(inp.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    cnf = self.psr.loads(buf)
+                finally:
+                    buf.close()
+
+            self.assertTrue(cnf)
+            self._assert_dicts_equal(cnf)
+
 # vim:sw=4:ts=4:et:
@@ -8,6 +8,8 @@ from __future__ import absolute_import
 import anyconfig.backend.ini as TT
 import tests.backend.common as TBC
 
+from anyconfig.compat import IS_PYTHON_3, OrderedDict
+
 
 # :seealso: `tests.backend.common.CNF_0`
 CNF_0_S = """\
@@ -43,9 +45,105 @@ class Test_10(TBC.Test_10_dumps_and_loads, HasParserTrait):
         ref["sect0"]["d"] = ref["sect0"]["d"].split(',')
         self._assert_dicts_equal(cnf, ref=ref)
 
+        # Any other true values are same as True.
+        cnf = self.psr.loads(self.cnf_s, ac_parse_value=1)
+        self._assert_dicts_equal(cnf, ref=ref)
+
 
 class Test_20(TBC.Test_20_dump_and_load, HasParserTrait):
 
     pass
 
+
+CNF_1_S = """\
+[DEFAULT]
+dir: /var/lib/%(name)s
+
+[sect0]
+name = foo
+# A comment line
+files = a.txt,
+   b.txt
+
+  c.txt
+ratio = 100%%
+
+[sect1]
+Name: bar
+flag
+"""
+
+
+class Test_30_fast_engine(TBC.TestBase, HasParserTrait):
+
+    cnf_s = CNF_1_S
+
+    def _assert_engines_give_same_results(self, **options):
+        ref = self.psr.loads(self.cnf_s, **options)
+        cnf = self.psr.loads(self.cnf_s, ac_engine="fast", **options)
+        self._assert_dicts_equal(cnf, ordered=True, cls=OrderedDict, ref=ref)
+
+    def test_10_loads(self):
+        self._assert_engines_give_same_results(allow_no_value=True,
+                                               ac_dict=OrderedDict)
+        cnf = self.psr.loads(self.cnf_s, allow_no_value=True,
+                             ac_engine="fast")
+        self.assertEqual(cnf["sect0"]["dir"], "/var/lib/foo")
+        self.assertEqual(cnf["sect0"]["files"],
+                         "a.txt,\nb.txt\n\nc.txt" if IS_PYTHON_3 else
+                         "a.txt,\nb.txt\nc.txt")  # Empty lines are skipped.
+        self.assertEqual(cnf["sect0"]["ratio"], "100%")
+        self.assertEqual(cnf["sect1"]["flag"], '')
+
+    def test_12_loads_with_options(self):
+        self._assert_engines_give_same_results(allow_no_value=True,
+                                               ac_parse_value=True,
+                                               defaults=dict(A="1"),
+                                               ac_dict=OrderedDict)
+
+    def test_20_loads_invalid_input(self):
+        for cnf_s in ("key=name", "[sect0]\n[sect0]",
+                      "[sect0]\nflag", "[sect0]\nkey = %(xyz)s"):
+            self.assertRaises(Exception, self.psr.loads, cnf_s,
+                              ac_engine="fast")
+
+
+class Test_40_lazy(TBC.TestBaseWithIO, HasParserTrait):
+
+    cnf_s = CNF_1_S
+    opts = dict(allow_no_value=True, ac_parse_value=True)
+
+    def _assert_lazy_and_eager_give_same_results(self, cnf):
+        ref = self.psr.loads(self.cnf_s, ac_dict=OrderedDict, **self.opts)
+        self.assertEqual(list(cnf.items()), list(ref.items()))
+
+    def test_10_loads(self):
+        cnf = self.psr.loads(self.cnf_s, ac_lazy=True, **self.opts)
+        self.assertEqual(repr(cnf), "<LazyMapping: 3 items, 1 loaded>")
+        self.assertEqual(cnf["sect1"]["name"], "bar")
+        self.assertEqual(repr(cnf), "<LazyMapping: 3 items, 2 loaded>")
+        self._assert_lazy_and_eager_give_same_results(cnf)
+
+        cnf = self.psr.loads(self.cnf_s.encode("utf-8"), ac_lazy=True,
+                             **self.opts)
+        self._assert_lazy_and_eager_give_same_results(cnf)
+
+    def test_20_load(self):
+        cnf = self.psr.load(self.cnf_path, ac_lazy=True, **self.opts)
+        self._assert_lazy_and_eager_give_same_results(cnf)
+
+        with self.psr.ropen(self.cnf_path) as strm:
+            cnf = self.psr.load(strm, ac_lazy=True, **self.opts)
+        self._assert_lazy_and_eager_give_same_results(cnf)
+
+    def test_30_loads_invalid_input(self):
+        for cnf_s in ("key=name", "[sect0]\n[sect0]"):
+            self.assertRaises(Exception, self.psr.loads, cnf_s,
+                              ac_lazy=True)
+
+        # Errors in sections are raised when they are accessed.
+        cnf = self.psr.loads("[sect0]\nflag\n[sect1]\na = 1", ac_lazy=True)
+        self.assertEqual(cnf["sect1"], dict(a="1"))
+        self.assertRaises(Exception, cnf.__getitem__, "sect0")
+
 # vim:sw=4:ts=4:et:
@@ -3,9 +3,11 @@
 # License: MIT
 #
 # pylint: disable=missing-docstring,invalid-name,too-few-public-methods
-# pylint: disable=ungrouped-imports
+# pylint: disable=ungrouped-imports, protected-access
 from __future__ import absolute_import
 
+import json
+
 import anyconfig.backend.json as TT
 import tests.backend.common as TBC
 
@@ -44,4 +46,69 @@ class Test_20(TBC.Test_20_dump_and_load, HasParserTrait):
 
     pass
 
+
+class Test_22(TBC.Test_30_loads_from_buffers, HasParserTrait):
+
+    pass
+
+
+class Test_30_engines(TBC.TestBase, HasParserTrait):
+
+    engines = ["json", "auto", (json.loads, json.dumps)]
+
+    def test_10_loads_and_dumps(self):
+        for engine in self.engines:
+            cnf = self.psr.loads(self.cnf_s, ac_json_engine=engine,
+                                 ac_ordered=True)
+            # Callables may make dicts not keep the order of items.
+            self._assert_dicts_equal(cnf, ordered=not isinstance(engine,
+                                                                 tuple))
+
+            cnf_s = self.psr.dumps(cnf, ac_json_engine=engine)
+            cnf = self.psr.loads(cnf_s, ac_json_engine=engine)
+            self._assert_dicts_equal(cnf)
+
+    def test_12_loads_with_ac_dict_option(self):
+        for engine in self.engines:
+            cnf = self.psr.loads(self.cnf_s, ac_json_engine=engine,
+                                 ac_dict=TBC.MyDict)
+            self._assert_dicts_equal(cnf, cls=TBC.MyDict)
+            self.assertTrue(isinstance(cnf["sect0"], TBC.MyDict))
+
+    def test_14_loads_from_buffers(self):
+        content = self.cnf_s.encode("utf-8")
+        for engine in self.engines:
+            for buf in (bytearray(content), memoryview(content)):
+                cnf = self.psr.loads(buf, ac_json_engine=engine)
+                self._assert_dicts_equal(cnf)
+
+    def test_20_dumps_with_unsupported_options(self):
+        # Fall back to the default engine.
+        for engine in self.engines:
+            cnf_s = self.psr.dumps(self.cnf, ac_json_engine=engine, indent=4,
+                                   separators=(',', ': '))
+            self.assertEqual(cnf_s, json.dumps(self.cnf, indent=4,
+                                               separators=(',', ': ')))
+
+    def test_22_loads_and_dumps_data_not_supported_by_engines(self):
+        # Fall back to the default engine.
+        for engine in self.engines:
+            for cnf in ({1: 2}, dict(a=2 ** 70)):
+                cnf_s = self.psr.dumps(cnf, ac_json_engine=engine)
+                self.assertEqual(json.loads(cnf_s),
+                                 json.loads(json.dumps(cnf)))
+
+            for content in ('{"a": 1.5e400}', '{"a": NaN}'):
+                cnf = self.psr.loads(content, ac_json_engine=engine)
+                self.assertEqual(repr(cnf["a"]),
+                                 repr(json.loads(content)["a"]))
+
+    def test_30_get_engine(self):
+        self.assertEqual(TT.get_engine().name, "json")
+        self.assertTrue(TT.get_engine("auto") is TT.get_engine("auto"))
+        if TT._find_engine("orjson") is not None:
+            self.assertEqual(TT.get_engine("auto").name, "orjson")
+
+        self.assertRaises(ValueError, TT.get_engine, "not_exist")
+
 # vim:sw=4:ts=4:et:
@@ -0,0 +1,106 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring,invalid-name,too-few-public-methods
+# pylint: disable=ungrouped-imports
+from __future__ import absolute_import
+
+import io
+import os.path
+
+import anyconfig
+import anyconfig.backend.ndjson as TT
+import anyconfig.dicts
+import tests.backend.common as TBC
+
+from anyconfig.compat import OrderedDict
+
+
+CNF_0_S = """{"a": 0, "b": "bbb"}
+
+{"c": 5, "sect0": {"d": ["x", "y", "z"]}}
+"""
+
+CNF_0 = OrderedDict((("a", 0), ("b", "bbb"), ("c", 5),
+                     ("sect0", OrderedDict((("d", ["x", "y", "z"]), )))))
+
+RECORDS_S = u"""{"name": "a", "enabled": false, "hosts": {"h1": 1}}
+{"name": "b", "enabled": true}
+{"name": "a", "enabled": true, "hosts": {"h2": 2}}
+"""
+
+RECORDS = OrderedDict((("a", dict(name="a", enabled=True,
+                                  hosts=dict(h1=1, h2=2))),
+                       ("b", dict(name="b", enabled=True))))
+
+
+class HasParserTrait(TBC.HasParserTrait):
+
+    psr = TT.Parser()
+    cnf_s = CNF_0_S
+    cnf = CNF_0
+
+
+class Test_10(TBC.Test_10_dumps_and_loads, HasParserTrait):
+
+    load_options = dict(parse_int=int)
+    dump_options = dict(sort_keys=True)
+
+
+class Test_20(TBC.Test_20_dump_and_load, HasParserTrait):
+
+    pass
+
+
+class Test_30_records(TBC.TestBaseWithIO, HasParserTrait):
+
+    def test_10_loads_with_ac_key(self):
+        cnf = self.psr.loads(RECORDS_S, ac_key="name")
+        self._assert_dicts_equal(cnf, ref=RECORDS)
+
+        cnf = self.psr.loads(RECORDS_S, ac_key="name",
+                             ac_merge=anyconfig.dicts.MS_REPLACE)
+        self.assertEqual(cnf["a"]["hosts"], dict(h2=2))
+
+    def test_12_loads_with_ac_key_not_found(self):
+        with self.assertRaises(ValueError):
+            self.psr.loads(RECORDS_S, ac_key="id")
+
+    def test_14_loads_not_objects(self):
+        with self.assertRaises(ValueError):
+            self.psr.loads('{"a": 1}\n[1, 2]\n')
+
+    def test_20_load_all(self):
+        recs = list(self.psr.load_all(io.StringIO(RECORDS_S)))
+        self.assertEqual(len(recs), 3)
+        self.assertEqual(recs[1], dict(name="b", enabled=True))
+
+    def test_30_dump_and_load_with_ac_key(self):
+        self.psr.dump(RECORDS, self.cnf_path, ac_key="name")
+        with open(self.cnf_path) as inp:
+            self.assertEqual(len(inp.readlines()), 2)
+
+        cnf = self.psr.load(self.cnf_path, ac_key="name")
+        self._assert_dicts_equal(cnf, ref=RECORDS)
+
+    def test_32_dump_records_from_iterable(self):
+        recs = (dict(name=str(i), value=i) for i in range(3))
+        self.psr.dump(recs, self.cnf_path)
+
+        recs = list(self.psr.load_all(self.cnf_path))
+        self.assertEqual([r["value"] for r in recs], [0, 1, 2])
+
+    def test_40_multi_load_with_ac_key(self):
+        paths = [os.path.join(self.workdir, name) for name
+                 in ("a.ndjson", "b.jsonl")]
+        with open(paths[0], 'w') as out:
+            out.write(RECORDS_S)
+        with open(paths[1], 'w') as out:
+            out.write('{"name": "b", "enabled": false}\n')
+
+        cnf = anyconfig.load(paths, ac_key="name")
+        self.assertFalse(cnf["b"]["enabled"])
+        self.assertEqual(cnf["a"], RECORDS["a"])
+
+# vim:sw=4:ts=4:et:
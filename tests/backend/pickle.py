@@ -26,4 +26,9 @@ class Test_20(TBC.Test_20_dump_and_load, HasParserTrait):
 
     pass
 
+
+class Test_22(TBC.Test_30_loads_from_buffers, HasParserTrait):
+
+    pass
+
 # vim:sw=4:ts=4:et:
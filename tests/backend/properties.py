@@ -57,6 +57,15 @@ class Test_00(unittest.TestCase):
         res = TT.escape(r":=\ ")
         self.assertEqual(res, exp, res)
 
+    def test_22_escape_and_unescape(self):
+        for ins in ("", "aaa", r"a:b=c\d", r"::=="):
+            self.assertEqual(TT.unescape(TT.escape(ins)), ins)
+
+    def test_30_load__continued_lines(self):
+        cnf_s = "a=1\n\\\nb = x\\\n\\\n  y\\\n\n# c\nc:  d\\:e\n"
+        cnf = TT.load(TT.anyconfig.compat.StringIO(cnf_s))
+        self.assertEqual(cnf, dict(a="1", b="xy", c="d:e"))
+
 
 class Test_10(TBC.Test_10_dumps_and_loads, HasParserTrait):
 
@@ -68,4 +77,27 @@ class Test_20(TBC.Test_20_dump_and_load, HasParserTrait):
 
     pass
 
+
+class Test_30_lazy(TBC.TestBaseWithIO, HasParserTrait):
+
+    def test_10_loads(self):
+        cnf = self.psr.loads(self.cnf_s, ac_lazy=True)
+        self.assertEqual(repr(cnf), "<LazyMapping: 6 items, 0 loaded>")
+        self.assertEqual(cnf["sect1.d"], "1,2,3")
+        self.assertEqual(repr(cnf), "<LazyMapping: 6 items, 1 loaded>")
+        self.assertEqual(list(cnf.items()), list(CNF.items()))
+
+        cnf_s = "a=1\n\\\nb = x\\\n\\\n  y\\\n\n# c\nc:  d\\:e\na=2\n"
+        cnf = self.psr.loads(cnf_s.encode("utf-8"), ac_lazy=True)
+        self.assertEqual(list(cnf.items()),
+                         [("a", "2"), ("b", "xy"), ("c", "d:e")])
+
+    def test_20_load(self):
+        cnf = self.psr.load(self.cnf_path, ac_lazy=True)
+        self.assertEqual(list(cnf.items()), list(CNF.items()))
+
+        with self.psr.ropen(self.cnf_path) as strm:
+            cnf = self.psr.load(strm, ac_lazy=True)
+        self.assertEqual(list(cnf.items()), list(CNF.items()))
+
 # vim:sw=4:ts=4:et:
@@ -40,4 +40,37 @@ class Test_20(TBC.Test_20_dump_and_load, HasParserTrait):
 
     pass
 
+
+class Test_30_expand_vars(TBC.TestBase, HasParserTrait):
+
+    cnf_s = """\
+a=0
+b="${a}/$a"
+c='$a'
+a=1
+d="$a:$e"
+e=\\$a
+f=$HOME
+"""
+
+    def test_10_loads__wo_expand_vars(self):
+        cnf = self.psr.loads(self.cnf_s)
+        self.assertEqual(cnf["b"], "${a}/$a")
+        self.assertEqual(cnf["d"], "$a:$e")
+
+    def test_20_loads__w_expand_vars(self):
+        cnf = self.psr.loads(self.cnf_s, ac_expand_vars=True)
+        self.assertEqual(cnf["a"], "1")
+        self.assertEqual(cnf["b"], "0/0")
+        self.assertEqual(cnf["c"], "$a")  # Quoted with single quotes.
+        self.assertEqual(cnf["d"], "1:$e")  # 'e' is defined later.
+        self.assertEqual(cnf["e"], "\\$a")  # Escaped.
+        self.assertEqual(cnf["f"], "$HOME")
+
+    def test_22_loads__w_expand_vars__defaults(self):
+        cnf = self.psr.loads(self.cnf_s, ac_expand_vars=dict(HOME="/root",
+                                                             a="x"))
+        self.assertEqual(cnf["b"], "0/0")
+        self.assertEqual(cnf["f"], "/root")
+
 # vim:sw=4:ts=4:et:
@@ -0,0 +1,97 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring,invalid-name,too-few-public-methods
+# pylint: disable=ungrouped-imports,protected-access
+from __future__ import absolute_import
+
+import os.path
+
+import anyconfig
+import anyconfig.backend.snapshot as TT
+import anyconfig.dicts
+import tests.backend.common as TBC
+
+from anyconfig.compat import OrderedDict
+
+
+CNF_0 = OrderedDict((("a", 0), ("b", "bbb"), ("c", 5),
+                     ("sect0", OrderedDict((("d", ["x", "y", "z"]),
+                                            ("e", OrderedDict((("f", None),
+                                                               ))))))))
+
+
+class HasParserTrait(TBC.HasParserTrait):
+
+    psr = TT.Parser()
+    cnf = CNF_0
+    cnf_s = psr.dumps(CNF_0)
+
+
+class Test_10_dumps_and_loads(TBC.TestBase, HasParserTrait):
+
+    def test_10_loads(self):
+        cnf = self.psr.loads(self.cnf_s)
+        self.assertTrue(isinstance(cnf, TT.SnapshotMapping))
+        self.assertEqual(list(cnf.keys()), list(self.cnf.keys()))
+        self.assertEqual(cnf, self.cnf)
+
+    def test_12_loads_lazily(self):
+        cnf = self.psr.loads(self.cnf_s)
+        self.assertTrue(cnf._index is None)
+        self.assertEqual(len(cnf), len(self.cnf))
+        self.assertEqual(cnf._data, dict())
+
+        self.assertEqual(cnf["sect0"]["e"]["f"], None)
+        self.assertEqual(list(cnf._data.keys()), ["sect0"])
+
+    def test_14_loads_with_ac_dict_option(self):
+        cnf = self.psr.loads(self.cnf_s, ac_dict=TBC.MyDict)
+        self._assert_dicts_equal(cnf, cls=TBC.MyDict)
+        self.assertTrue(isinstance(cnf["sect0"], TBC.MyDict))
+
+    def test_16_loads_empty_data(self):
+        self.assertEqual(self.psr.loads(b''), dict())
+
+    def test_18_loads_invalid_data(self):
+        for data in (b"not a snapshot", self.cnf_s[:-1]):
+            with self.assertRaises(ValueError):
+                self.psr.loads(data)
+
+    def test_20_update(self):
+        cnf = self.psr.loads(self.cnf_s)
+        anyconfig.dicts.merge(cnf, dict(a=1, sect0=dict(g=2)))
+        del cnf["b"]
+
+        self.assertEqual(cnf["a"], 1)
+        self.assertEqual(cnf["sect0"]["g"], 2)
+        self.assertEqual(cnf["sect0"]["d"], ["x", "y", "z"])
+        self.assertFalse("b" in cnf)
+        self.assertEqual(len(cnf), len(self.cnf) - 1)
+
+
+class Test_20_dump_and_load(TBC.TestBaseWithIO, HasParserTrait):
+
+    def test_10_load(self):
+        for opts in (dict(), dict(ac_mmap=True)):
+            cnf = self.psr.load(self.cnf_path, **opts)
+            self.assertTrue(isinstance(cnf._buf, TT.mmap.mmap))
+            self.assertEqual(cnf, self.cnf)
+
+    def test_20_dump_and_load(self):
+        for ext in ("", ".gz"):
+            path = self.cnf_path + ext
+            self.psr.dump(self.cnf, path)
+            self.assertEqual(self.psr.load(path), self.cnf)
+
+    def test_30_load_empty_file(self):
+        path = os.path.join(self.workdir, "empty.acsnap")
+        open(path, 'w').close()
+        self.assertEqual(self.psr.load(path), dict())
+
+    def test_40_load_with_api(self):
+        cnf = anyconfig.load(self.cnf_path)
+        self.assertEqual(anyconfig.dicts.convert_to(cnf), self.cnf)
+
+# vim:sw=4:ts=4:et:
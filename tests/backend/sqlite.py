@@ -0,0 +1,123 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato @ redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring,invalid-name,too-few-public-methods
+# pylint: disable=ungrouped-imports,protected-access
+from __future__ import absolute_import
+
+import os.path
+import threading
+
+import anyconfig
+import anyconfig.backend.sqlite as TT
+import anyconfig.dicts
+import tests.backend.common as TBC
+
+from anyconfig.compat import OrderedDict
+
+
+CNF_0 = OrderedDict((("a", 0), ("b", "bbb"), ("c", 5.5), ("d", True),
+                     ("sect0", OrderedDict((("d", ["x", "y", "z"]),
+                                            ("e/f", OrderedDict((("g", None),
+                                                                 ))),
+                                            ("h", OrderedDict())))),
+                     ("sect1", OrderedDict((("i", 1 << 70), )))))
+
+
+class HasParserTrait(TBC.HasParserTrait):
+
+    psr = TT.Parser()
+    cnf = CNF_0
+    cnf_s = psr.dumps(CNF_0)
+
+
+class Test_10_dumps_and_loads(TBC.TestBase, HasParserTrait):
+
+    def test_10_loads(self):
+        cnf = self.psr.loads(self.cnf_s)
+        self.assertTrue(isinstance(cnf, TT.SQLiteMapping))
+        self.assertEqual(list(cnf.keys()), list(self.cnf.keys()))
+        self.assertEqual(cnf, self.cnf)
+
+    def test_12_loads_lazily(self):
+        cnf = self.psr.loads(self.cnf_s)
+        self.assertEqual(anyconfig.dicts.get(cnf, "/sect0/e~1f/g"),
+                         (None, ''))
+        self.assertEqual(list(cnf._data.keys()), ["sect0"])
+        self.assertFalse(cnf._complete)
+
+    def test_14_loads_with_ac_dict_option(self):
+        cnf = self.psr.loads(self.cnf_s, ac_dict=TBC.MyDict)
+        self._assert_dicts_equal(cnf, cls=TBC.MyDict)
+        self.assertTrue(isinstance(cnf["sect0"], TBC.MyDict))
+        self.assertEqual(sorted(cnf["sect0"].keys()),
+                         sorted(self.cnf["sect0"].keys()))
+
+    def test_16_loads_empty_data(self):
+        self.assertEqual(self.psr.loads(b''), dict())
+
+    def test_20_update(self):
+        cnf = self.psr.loads(self.cnf_s)
+        anyconfig.dicts.merge(cnf, dict(a=1, sect0=dict(j=2)))
+        del cnf["b"]
+
+        self.assertEqual(cnf["a"], 1)
+        self.assertEqual(cnf["sect0"]["j"], 2)
+        self.assertEqual(cnf["sect0"]["d"], ["x", "y", "z"])
+        self.assertFalse("b" in cnf)
+        self.assertEqual(len(cnf), len(self.cnf) - 1)
+        self.assertEqual(list(cnf.keys()), ["a", "c", "d", "sect0", "sect1"])
+
+        with self.assertRaises(KeyError):
+            del cnf["b"]
+
+    def test_30_materialize(self):
+        cnf = self.psr.loads(self.cnf_s)
+        self.assertEqual(cnf["sect0"].materialize(OrderedDict),
+                         self.cnf["sect0"])
+
+
+class Test_20_dump_and_load(TBC.TestBaseWithIO, HasParserTrait):
+
+    def test_10_load(self):
+        cnf = self.psr.load(self.cnf_path)
+        self.assertEqual(cnf, self.cnf)
+        self.assertTrue(self.psr.load(self.cnf_path)._conn is cnf._conn)
+
+    def test_12_load_from_other_threads(self):
+        cnf = self.psr.load(self.cnf_path)
+        res = []
+        thr = threading.Thread(target=lambda: res.append(cnf["sect1"]["i"]))
+        thr.start()
+        thr.join()
+        self.assertEqual(res, [self.cnf["sect1"]["i"]])
+
+    def test_20_dump_and_load(self):
+        for ext in ("", ".gz"):
+            path = self.cnf_path + ext
+            self.psr.dump(self.cnf, path)
+            self.assertEqual(self.psr.load(path), self.cnf)
+
+    def test_22_load_after_dump_again(self):
+        cnf = self.psr.load(self.cnf_path)
+        self.psr.dump(dict(a=1), self.cnf_path)
+        self.assertEqual(cnf["a"], 0)  # Still the old one.
+        self.assertEqual(self.psr.load(self.cnf_path), dict(a=1))
+
+    def test_24_load_again_after_dump_and_read_old_one(self):
+        cnf = self.psr.load(self.cnf_path)
+        self.psr.dump(dict(a=1), self.cnf_path)
+        self.assertEqual(self.psr.load(self.cnf_path), dict(a=1))
+        self.assertEqual(cnf, self.cnf)  # The old one is still available.
+
+    def test_30_load_empty_file(self):
+        path = os.path.join(self.workdir, "empty.sqlite")
+        open(path, 'w').close()
+        self.assertEqual(self.psr.load(path), dict())
+
+    def test_40_load_with_api(self):
+        cnf = anyconfig.load(self.cnf_path)
+        self.assertEqual(anyconfig.dicts.convert_to(cnf), self.cnf)
+
+# vim:sw=4:ts=4:et:
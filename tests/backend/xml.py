@@ -136,6 +136,15 @@ class Test_00(unittest.TestCase):
         self.assertTrue(not dic)
         self.assertTrue(dicts_equal(subdic, {"@attrs": {"id": True}}))
 
+    def test_38__process_elem_attrs__parse_with_rules(self):
+        (elem, dic, subdic) = (TT.ET.XML("<a x='0.1' y='null' z='1'/>"),
+                               {}, {})
+        TT._process_elem_attrs(elem, dic, subdic,
+                               ac_parse_value=["null", "float"])
+        self.assertTrue(not dic)
+        self.assertTrue(dicts_equal(subdic, {"@attrs": {"x": 0.1, "y": None,
+                                                        "z": '1'}}))
+
     def test_40__process_children_elems__root(self):
         (elem, dic, subdic) = (TT.ET.XML("<list><i>A</i><i>B</i></list>"), {},
                                {})
@@ -275,4 +284,9 @@ class Test_20(TBC.Test_20_dump_and_load, HasParserTrait):
         cnf = self.psr.load(self.cnf_path)
         self._assert_dicts_equal(cnf)
 
+
+class Test_22(TBC.Test_30_loads_from_buffers, HasParserTrait):
+
+    pass
+
 # vim:sw=4:ts=4:et:
@@ -4,7 +4,7 @@
 # License: MIT
 #
 # pylint: disable=missing-docstring,invalid-name,too-few-public-methods
-# pylint: disable=ungrouped-imports
+# pylint: disable=ungrouped-imports,protected-access
 from __future__ import absolute_import
 
 import os
@@ -48,4 +48,105 @@ class Test_20(TBC.Test_20_dump_and_load, HasParserTrait):
 
     pass
 
+
+class Test_21(TBC.Test_30_loads_from_buffers, HasParserTrait):
+
+    pass
+
+
+class Test_22_libyaml(TBC.TestBaseWithIO, HasParserTrait):
+
+    def test_40_load_and_dump__wo_libyaml(self):
+        self.psr.dump(self.cnf, self.cnf_path, ac_libyaml=False)
+        cnf = self.psr.load(self.cnf_path, ac_libyaml=False)
+        self._assert_dicts_equal(cnf)
+
+    def test_50_customized_classes_are_cached(self):
+        for base in (TT.Loader, TT.PURE_CLASSES["Loader"]):
+            cls = TT._customized_loader(OrderedDict, loader=base)
+            self.assertTrue(cls is TT._customized_loader(OrderedDict,
+                                                         loader=base))
+            self.assertTrue(issubclass(cls, base))
+            self.assertFalse(cls is base)
+
+        self.assertTrue(TT._customized_dumper(OrderedDict) is
+                        TT._customized_dumper(OrderedDict))
+
+    def test_51_cache_of_customized_classes_is_bounded(self):
+        (size, TT.MEMO_SIZE) = (TT.MEMO_SIZE, 2)
+        try:
+            for _idx in range(5):
+                TT._customized_loader(lambda: OrderedDict())
+                self.assertTrue(len(TT._CUSTOMIZED) <= TT.MEMO_SIZE)
+        finally:
+            TT.MEMO_SIZE = size
+
+    def test_52_base_classes_are_not_modified(self):
+        ctors = TT.Loader.yaml_constructors.copy()
+        reprs = TT.Dumper.yaml_representers.copy()
+
+        self.psr.load(self.cnf_path, ac_dict=TBC.MyDict)
+        self.psr.dump(self.cnf, self.cnf_path)
+
+        self.assertEqual(TT.Loader.yaml_constructors, ctors)
+        self.assertEqual(TT.Dumper.yaml_representers, reprs)
+
+
+class Test_24_dump(TBC.TestBase, HasParserTrait):
+
+    cnf = OrderedDict((("z", 0), ("y", OrderedDict((("b", 1), ("a", 2)))),
+                       ("x", [TBC.MyDict(d=3)])))
+
+    def _assert_dumped_in_order(self, cnf_s):
+        self.assertEqual([l.strip() for l in cnf_s.splitlines()],
+                         ["z: 0", "y:", "b: 1", "a: 2", "x:", "- d: 3"])
+
+    def test_10_dumps__keep_order(self):
+        self._assert_dumped_in_order(self.psr.dumps(self.cnf))
+
+    def test_12_dumps__keep_order__safe(self):
+        self._assert_dumped_in_order(self.psr.dumps(self.cnf, ac_safe=True))
+
+    def test_14_dumps__dict(self):
+        cnf = dict(z=0, y=dict(b=1, a=2), x=[dict(d=3)])
+        cnf_s = self.psr.dumps(cnf)
+        self.assertEqual(self.psr.loads(cnf_s), cnf)
+
+    def test_16_dumps__keep_order__wo_libyaml(self):
+        self._assert_dumped_in_order(self.psr.dumps(self.cnf,
+                                                    ac_libyaml=False))
+
+    def test_18_dumps__dict__sort_keys(self):
+        cnf = dict(z=0, y=dict(b=1, a=2))
+        for opts in (dict(), dict(ac_safe=True), dict(ac_libyaml=False)):
+            self.assertEqual(self.psr.dumps(cnf, **opts).splitlines(),
+                             ["y:", "  a: 2", "  b: 1", "z: 0"])
+
+        cnf_s = self.psr.dumps(cnf, sort_keys=False)
+        self.assertEqual(cnf_s.splitlines()[0], "z: 0")
+
+
+class Test_30_load_all(TBC.TestBase, HasParserTrait):
+
+    cnfs_s = CNF_S + "---\na: 1\nd: ddd\n---\n"
+
+    def test_10_load_all(self):
+        cnfs = list(self.psr.load_all(TT.anyconfig.compat.StringIO(
+            self.cnfs_s)))
+        self.assertEqual(len(cnfs), 3)
+        self._assert_dicts_equal(cnfs[0])
+        self.assertEqual(cnfs[1], dict(a=1, d="ddd"))
+        self.assertEqual(cnfs[2], dict())
+
+    def test_12_load_all__safe(self):
+        strm = TT.anyconfig.compat.StringIO(self.cnfs_s)
+        cnfs = list(self.psr.load_all(strm, ac_safe=True))
+        self.assertEqual(len(cnfs), 3)
+        self._assert_dicts_equal(cnfs[0])
+
+    def test_14_load_all__generator(self):
+        strm = TT.anyconfig.compat.StringIO(self.cnfs_s)
+        cnfs = self.psr.load_all(strm, ac_ordered=True)
+        self._assert_dicts_equal(next(cnfs), ordered=True)
+
 # vim:sw=4:ts=4:et:
@@ -33,10 +33,11 @@ class Test_00(unittest.TestCase):
     >>> psr = TT.make_parser()
     >>> assert isinstance(psr, TT.argparse.ArgumentParser)
     >>> psr.parse_args([])  # doctest: +NORMALIZE_WHITESPACE
-    Namespace(args=None, atype=None, env=False, gen_schema=False, get=None,
-              ignore_missing=False, inputs=[], itype=None, list=False,
-              loglevel=1, merge='merge_dicts', otype=None, output=None,
-              query=None, schema=None, set=None, template=False,
+    Namespace(args=None, atype=None, compile=False, env=False,
+              flat=False, gen_schema=False, get=None, ignore_missing=False,
+              inputs=[], itype=None, list=False, loglevel=1,
+              merge='merge_dicts', otype=None, output=None, query=None,
+              schema=None, set=None, snapshot=None, template=False,
               validate=False)
     """
 
@@ -127,6 +128,20 @@ class Test_30_single_input(Test_20_Base):
 
         self.run_and_check_exit_code(["--get", no_get_q, infile], 1)
 
+    def test_33_w_get_and_flat_options(self):
+        d = dict(name="a", a=dict(b=dict(c=[1, 2], d="C")))
+
+        infile = os.path.join(self.workdir, "a.json")
+        output = os.path.join(self.workdir, "b.json")
+
+        anyconfig.api.dump(d, infile)
+        TT.main(["dummy", "--silent", "-o", output, "--get", "a.b", "--flat",
+                 infile])
+        self.assertEqual(anyconfig.api.load(output),
+                         {"/a/b/c/0": 1, "/a/b/c/1": 2, "/a/b/d": "C"})
+
+        self.run_and_check_exit_code(["--get", "a.x", "--flat", infile], 1)
+
     def test_32_w_set_option(self):
         d = dict(name="a", a=dict(b=dict(c=[1, 2], d="C")))
 
@@ -216,6 +231,32 @@ class Test_30_single_input(Test_20_Base):
         TT.main(["dummy", "--silent", "-o", output, infile])
         self.assertTrue(os.path.exists(output))
 
+    def test_72_compressed_input_and_output(self):
+        a = dict(name="a", a=1, b=dict(b=[1, 2], c="C"))
+
+        infile = os.path.join(self.workdir, "a.json.gz")
+        output = os.path.join(self.workdir,
+                              "b.json." + tests.common.COMPRESSIONS[-1])
+
+        anyconfig.api.dump(a, infile)
+        TT.main(["dummy", "--silent", "-o", output, infile])
+        self.assertEqual(anyconfig.api.load(output), a)
+
+    def test_74_compile_and_load_snapshot(self):
+        a = dict(name="a", a=1, b=dict(b=[1, 2], c="C"))
+
+        infile = os.path.join(self.workdir, "a.json")
+        snapshot = os.path.join(self.workdir, "a.acsnap")
+        output = os.path.join(self.workdir, "b.json")
+
+        anyconfig.api.dump(a, infile)
+        self.run_and_check_exit_code(["--compile", "-o", snapshot, infile])
+        self.assertTrue(os.path.exists(snapshot))
+
+        TT.main(["dummy", "--silent", "--snapshot", snapshot, "-o", output,
+                 infile])
+        self.assertEqual(anyconfig.api.load(output), a)
+
 
 class Test_40_multi_inputs(Test_20_Base):
 
@@ -0,0 +1,185 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato at redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring, invalid-name
+from __future__ import absolute_import
+
+import array
+import copy
+import os.path
+import pickle
+import unittest
+
+import anyconfig.api
+import anyconfig.arrays
+import anyconfig.backends
+import anyconfig.columnar as TT
+import anyconfig.dicts
+import anyconfig.frozen
+import anyconfig.schema
+import tests.common
+
+
+HOSTS = [dict(name="host-%d" % i, port=8000 + i, up=bool(i % 2), tags=["a"])
+         for i in range(TT.MIN_LENGTH)]
+CNF = dict(hosts=HOSTS, name="inventory")
+
+
+class Test_10_Records(unittest.TestCase):
+
+    def setUp(self):
+        self.recs = TT.to_records(copy.deepcopy(HOSTS[:4]))
+
+    def test_10_sequence(self):
+        recs = self.recs
+        self.assertEqual(len(recs), 4)
+        self.assertEqual(sorted(recs.fields), ["name", "port", "tags", "up"])
+        self.assertEqual(recs[1]["port"], 8001)
+        self.assertEqual(recs[-1], HOSTS[3])
+        self.assertEqual(dict(recs[0]), HOSTS[0])
+        self.assertEqual(list(recs), HOSTS[:4])
+        self.assertEqual(recs[1:3], HOSTS[1:3])
+        self.assertTrue(TT.is_records(recs[1:3]))
+        self.assertEqual(recs.column("name"), [h["name"] for h in HOSTS[:4]])
+        self.assertRaises(IndexError, recs.__getitem__, 4)
+        self.assertRaises(KeyError, recs[0].__getitem__, "not_exist")
+
+    def test_20_read_only(self):
+        def set_item(obj, key, val):
+            obj[key] = val
+
+        self.assertRaises(TypeError, set_item, self.recs, 0, {})
+        self.assertRaises(TypeError, set_item, self.recs[0], "port", 0)
+        self.assertFalse(hasattr(self.recs, "append"))
+
+    def test_30_equality(self):
+        self.assertEqual(self.recs, HOSTS[:4])
+        self.assertEqual(HOSTS[:4], self.recs)
+        self.assertNotEqual(self.recs, HOSTS[:3])
+        self.assertEqual(self.recs, TT.to_records(HOSTS[:4]))
+
+    def test_40_where(self):
+        recs = self.recs
+        self.assertEqual(recs.where("port", ">=", 8002), HOSTS[2:4])
+        self.assertEqual(recs.where("up", "==", True), HOSTS[1:4:2])
+        self.assertEqual(recs.where("name", "!=", "host-0"), HOSTS[1:4])
+        self.assertEqual(recs.where("port", "<", 8002).where("up", "==",
+                                                             False),
+                         HOSTS[:1])
+
+    def test_42_where__like_jmespath(self):
+        recs = self.recs
+        self.assertEqual(len(recs.where("up", "==", 1)), 0)  # bool != number
+        self.assertEqual(len(recs.where("name", ">", 0)), 0)
+        self.assertEqual(len(recs.where("port", ">", "a")), 0)
+        self.assertEqual(len(recs.where("not_exist", "==", None)), 4)
+        self.assertEqual(len(recs.where("not_exist", ">", 0)), 0)
+        self.assertRaises(ValueError, recs.where, "port", "=~", 0)
+
+    def test_44_where__array_columns(self):
+        recs = TT.to_records(HOSTS, array_kind=anyconfig.arrays.ARRAY)
+        self.assertTrue(isinstance(recs.column("port"), array.array))
+
+        res = recs.where("port", "<", 8002)
+        self.assertTrue(isinstance(res.column("port"), array.array))
+        self.assertEqual(res, HOSTS[:2])
+
+    def test_50_to_records__not_converted(self):
+        for lst in ([], [{}], [dict(a=1), dict(b=1)], [dict(a=1), 1],
+                    [dict(a=1), dict(a=1, b=2)],
+                    [anyconfig.frozen.FrozenDict(a=1)]):
+            self.assertTrue(TT.to_records(lst) is None, lst)
+
+    def test_60_pickle(self):
+        self.assertEqual(pickle.loads(pickle.dumps(self.recs)), HOSTS[:4])
+
+    def test_70_convert_to(self):
+        cnf = anyconfig.dicts.convert_to(dict(hosts=self.recs))
+        self.assertEqual(type(cnf["hosts"]), list)
+        self.assertEqual(type(cnf["hosts"][0]), dict)
+        self.assertEqual(cnf["hosts"], HOSTS[:4])
+
+    def test_80_gen_schema(self):
+        scm = anyconfig.schema.gen_schema(self.recs)
+        self.assertEqual(scm["type"], "array")
+        self.assertEqual(scm["items"]["properties"]["port"],
+                         dict(type="integer"))
+
+
+class Test_20_convert(unittest.TestCase):
+
+    def test_10_convert(self):
+        cnf = TT.convert(copy.deepcopy(CNF))
+        self.assertTrue(TT.is_records(cnf["hosts"]))
+        self.assertEqual(cnf, CNF)
+        self.assertTrue(TT.has_records(cnf))
+        self.assertEqual(type(TT.to_plain(cnf)["hosts"]), list)
+
+    def test_20_convert__min_length(self):
+        cnf = TT.convert(dict(a=[dict(b=[dict(c=1), dict(c=2)])] * 2),
+                         min_length=2)
+        self.assertTrue(TT.is_records(cnf["a"]))
+        self.assertTrue(TT.is_records(cnf["a"][0]["b"]))
+
+        cnf = TT.convert(dict(a=[dict(b=1)]))
+        self.assertEqual(type(cnf["a"]), list)
+        self.assertFalse(TT.has_records(cnf))
+
+    def test_30_convert__frozen(self):
+        cnf = TT.convert(anyconfig.frozen.freeze(CNF))
+        self.assertTrue(isinstance(cnf["hosts"],
+                                   anyconfig.frozen.FrozenList))
+
+
+class Test_30_load(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tests.common.setup_workdir()
+
+    def tearDown(self):
+        tests.common.cleanup_workdir(self.workdir)
+
+    def _check(self, ptype):
+        if ptype not in anyconfig.backends.list_types():
+            return
+
+        content = anyconfig.api.dumps(CNF, ptype)
+        cnf = anyconfig.api.loads(content, ac_parser=ptype, ac_columnar=True)
+        self.assertTrue(TT.is_records(cnf["hosts"]))
+        self.assertEqual(cnf, CNF)
+
+        # Records are dumped as lists.
+        path = os.path.join(self.workdir, "a." + ptype)
+        anyconfig.api.dump(cnf, path)
+        self.assertEqual(anyconfig.api.load(path), CNF)
+
+        res = anyconfig.api.loads(content, ac_parser=ptype, ac_columnar=True,
+                                  ac_query="hosts[?port < `8002`].name")
+        self.assertEqual(res, ["host-0", "host-1"])
+
+    def test_10_load__json(self):
+        self._check("json")
+
+    def test_20_load__yaml(self):
+        self._check("yaml")
+
+    def test_22_load__ndjson(self):
+        self._check("ndjson")
+
+    def test_24_load__sqlite(self):
+        self._check("sqlite")
+
+    def test_30_multi_load(self):
+        paths = [os.path.join(self.workdir, "%d.json" % i) for i in range(2)]
+        anyconfig.api.dump(dict(hosts=HOSTS[:-1]), paths[0])
+        anyconfig.api.dump(dict(hosts=HOSTS[-1:]), paths[1])
+
+        cnf = anyconfig.api.multi_load(
+            paths, ac_columnar=True, ac_array=anyconfig.arrays.ARRAY,
+            ac_merge=anyconfig.dicts.MS_DICTS_AND_LISTS)
+        self.assertTrue(TT.is_records(cnf["hosts"]))
+        self.assertTrue(isinstance(cnf["hosts"].column("port"), array.array))
+        self.assertEqual(cnf["hosts"], HOSTS)
+
+# vim:sw=4:ts=4:et:
@@ -11,6 +11,14 @@ import anyconfig.compat
 from anyconfig.compat import OrderedDict
 from anyconfig.utils import is_dict_like
 
+try:
+    import lzma  # noqa: F401
+    LZMA_FOUND = True
+except ImportError:
+    LZMA_FOUND = False
+
+# Extensions of compressed files can be processed.
+COMPRESSIONS = ("gz", "bz2", "xz") if LZMA_FOUND else ("gz", "bz2")
 
 CNF_0 = dict(name="a", a=1, b=dict(b=[1, 2], c="C"))
 SCM_0 = {"type": "object",
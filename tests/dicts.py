@@ -67,6 +67,106 @@ class Test_10_get(unittest.TestCase):
         # self.assertEqual(msg, 'list indices must be integers...')
 
 
+class Test_12_compile_path(unittest.TestCase):
+
+    def test_10_get_and_exists(self):
+        dic = {"a": {"b/c": [1, {"d": 2}]}, "": 3}
+        for path, exp in (("", dic), ("/", 3), ("/a/b~1c/0", 1),
+                          ("/a/b~1c/1/d", 2)):
+            acc = TT.compile_path(path)
+            self.assertEqual(acc.get(dic), (exp, ''), path)
+            self.assertTrue(acc.exists(dic), path)
+
+        for path in ("/x", "/a/b~1c/2", "/a/b~1c/-", "/a/b~1c/0/e"):
+            acc = TT.compile_path(path)
+            (val, msg) = acc.get(dic)
+            self.assertTrue(val is None, path)
+            self.assertTrue(bool(msg), path)
+            self.assertFalse(acc.exists(dic), path)
+
+    def test_20_set(self):
+        dic = dict(a=1, b=dict(c=2))
+        acc = TT.compile_path("b.d.e")
+        acc.set(dic, 3)
+        acc.set(dic, 4)
+        self.assertEqual(dic, dict(a=1, b=dict(c=2, d=dict(e=4))))
+
+        TT.compile_path("/a~1b").set(dic, 5)
+        self.assertEqual(dic["a/b"], 5)
+        self.assertRaises(ValueError, TT.compile_path('').set, dic, 1)
+
+    def test_30_accessors_cache(self):
+        dic = dict(a=dict(b=1))
+        cache = TT._ACCESSORS
+        cache.clear()
+        self.assertEqual(TT.get(dic, "a.b"), (1, ''))
+        self.assertEqual(TT.get(dic, "a.b"), (1, ''))
+        TT.set_(dic, "a.c", 2)
+        self.assertEqual(len(cache), 2)
+
+        nmax = TT.ACCESSORS_CACHE_SIZE
+        for idx in range(nmax):
+            TT.get(dic, "/a/%d" % idx)
+        self.assertEqual(len(cache), nmax)
+        self.assertFalse(any(key[0] == "a.b" for key in cache))
+        self.assertEqual(TT.get(dic, "a.c"), (2, ''))
+
+
+class Test_14_set_(unittest.TestCase):
+
+    def test_10_set_in_place(self):
+        dic = OrderedDict((("a", 1), ("b", OrderedDict((("c", 2), )))))
+        TT.set_(dic, "b.d.e", 3)
+        TT.set_(dic, "a.f", 4)  # It replaces 1 with new mapping object.
+        self.assertEqual(dic["b"]["d"]["e"], 3)
+        self.assertEqual(dic["a"], dict(f=4))
+        self.assertTrue(isinstance(dic["b"]["d"], OrderedDict))
+        self.assertTrue(isinstance(dic["a"], OrderedDict))
+
+    def test_20_merge_mapping_objects(self):
+        dic = dict(a=dict(b=1))
+        TT.set_(dic, "a", dict(c=2))
+        self.assertEqual(dic, dict(a=dict(b=1, c=2)))
+
+    def test_30_json_pointer__array(self):
+        dic = dict(a=[1, dict(b=2)])
+        TT.set_(dic, "/a/0", 0)
+        TT.set_(dic, "/a/1/c", 3)
+        TT.set_(dic, "/a/-", 4)
+        TT.set_(dic, "/a/3", 5)  # Append an item at the end.
+        TT.set_(dic, "/a/-/d", 6)
+        self.assertEqual(dic, dict(a=[0, dict(b=2, c=3), 4, 5, dict(d=6)]))
+        self.assertRaises(IndexError, TT.set_, dic, "/a/10", 1)
+
+        TT.set_(dic, "/a/e", 7)  # It replaces the list.
+        self.assertEqual(dic, dict(a=dict(e=7)))
+
+
+class Test_16_set_many(unittest.TestCase):
+
+    def test_10_set_many(self):
+        dic = dict(a=dict(b=1), l=[1, 2])
+        items = [("a.c", 2), ("/a/d/e", 3), ("/l/0", 0), ("/l/-", 3),
+                 ("/l/-", 4), ("f", 5), ("f.g", 6), ("a.d", dict(h=7))]
+        TT.set_many(dic, items)
+        self.assertEqual(dic, dict(a=dict(b=1, c=2, d=dict(e=3, h=7)),
+                                   l=[0, 2, 3, 4], f=dict(g=6)))
+
+    def test_20_same_as_set_in_order(self):
+        items = [("/l/-/b", 1), ("/l/b", 2), ("/m/-/a", 3), ("/m/-/b", 4),
+                 ("/n/0", 5), ("/n/a/b", 6), ("/n/a", 7)]
+        dic = dict(l=[0], m=[], n=[1])
+        ref = copy.deepcopy(dic)
+        for path, val in items:
+            TT.set_(ref, path, val)
+
+        TT.set_many(dic, OrderedDict(items))
+        self.assertEqual(dic, ref)
+
+    def test_30_empty_path(self):
+        self.assertRaises(ValueError, TT.set_many, {}, [("a", 1), ('', 2)])
+
+
 class Test_10_update_with_replace(unittest.TestCase):
 
     ac_merge = TT.MS_REPLACE
@@ -0,0 +1,121 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato at redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring, invalid-name
+from __future__ import absolute_import
+
+import copy
+import pickle
+import unittest
+
+import anyconfig.dicts
+import anyconfig.frozen as TT
+
+from anyconfig.compat import OrderedDict
+
+
+class Unhashable(object):
+    __hash__ = None
+
+
+CNF = OrderedDict((("a", 1),
+                   ("b", OrderedDict((("c", [1, dict(d="D")]), ))),
+                   ("e", None)))
+
+
+class Test_10_FrozenList(unittest.TestCase):
+
+    def test_10_make(self):
+        lst = TT.FrozenList([1, [2], dict(a=3)])
+        self.assertTrue(isinstance(lst[1], TT.FrozenList))
+        self.assertTrue(isinstance(lst[2], TT.FrozenDict))
+        self.assertEqual(lst, [1, [2], dict(a=3)])
+        self.assertEqual(lst, (1, (2, ), dict(a=3)))
+        self.assertNotEqual(lst, [1, [2]])
+
+    def test_20_hash(self):
+        lst = TT.FrozenList([1, dict(a=[2])])
+        self.assertEqual(hash(lst), hash(TT.FrozenList([1, dict(a=[2])])))
+        self.assertEqual(len(set([lst, TT.freeze([1, dict(a=[2])])])), 1)
+
+    def test_30_pickle(self):
+        lst = TT.FrozenList([1, dict(a=[2])])
+        res = pickle.loads(pickle.dumps(lst, 2))
+        self.assertEqual(res, lst)
+        self.assertTrue(isinstance(res, TT.FrozenList))
+
+
+class Test_20_FrozenDict(unittest.TestCase):
+
+    def test_10_make(self):
+        cnf = TT.FrozenDict(CNF)
+        self.assertEqual(cnf, CNF)
+        self.assertTrue(isinstance(cnf["b"], TT.FrozenDict))
+        self.assertTrue(isinstance(cnf["b"]["c"], TT.FrozenList))
+        self.assertTrue(isinstance(cnf["b"]["c"][1], TT.FrozenDict))
+
+    def test_12_make_from_pairs(self):
+        cnf = TT.FrozenDict([("a", 1), ("b", [2])], c=dict(d=3))
+        self.assertEqual(cnf, dict(a=1, b=[2], c=dict(d=3)))
+        self.assertTrue(isinstance(cnf["c"], TT.FrozenDict))
+
+    def test_20_immutable(self):
+        cnf = TT.FrozenDict(CNF)
+        for args in ((cnf.__setitem__, "a", 2), (cnf.__delitem__, "a"),
+                     (cnf.clear, ), (cnf.pop, "a"), (cnf.popitem, ),
+                     (cnf.setdefault, "f", 0), (cnf.update, dict(a=2))):
+            self.assertRaises(TypeError, *args)
+
+        self.assertRaises(TypeError, anyconfig.dicts.set_, cnf, "b.c", 0)
+        self.assertEqual(cnf, CNF)
+
+    def test_30_hash(self):
+        cnf = TT.FrozenDict(CNF)
+        self.assertEqual(hash(cnf), hash(TT.FrozenDict(copy.deepcopy(CNF))))
+        self.assertEqual({cnf: 1}[TT.freeze(CNF)], 1)
+
+    def test_32_hash__unhashable_value(self):
+        cnf = TT.FrozenDict(a=Unhashable())
+        self.assertRaises(TypeError, hash, cnf)
+
+    def test_40_eq(self):
+        (cnf, cnf2) = (TT.FrozenDict(CNF), TT.FrozenDict(dict(CNF, a=2)))
+        self.assertNotEqual(cnf, cnf2)
+        (hash(cnf), hash(cnf2))  # Hashes are cached and compared first.
+        self.assertNotEqual(cnf, cnf2)
+        self.assertEqual(cnf, TT.freeze(CNF))
+        self.assertEqual(cnf, dict(CNF))
+
+    def test_50_copy(self):
+        cnf = TT.FrozenDict(CNF)
+        self.assertTrue(cnf.copy() is cnf)
+        self.assertTrue(copy.copy(cnf) is cnf)
+        self.assertTrue(copy.deepcopy(cnf) is cnf)
+
+    def test_60_pickle(self):
+        cnf = TT.FrozenDict(CNF)
+        res = pickle.loads(pickle.dumps(cnf, 2))
+        self.assertEqual(res, cnf)
+        self.assertTrue(isinstance(res, TT.FrozenDict))
+        self.assertTrue(isinstance(res["b"]["c"], TT.FrozenList))
+
+
+class Test_30_freeze(unittest.TestCase):
+
+    def test_10_freeze(self):
+        cnf = TT.freeze(CNF)
+        self.assertTrue(TT.is_frozen(cnf))
+        self.assertTrue(TT.freeze(cnf) is cnf)
+        self.assertEqual(cnf, CNF)
+
+    def test_20_freeze__primitives(self):
+        for obj in (None, 1, 1.0, True, "a"):
+            self.assertTrue(TT.freeze(obj) is obj)
+
+    def test_30_convert_to(self):
+        cnf = anyconfig.dicts.convert_to(CNF, ac_frozen=True)
+        self.assertTrue(isinstance(cnf, TT.FrozenDict))
+        self.assertEqual(cnf, CNF)
+
+# vim:sw=4:ts=4:et:
@@ -0,0 +1,88 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato at redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring, invalid-name
+from __future__ import absolute_import
+
+import copy
+import re
+import unittest
+
+import anyconfig.api
+import anyconfig.dicts
+import anyconfig.index as TT
+
+from anyconfig.compat import OrderedDict
+
+
+CNF = OrderedDict((("a", OrderedDict((("b", OrderedDict((("c", 1),
+                                                         ("d", [1, 2])))),
+                                      ("e/f", "E")))),
+                   ("g", [OrderedDict((("h", 0), )), 3])))
+
+
+class Test_10_build(unittest.TestCase):
+
+    def setUp(self):
+        self.cnf = copy.deepcopy(CNF)
+        self.idx = TT.build(self.cnf)
+
+    def test_10_build(self):
+        self.assertEqual(len(self.idx), 11)
+        self.assertEqual(sorted(self.idx)[:3],
+                         [("a", ), ("a", "b"), ("a", "b", "c")])
+
+    def test_20_get(self):
+        for path in ("", "a.b.c", "/a/b/d/1", "/a/e~1f", ("g", "0", "h"),
+                     "/g/1"):
+            self.assertEqual(self.idx.get(path),
+                             anyconfig.dicts.get(self.cnf, path), path)
+            self.assertTrue(self.idx.exists(path), path)
+            self.assertTrue(path in self.idx, path)
+
+        for path in ("x", "/a/b/d/2", "a.b.c.d", "/g/-"):
+            (val, err) = self.idx.get(path)
+            self.assertTrue(val is None, path)
+            self.assertTrue(err, path)
+            self.assertFalse(self.idx.exists(path), path)
+
+    def test_22_api_get(self):
+        self.assertEqual(anyconfig.api.get(self.idx, "a.b.c"), (1, ''))
+        self.assertEqual(anyconfig.api.get(self.cnf, "a.b.c"), (1, ''))
+
+        # idx_reg is passed to anyconfig.dicts.get as before.
+        idx_reg = re.compile(r"[0-9]+")
+        for data in (self.idx, self.cnf):
+            self.assertEqual(anyconfig.api.get(data, "/g/1", "/", idx_reg),
+                             (3, ''))
+            self.assertEqual(anyconfig.api.get(data, "a.b.d.0",
+                                               idx_reg=idx_reg), (1, ''))
+
+    def test_30_iter_paths(self):
+        self.assertEqual(list(self.idx.iter_paths("a.b")),
+                         [("a", "b", "c"), ("a", "b", "d"),
+                          ("a", "b", "d", "0"), ("a", "b", "d", "1")])
+        self.assertEqual(list(self.idx.iter_paths("/a/b/c")), [])
+        self.assertRaises(KeyError, list, self.idx.iter_paths("a.x"))
+
+    def test_32_flatten(self):
+        self.assertEqual(self.idx.flatten("/g"),
+                         OrderedDict((("/g/0/h", 0), ("/g/1", 3))))
+        self.assertEqual(len(self.idx.flatten()), 6)
+
+    def test_40_set(self):
+        ref = copy.deepcopy(self.cnf)
+        for path, val in (("a.b.c", 2), ("a.b.c.x", 3), ("a.b", dict(y=4)),
+                          ("/a/b/d/-", 3), ("/g/0/h/i", 5), ("/g/1", [6]),
+                          ("/n/o/p", 7), ("a", 8)):
+            anyconfig.dicts.set_(ref, path, copy.deepcopy(val))
+            self.idx.set(path, copy.deepcopy(val))
+            self.assertEqual(self.cnf, ref)
+            self.assertEqual(sorted(self.idx), sorted(TT.build(ref)), path)
+
+    def test_42_set_failure(self):
+        self.assertRaises(IndexError, self.idx.set, "/g/5", 1)
+        self.assertEqual(sorted(self.idx), sorted(TT.build(self.cnf)))
+
+# vim:sw=4:ts=4:et:
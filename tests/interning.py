@@ -0,0 +1,157 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato at redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring, invalid-name
+from __future__ import absolute_import
+
+import os.path
+import unittest
+
+import anyconfig.api
+import anyconfig.backends
+import anyconfig.compat
+import anyconfig.frozen
+import anyconfig.interning as TT
+import tests.common
+
+from anyconfig.compat import OrderedDict
+
+
+def _str(val):
+    """Make a new string object equal to `val`."""
+    return ''.join(list(val))
+
+
+CNF_S = '{"a": {"k": "val", "l": ["x", {"k": "val"}]}, "b": {"k": "val"}}'
+CNF_Y = "a: {k: val, l: [x, {k: val}]}\nb: {k: val}\n"
+
+
+class Test_10_intern(unittest.TestCase):
+
+    def test_10_intern_key(self):
+        self.assertTrue(TT.intern_key(_str("abc")) is TT.intern_key("abc"))
+        self.assertEqual(TT.intern_key(1), 1)
+
+    def test_20_intern_value(self):
+        self.assertTrue(TT.intern_value(_str("abc")) is
+                        TT.intern_value("abc"))
+        val = 'a' * (TT.MAX_VALUE_LEN + 1)
+        self.assertFalse(TT.intern_value(_str(val)) is TT.intern_value(val))
+
+    def test_22_intern_value__list(self):
+        lst = [_str("abc"), [_str("abc")]]
+        self.assertTrue(TT.intern_value(lst) is lst)
+        self.assertTrue(lst[0] is lst[1][0])
+
+
+class Test_20_make_container(unittest.TestCase):
+
+    def test_10_make_container(self):
+        make = TT.make_container(OrderedDict)
+        self.assertTrue(TT.make_container(OrderedDict) is make)
+
+        (cnf, cnf2) = (make([(_str("key"), _str("val"))]),
+                       make([(_str("key"), _str("val"))]))
+        self.assertTrue(isinstance(cnf, OrderedDict))
+        self.assertTrue(list(cnf)[0] is list(cnf2)[0])
+        self.assertTrue(cnf["key"] is cnf2["key"])
+        self.assertFalse(cnf is cnf2)
+        self.assertEqual(make(), OrderedDict())
+
+    def test_20_make_container__subtrees(self):
+        make = TT.make_container(subtrees=True)
+        cnf = make([("a", 1), ("b", [1])])
+        self.assertTrue(isinstance(cnf, anyconfig.frozen.FrozenDict))
+        self.assertTrue(make([("b", [1]), ("a", 1)]) is cnf)
+        self.assertFalse(make([("a", 1)]) is cnf)
+
+    def test_22_make_container__subtrees__keep_types(self):
+        make = TT.make_container(subtrees=True)
+        cnfs = [make([("x", val)]) for val in (1, True, 1.0, 1)]
+        self.assertEqual([type(c["x"]) for c in cnfs],
+                         [int, bool, float, int])
+        self.assertFalse(cnfs[0] is cnfs[1])
+        self.assertTrue(cnfs[0] is cnfs[3])
+
+        cnfs = [make([("x", [val])]) for val in (1, True)]
+        self.assertEqual([type(c["x"][0]) for c in cnfs], [int, bool])
+
+    def test_30_intern_tree(self):
+        cnf = TT.intern_tree(dict(a=dict(k=_str("val")), b=dict(k="val")))
+        self.assertTrue(cnf["a"]["k"] is cnf["b"]["k"])
+        self.assertFalse(cnf["a"] is cnf["b"])
+
+        cnf = TT.intern_tree(dict(a=dict(k=1), b=[dict(k=1)]), subtrees=True)
+        self.assertTrue(cnf["a"] is cnf["b"][0])
+
+
+class Test_30_load(unittest.TestCase):
+
+    def _check(self, content, ptype):
+        if ptype not in anyconfig.backends.list_types():
+            return
+
+        cnf = anyconfig.api.loads(content, ac_parser=ptype, ac_intern=True)
+        self.assertTrue(isinstance(cnf, dict))
+        self.assertFalse(cnf["a"]["l"][1] is cnf["b"])
+        if anyconfig.compat.IS_PYTHON_3:  # Unicode strings are not in py2.
+            self.assertTrue(cnf["a"]["l"][1]["k"] is cnf["b"]["k"])
+            self.assertTrue(list(cnf["a"])[0] is list(cnf["b"])[0])
+
+        cnf = anyconfig.api.loads(content, ac_parser=ptype,
+                                  ac_intern=TT.SUBTREES)
+        self.assertTrue(anyconfig.frozen.is_frozen(cnf))
+        self.assertTrue(cnf["a"]["l"][1] is cnf["b"])
+        self.assertEqual(cnf["a"]["l"], ["x", dict(k="val")])
+
+    def test_10_loads__json(self):
+        self._check(CNF_S, "json")
+
+    def test_20_loads__yaml(self):
+        self._check(CNF_Y, "yaml")
+
+    def test_22_loads__subtrees_keep_types(self):
+        for ptype, contents in (("json", ('{"x": {"enabled": 1}}',
+                                          '{"x": {"enabled": true}}',
+                                          '{"x": {"enabled": 1.0}}')),
+                                ("yaml", ("x: {enabled: 1}",
+                                          "x: {enabled: true}"))):
+            if ptype not in anyconfig.backends.list_types():
+                continue
+
+            cnfs = [anyconfig.api.loads(c, ac_parser=ptype,
+                                        ac_intern=TT.SUBTREES)
+                    for c in contents]
+            for cnf, content in zip(cnfs, contents):
+                self.assertEqual(anyconfig.api.dumps(cnf, "json"),
+                                 anyconfig.api.dumps(
+                                     anyconfig.api.loads(content,
+                                                         ac_parser=ptype),
+                                     "json"))
+
+    def test_30_loads__after_loaded(self):
+        content = "[a]\nk = val\n[b]\nk = val\n"
+        cnf = anyconfig.api.loads(content, ac_parser="ini",
+                                  ac_intern=TT.SUBTREES)
+        self.assertTrue(cnf["a"] is cnf["b"])
+
+
+class Test_40_multi_load(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tests.common.setup_workdir()
+
+    def tearDown(self):
+        tests.common.cleanup_workdir(self.workdir)
+
+    def test_10_multi_load__subtrees(self):
+        paths = [os.path.join(self.workdir, "%d.json" % i) for i in range(2)]
+        anyconfig.api.dump(dict(a=dict(k="val")), paths[0])
+        anyconfig.api.dump(dict(b=dict(k="val")), paths[1])
+
+        cnf = anyconfig.api.multi_load(paths, ac_intern=TT.SUBTREES)
+        self.assertTrue(anyconfig.frozen.is_frozen(cnf))
+        self.assertTrue(cnf["a"] is cnf["b"])
+
+# vim:sw=4:ts=4:et:
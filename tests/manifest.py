@@ -0,0 +1,62 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato at redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring, invalid-name
+from __future__ import absolute_import
+
+import os.path
+import unittest
+
+import anyconfig.manifest as TT
+import tests.common
+
+
+class Test_10_manifest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tests.common.setup_workdir()
+        self.paths = [os.path.join(self.workdir, name) for name
+                      in ("a.json", "b.json")]
+        for path in self.paths:
+            with open(path, 'w') as out:
+                out.write('{"a": 1}')
+
+        self.pattern = os.path.join(self.workdir, "*.json")
+        self.output = os.path.join(self.workdir, "a.acsnap")
+        with open(self.output, 'w') as out:
+            out.write("dummy")
+
+    def tearDown(self):
+        tests.common.cleanup_workdir(self.workdir)
+
+    def test_10_list_sources(self):
+        schema = os.path.join(self.workdir, "s.json")
+        self.assertEqual(TT.list_sources(self.pattern), self.paths)
+        self.assertEqual(TT.list_sources([self.paths[0], "b.tar!/*.json"],
+                                         ac_schema=schema),
+                         [self.paths[0], "b.tar", schema])
+
+    def test_20_make_save_and_is_fresh(self):
+        self.assertFalse(TT.is_fresh(self.output, self.pattern))
+
+        TT.save(TT.make(self.pattern, ac_merge="replace"), self.output)
+        self.assertTrue(TT.is_fresh(self.output, self.pattern,
+                                    ac_merge="replace"))
+        self.assertFalse(TT.is_fresh(self.output, self.pattern))
+        self.assertFalse(TT.is_fresh(self.output, self.paths[:1],
+                                     ac_merge="replace"))
+
+        with open(self.paths[1], 'w') as out:
+            out.write('{"a": 2}')
+        self.assertFalse(TT.is_fresh(self.output, self.pattern,
+                                     ac_merge="replace"))
+
+    def test_30_snapshot_changed(self):
+        TT.save(TT.make(self.pattern), self.output)
+        with open(self.output, 'w') as out:
+            out.write("changed")
+
+        self.assertFalse(TT.is_fresh(self.output, self.pattern))
+
+# vim:sw=4:ts=4:et:
@@ -2,7 +2,7 @@
 # Copyright (C) 2011 - 2015 Satoru SATOH <ssato @ redhat.com>
 # License: MIT
 #
-# pylint: disable=missing-docstring,invalid-name
+# pylint: disable=missing-docstring,invalid-name,protected-access
 import unittest
 import anyconfig.parser as TT
 
@@ -12,6 +12,7 @@ CASES = dict(single_0=[("", "")],
              single=[("0", 0),
                      ("123", 123),
                      ("True", True),
+                     ("false", False),
                      ("a string", "a string"),
                      ("0.1", "0.1"),
                      ("    a string contains extra whitespaces     ",
@@ -38,12 +39,44 @@ class Test(unittest.TestCase):
         self.run_cases("single_0", TT.parse_single)
         self.run_cases("single", TT.parse_single)
 
+    def test_02_parse_single_with_rules(self):
+        for inp, exp in (("0.1", 0.1), ("-1", -1), ("1e3", 1000.0),
+                         ("null", None), ("~", None), ("01", "01"),
+                         ("inf", "inf"), ("'0.1'", "0.1")):
+            self.assertEqual(TT.parse_single(inp, TT.ALL_RULES), exp)
+
+        self.assertEqual(TT.parse_single("'0.1'", ["float"]), "'0.1'")
+        self.assertEqual(TT.parse_single("true", ["int"]), "true")
+
+    def test_04_mk_scalar_parser(self):
+        for size in (0, 2):
+            parse = TT.mk_scalar_parser(TT.ALL_RULES, memo_size=size)
+            for inp in ("0", "1", "2", "0.5", "0", "null", "abc", "0"):
+                self.assertEqual(parse(inp),
+                                 TT.parse_single(inp, TT.ALL_RULES))
+
+        self.assertRaises(ValueError, TT.mk_scalar_parser, ["date"])
+        self.assertRaises(TypeError, TT.mk_scalar_parser, 1)
+        self.assertRaises(TypeError, TT.mk_scalar_parser, [None])
+
+        # Values of 'ac_parse_value' option other than names or lists.
+        for rules in (None, True, 1):
+            self.assertTrue(TT._get_scalar_parser(rules)
+                            is TT._get_scalar_parser(TT.RULES))
+        self.assertRaises(TypeError, TT._get_scalar_parser, [None])
+
+        parse = TT.mk_scalar_parser("int")
+        self.assertEqual([parse(s) for s in ("1", "true")], [1, "true"])
+        self.assertEqual(TT.parse_single("1", "int"), 1)
+
     def test_10_parse_list(self):
         self.run_cases("list", TT.parse_list)
 
         # A few special cases:
         self.assertEqual(TT.parse_list(""), [])
         self.assertEqual(TT.parse_list("a|b|", "|"), ["a", "b"])
+        self.assertEqual(TT.parse_list("1,0.1,null", rules=TT.ALL_RULES),
+                         [1, 0.1, None])
 
     def test_20_parse_attrlist_0(self):
         self.run_cases("attrlist_0", TT.parse_attrlist_0)
@@ -2,11 +2,13 @@
 # Copyright (C) 2017 Satoru SATOH <ssato at redhat.com>
 # License: MIT
 #
-# pylint: disable=missing-docstring, invalid-name
+# pylint: disable=missing-docstring, invalid-name, protected-access
 from __future__ import absolute_import
 
+import copy
 import os
 import unittest
+import anyconfig.columnar
 import anyconfig.query as TT
 
 from tests.common import dicts_equal
@@ -43,4 +45,61 @@ class Test_00_Functions(unittest.TestCase):
         except (NameError, AttributeError):
             pass
 
+
+class Test_10_Pushdown(unittest.TestCase):
+
+    hosts = [dict(name="a", port=80, up=True), dict(name="b", port=443,
+                                                    up=False),
+             dict(name="c", port=8080, up=True)]
+
+    def setUp(self):
+        self.data = dict(inv=dict(
+            hosts=anyconfig.columnar.to_records(self.hosts)))
+
+    def test_10_parse_filter(self):
+        self.assertEqual(TT._parse_filter("[?a != `null`]"),
+                         ([], [("a", "!=", None)], None))
+        for exp in ("a[?b == c]", "a[?b == `1`] | [0]", "a[?b.c == `1`]",
+                    "a[?b == `1` || c == `2`]", "a[?b == `x`]"):
+            self.assertTrue(TT._parse_filter(exp) is None, exp)
+
+    def test_20_query(self):
+        res = TT.query(self.data, ac_query="inv.hosts[?port > `100`]")
+        self.assertTrue(anyconfig.columnar.is_records(res))
+        self.assertEqual(res, self.hosts[1:])
+
+        res = TT.query(self.data,
+                       ac_query="inv.hosts[?port > `100` && up == `true`]"
+                                ".name")
+        self.assertEqual(res, ["c"])
+
+        res = TT.query(self.data, ac_query="inv.hosts[?name == 'b'].port")
+        self.assertEqual(res, [443])
+        res = TT.query(self.data, ac_query="inv.hosts[?port > `0`].x")
+        self.assertEqual(res, [])
+
+    def test_30_query__not_pushed_down(self):
+        (pushed, _ret) = TT._pushdown(dict(inv=dict(hosts=self.hosts)),
+                                      "inv.hosts[?port > `100`]")
+        self.assertFalse(pushed)
+
+        (pushed, _ret) = TT._pushdown(self.data, "inv.x[?port > `100`]")
+        self.assertFalse(pushed)
+
+    def test_40_query__same_results_as_jmespath(self):
+        jmespath = getattr(TT, "jmespath", None)
+        if jmespath is None:
+            return
+
+        hosts = [dict(n="h%d" % i, port=i * 100, up=bool(i % 2))
+                 for i in range(5)]
+        data = dict(hosts=anyconfig.columnar.to_records(copy.deepcopy(hosts)))
+        for exp in ("hosts[?n < 'h3'].n", "hosts[?n >= 'h3'].port",
+                    "hosts[?port < `300`].n",
+                    "hosts[?port >= `200` && up == `true`].n",
+                    "hosts[?n == 'h1'].port", "hosts[?n != 'h1'].port",
+                    "hosts[?up == `false`]", "hosts[?port <= `true`]"):
+            self.assertEqual(TT.query(data, ac_query=exp),
+                             jmespath.search(exp, dict(hosts=hosts)), exp)
+
 # vim:sw=4:ts=4:et:
@@ -0,0 +1,155 @@
+#
+# Copyright (C) 2018 Satoru SATOH <ssato at redhat.com>
+# License: MIT
+#
+# pylint: disable=missing-docstring, invalid-name, protected-access
+from __future__ import absolute_import
+
+import unittest
+
+import anyconfig.api
+import anyconfig.backends
+import anyconfig.typed as TT
+
+
+SCM = {"type": "object",
+       "title": "tenant",
+       "properties": {
+           "name": {"type": "string"},
+           "port": {"type": "integer", "default": 80},
+           "db": {"type": "object",
+                  "properties": {"host": {"type": "string"},
+                                 "opts": {"type": "object"}}},
+           "users": {"type": "array",
+                     "items": {"type": "object",
+                               "properties": {"id": {"type": "integer"}}}},
+           "tags": {"type": "array", "items": {"type": "string"}},
+           "a-b": {"type": "integer"},
+           "_c": {"type": "integer"}}}
+
+CNF = {"name": "t0", "db": {"host": "localhost", "opts": {"x": 1}},
+       "users": [{"id": 0}, {"id": 1, "e": True}], "tags": ["a", "b"],
+       "a-b": 1, "_c": 2, "d": 3}
+
+
+class Test_10_make_class(unittest.TestCase):
+
+    def test_10_make_class(self):
+        cls = TT.make_class(SCM)
+        self.assertEqual(cls.__name__, "Tenant")
+        self.assertTrue(issubclass(cls, TT.TypedConfig))
+        self.assertEqual(sorted(cls.__slots__),
+                         ["db", "name", "port", "tags", "users"])
+
+    def test_12_make_class__w_name(self):
+        self.assertEqual(TT.make_class(SCM, "A").__name__, "A")
+
+    def test_20_make_class__cached(self):
+        self.assertTrue(TT.make_class(SCM) is TT.make_class(dict(SCM)))
+        self.assertFalse(TT.make_class(SCM) is TT.make_class(SCM, "A"))
+
+    def test_30_make_class__not_object(self):
+        for scm in ({"type": "string"}, {"type": "object"}, []):
+            self.assertRaises(ValueError, TT.make_class, scm)
+
+
+class Test_20_TypedConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.cls = TT.make_class(SCM)
+        self.cnf = self.cls(CNF)
+
+    def test_10_attributes(self):
+        self.assertEqual(self.cnf.name, "t0")
+        self.assertEqual(self.cnf.port, 80)  # default
+        self.assertEqual(self.cnf.db.host, "localhost")
+        self.assertEqual(self.cnf.db.opts, {"x": 1})
+        self.assertEqual(self.cnf.users[1].id, 1)
+        self.assertEqual(self.cnf.users[1].e, True)
+        self.assertEqual(self.cnf.tags, ["a", "b"])
+        self.assertEqual(self.cnf.d, 3)
+
+    def test_12_no_dicts(self):
+        self.assertFalse(hasattr(self.cnf, "__dict__"))
+        self.assertFalse(hasattr(self.cnf.db, "__dict__"))
+        self.assertTrue(self.cnf.db._extra is None)
+
+    def test_20_missing(self):
+        cnf = self.cls(name="t1")
+        self.assertRaises(AttributeError, getattr, cnf, "db")
+        self.assertRaises(KeyError, cnf.__getitem__, "db")
+        self.assertFalse("db" in cnf)
+        self.assertEqual(sorted(cnf), ["name", "port"])
+
+    def test_30_getitem(self):
+        self.assertEqual(self.cnf["name"], "t0")
+        self.assertEqual(self.cnf["a-b"], 1)
+        self.assertEqual(self.cnf["_c"], 2)
+        self.assertRaises(KeyError, self.cnf.__getitem__, "x")
+        self.assertEqual(len(self.cnf), len(CNF) + 1)
+
+    def test_40_asdict(self):
+        self.assertEqual(self.cnf._asdict(), dict(CNF, port=80))
+        self.assertEqual(self.cnf, dict(CNF, port=80))
+        self.assertEqual(self.cnf, self.cls(CNF))
+        self.assertNotEqual(self.cnf, self.cls(CNF, name="t1"))
+
+    def test_50_set_attribute(self):
+        self.cnf.name = "t1"
+        self.assertEqual(self.cnf["name"], "t1")
+        self.assertRaises(AttributeError, setattr, self.cnf, "x", 1)
+
+    def test_60_mutable_defaults(self):
+        cls = TT.make_class({"properties": {"tags": {"default": []},
+                                            "opts": {"default": {"a": []}}}})
+        (cnf_0, cnf_1) = (cls(), cls())
+        cnf_0.tags.append(1)
+        cnf_0.opts["a"].append(1)
+        self.assertEqual(cnf_1.tags, [])
+        self.assertEqual(cnf_1.opts, {"a": []})
+        self.assertEqual(cls()._asdict(), dict(tags=[], opts={"a": []}))
+
+    def test_70_mapping(self):
+        self.assertTrue(isinstance(self.cnf, TT.Mapping))
+        self.assertEqual(dict(self.cnf.items()), dict(self.cnf))
+        self.assertEqual(self.cnf.get("name"), "t0")
+        self.assertTrue(self.cnf.get("x") is None)
+        self.assertEqual(sorted(self.cnf.keys()), sorted(dict(CNF, port=80)))
+
+        # Properties have the names of methods of mapping objects.
+        cls = TT.make_class({"properties": {"items": {"type": "integer"},
+                                            "get": {"type": "integer"}}})
+        cnf = cls(items=1, get=2)
+        self.assertEqual((cnf["items"], cnf["get"]), (1, 2))
+        self.assertEqual(sorted(cnf.items()), [("get", 2), ("items", 1)])
+
+
+class Test_30_load(unittest.TestCase):
+
+    def test_10_loads__w_ac_schema_class(self):
+        content = anyconfig.api.dumps(CNF, "json")
+        for scls in (SCM, TT.make_class(SCM)):
+            cnf = anyconfig.api.loads(content, ac_parser="json",
+                                      ac_schema_class=scls)
+            self.assertTrue(isinstance(cnf, TT.make_class(SCM)))
+            self.assertEqual(cnf.users[0].id, 0)
+
+    def test_12_dumps_and_merge(self):
+        cnf = TT.make_class(SCM)(CNF)
+        ref = dict(CNF, port=80)
+        for ptype in ("json", "yaml"):
+            if ptype not in anyconfig.backends.list_types():
+                continue
+
+            content = anyconfig.api.dumps(cnf, ptype)
+            self.assertEqual(anyconfig.api.loads(content, ac_parser=ptype),
+                             ref)
+
+        dic = dict(port=8080, e=4)
+        anyconfig.api.merge(dic, cnf)
+        self.assertEqual(dic, dict(ref, e=4))
+
+    def test_20_to_typed__not_mapping(self):
+        self.assertTrue(TT.to_typed(None, SCM) is None)
+
+# vim:sw=4:ts=4:et: